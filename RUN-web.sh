@@ -1,11 +1,11 @@
 #!/bin/bash
 
 # RUN-web.sh - Launch Gradio web interface
-# Usage: ./RUN-web.sh
+# Usage: ./RUN-web.sh [--browse-root DIR] [--host ADDRESS]
 
 echo "Launching Obsidian Vault Merger Web Interface..."
 echo "Access at: http://localhost:7860"
 echo ""
 
-python web_interface.py
+python web_interface.py "$@"
 
@@ -14,6 +14,7 @@ class CollisionResolver:
     def __init__(self):
         self.rename_log: Dict[str, str] = {}
         self.resolved_files: List[Dict] = []
+        self.collision_count = 0  # Files that share their filename with another file
 
     def resolve_collisions(self) -> None:
         """
@@ -52,6 +53,8 @@ class CollisionResolver:
             original_filename: The original filename shared by all files in the group
             files: List of file information dictionaries
         """
+        self.collision_count += len(files)
+        
         # First file keeps original name
         files[0]["resolved_filename"] = original_filename
         files[0]["needs_rename"] = False
@@ -59,9 +62,7 @@ class CollisionResolver:
         
         # Keep track of all resolved filenames to avoid conflicts
         # We need to check against all filenames in the inventory
-        all_filenames = set()
-        for file_info in file_scanner.get_file_inventory():
-            all_filenames.add(file_info["filename"])
+        all_filenames = set(file_scanner.filenames)
         
         # Add already resolved filenames to avoid conflicts
         for resolved_file in self.resolved_files:
@@ -87,7 +88,7 @@ class CollisionResolver:
             
             # Log the rename for link updating
             self.rename_log[original_filename] = new_filename
-            logger.debug(f"Renamed '{original_filename}' to '{new_filename}'")
+            logger.debug("Renamed '%s' to '%s'", original_filename, new_filename)
 
     def get_resolved_files(self) -> List[Dict]:
         """
@@ -107,6 +108,15 @@ class CollisionResolver:
         """
         return self.rename_log
 
+    def get_collision_count(self) -> int:
+        """
+        Get the number of files whose filename collided with another file's.
+        
+        Returns:
+            int: Number of files in collision groups, including the ones that kept their name
+        """
+        return self.collision_count
+
     def get_renamed_files_count(self) -> int:
         """
         Get the count of files that were renamed due to collisions.
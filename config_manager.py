@@ -23,6 +23,7 @@ class ConfigManager:
         self.deduplicate_max_groups: int = 3
         self.deduplicate_rename_mode: bool = True
         self.deduplicate_delete_mode: bool = False
+        self.deduplicate_verify_content: bool = True
 
     def parse_arguments(self) -> None:
         """
@@ -106,6 +107,11 @@ class ConfigManager:
             action="store_true",
             help="Delete duplicate files after relinking (instead of renaming with dup- prefix)"
         )
+        parser.add_argument(
+            "--dedup-no-verify",
+            action="store_true",
+            help="Trust the link mapping hashes without comparing the contents of duplicate files"
+        )
 
         args = parser.parse_args()
         self.only_linkmapping = args.linkmap_only
@@ -123,6 +129,7 @@ class ConfigManager:
         self.deduplicate_max_groups = args.dedup_max_groups
         self.deduplicate_rename_mode = not args.dedup_no_rename
         self.deduplicate_delete_mode = args.dedup_delete
+        self.deduplicate_verify_content = not args.dedup_no_verify
 
     def validate_paths(self) -> None:
         """
@@ -11,15 +11,49 @@ This module:
 - Renames or deletes non-surviving files
 """
 
+import filecmp
+import functools
+import multiprocessing
 import os
 import re
 import hashlib
-from typing import Dict, List, Set, Tuple
+import mmap
+import shutil
+import tempfile
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from config_manager import config_manager
 from logger import logger
 
 
+# Wikilinks [[target|display]] (group 1) and markdown links [text](target)
+# (groups 2, 3) in one pattern, so each note is scanned by a single pass
+LINK_RE = re.compile(r'\[\[([^\]]+)\]\]|\[([^\]]*)\]\(([^)]+)\)')
+
+# Up to this many duplicates, files are also skipped when they mention none of their names
+NAME_PREFILTER_LIMIT = 50
+
+# Vaults with at least this many notes update their links in worker processes
+PARALLEL_LINK_UPDATE_MIN_FILES = 256
+
+# Notes at least this large are checked for link markers via mmap before being read
+MMAP_MIN_BYTES = 1 << 20
+
+# Concurrent renames of non-surviving files
+RENAME_WORKERS = 16
+
+# Survivor sort key: filename length, ordered like len(os.path.basename(path)).
+# With '/' as the only separator that is len(path) - path.rfind('/') (off by a
+# constant one), which skips the basename call and its string allocation.
+if os.sep == '/' and not os.altsep:
+    def _filename_length(path: str) -> int:
+        return len(path) - path.rfind('/')
+else:
+    def _filename_length(path: str) -> int:
+        return len(os.path.basename(path))
+
+
 class DeduplicationHandler:
     """
     Handles deduplication of files with identical content based on hash values.
@@ -30,11 +64,16 @@ class DeduplicationHandler:
         self.link_mapping_file: str = ""
         self.sibling_groups: Dict[str, List[str]] = {}  # hash -> list of files
         self.survivors: Dict[str, str] = {}  # hash -> survivor file
+        self._duplicates_by_hash: Dict[str, List[str]] = {}  # hash -> non-surviving files
         self.duplicate_to_survivor: Dict[str, str] = {}  # duplicate -> survivor
         self.renamed_files: List[Dict] = []
         self.updated_links_count: int = 0
         self.link_updates: List[Dict] = []  # Detailed tracking of link updates
         self.processed: bool = False
+        self._duplicate_stems: List[str] = []  # Duplicate basenames without extension, for the prefilter
+        self._basename_index: Dict[str, Tuple[int, str]] = {}  # basename without .md -> (key order, duplicate)
+        self._wikilink_matches: Dict[str, Optional[str]] = {}  # wikilink target -> matched duplicate
+        self._link_rewrites: Dict[str, Optional[Tuple[str, Dict]]] = {}  # link text -> (replacement, update record)
 
     def initialize(self) -> None:
         """Initialize the deduplication handler with current configuration."""
@@ -58,30 +97,50 @@ class DeduplicationHandler:
         """
         logger.info("Identifying sibling groups (files with identical hashes)...")
         
-        hash_to_files = defaultdict(set)  # Use set to avoid duplicates
+        # Most hashes belong to a single file, so only the first target of each
+        # hash is kept until a second, different one shows up; sets are built
+        # for actual duplicate groups only
+        first_target: Dict[str, str] = {}  # hash -> first target seen
+        hash_to_files: Dict[str, Set[str]] = {}  # hash -> targets, if more than one
         
         try:
+            # Read and split the whole file at once; per-line work stays minimal
             with open(self.link_mapping_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
+                lines = f.read().splitlines()
+            
+            # Parse format: "SOURCE ; TARGET ; HASH"
+            for parts in [line.strip().split(' ; ', 3) for line in lines if line]:
+                if len(parts) >= 3:
+                    file_hash = parts[2].strip()
+                    target = parts[1].strip()
                     
-                    # Parse format: "SOURCE ; TARGET ; HASH"
-                    parts = line.split(' ; ')
-                    if len(parts) >= 3:
-                        target_file = parts[1].strip()
-                        file_hash = parts[2].strip()
-                        
-                        # Only process valid hashes
-                        if file_hash and file_hash not in ("ERROR", "NOT_FOUND", "unknown"):
-                            hash_to_files[file_hash].add(target_file)
+                    first = first_target.setdefault(file_hash, target)
+                    if first != target:
+                        files = hash_to_files.get(file_hash)
+                        if files is None:
+                            hash_to_files[file_hash] = {first, target}
+                        else:
+                            files.add(target)
+            
+            # Only process valid hashes
+            for invalid_hash in ("", "ERROR", "NOT_FOUND", "unknown"):
+                hash_to_files.pop(invalid_hash, None)
             
-            # Filter to only include hashes with multiple files (duplicates)
-            for file_hash, files in hash_to_files.items():
-                if len(files) > 1:
-                    self.sibling_groups[file_hash] = sorted(list(files))  # Sort for consistent survivor selection
-                    logger.debug(f"Sibling group {file_hash[:8]}...: {list(files)}")
+            # Keep only hashes with multiple files (duplicates), in order of
+            # first appearance and sorted for consistent survivor selection,
+            # and pick each group's survivor in the same pass. Group members
+            # are logged by select_survivors.
+            self.sibling_groups = {}
+            for file_hash in first_target:
+                files = hash_to_files.get(file_hash)
+                if files is None:
+                    continue
+                siblings = sorted(files)
+                if config_manager.deduplicate_verify_content:
+                    siblings = self._verify_siblings(file_hash, siblings)
+                    if len(siblings) < 2:
+                        continue
+                self._set_sibling_group(file_hash, siblings)
             
             logger.info(f"Found {len(self.sibling_groups)} sibling groups with duplicates")
             
@@ -90,26 +149,75 @@ class DeduplicationHandler:
         except Exception as e:
             logger.error(f"Error reading link mapping file: {e}")
 
+    def _verify_siblings(self, file_hash: str, siblings: List[str]) -> List[str]:
+        """
+        Confirm that the files sharing a hash really have the same content.
+        
+        The link mapping may be stale or come from a weaker hash, and treating
+        different files as duplicates would destroy data. Each sibling is
+        compared byte for byte with the group's survivor; siblings that differ
+        are dropped from the group. Files that can't be read are kept, as
+        before verification existed.
+        
+        Args:
+            file_hash: Content hash shared by the group
+            siblings: Sorted paths of all files in the group
+            
+        Returns:
+            List[str]: Sorted paths of the siblings identical to the survivor
+        """
+        survivor = min(siblings, key=_filename_length)
+        survivor_path = os.path.join(self.vault_path, survivor)
+        verified = []
+        for sibling in siblings:
+            if sibling != survivor:
+                try:
+                    same = filecmp.cmp(survivor_path, os.path.join(self.vault_path, sibling), shallow=False)
+                except OSError:
+                    same = True
+                if not same:
+                    logger.warning(f"Hash {file_hash[:8]}...: '{sibling}' differs from '{survivor}', not treating it as a duplicate")
+                    continue
+            verified.append(sibling)
+        return verified
+    
+    def _set_sibling_group(self, file_hash: str, siblings: List[str]) -> None:
+        """
+        Record a sibling group together with its survivor and duplicates.
+        
+        Strategy: Choose the file with the shortest filename as survivor.
+        
+        Args:
+            file_hash: Content hash shared by the group
+            siblings: Sorted paths of all files in the group
+        """
+        survivor = min(siblings, key=_filename_length)
+        self.sibling_groups[file_hash] = siblings
+        self.survivors[file_hash] = survivor
+        self._duplicates_by_hash[file_hash] = [s for s in siblings if s != survivor]
+
     def select_survivors(self) -> None:
         """
-        Select survivors for each sibling group.
-        Strategy: Choose the file with the shortest filename.
+        Map each duplicate to its group's survivor.
+        
+        Survivors are chosen while the sibling groups are read; this builds the
+        duplicate_to_survivor mapping for the groups being processed (test mode
+        may have limited them).
         """
         logger.info("Selecting survivors for each sibling group...")
         
         for file_hash, siblings in self.sibling_groups.items():
-            # Select the file with the shortest filename as survivor
-            survivor = min(siblings, key=lambda x: len(os.path.basename(x)))
-            self.survivors[file_hash] = survivor
+            if file_hash not in self.survivors:
+                self._set_sibling_group(file_hash, siblings)
+            survivor = self.survivors[file_hash]
+            duplicates = self._duplicates_by_hash[file_hash]
             
             # Build duplicate_to_survivor mapping
-            for sibling in siblings:
-                if sibling != survivor:
-                    self.duplicate_to_survivor[sibling] = survivor
-                    logger.debug(f"Mapping: '{sibling}' -> '{survivor}'")
+            for duplicate in duplicates:
+                self.duplicate_to_survivor[duplicate] = survivor
+                logger.debug("Mapping: '%s' -> '%s'", duplicate, survivor)
             
-            duplicates = [s for s in siblings if s != survivor]
-            logger.debug(f"Hash {file_hash[:8]}...: Survivor='{survivor}', Duplicates={duplicates}")
+            logger.debug("Hash %s...: Survivor='%s', Duplicates=%s", file_hash[:8], survivor, duplicates)
 
     def update_internal_links(self) -> None:
         """
@@ -122,22 +230,99 @@ class DeduplicationHandler:
             logger.info("No duplicates to update links for")
             return
         
-        logger.debug(f"duplicate_to_survivor mapping: {self.duplicate_to_survivor}")
+        if logger.is_debug_enabled():
+            logger.debug("duplicate_to_survivor mapping: %s", self.duplicate_to_survivor)
+        
+        self._prepare_link_lookup()
+        
+        # Collect all markdown files in the vault
+        file_paths = list(self._iter_markdown_files(self.vault_path))
+        
+        workers = os.cpu_count() or 1
+        if workers > 1 and len(file_paths) >= PARALLEL_LINK_UPDATE_MIN_FILES:
+            # Files are independent once the mapping is fixed; regex and string
+            # work hold the GIL, so spread them over processes
+            logger.info(f"Updating links in {len(file_paths)} files with {workers} worker processes")
+            # Spawn fresh interpreters: forking this process while the logger's
+            # listener thread runs could deadlock a worker on a lock held at fork
+            mp_context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                                     initializer=_init_link_worker,
+                                     initargs=(logger.log_file, self.vault_path, self.duplicate_to_survivor)) as executor:
+                for updated_count, link_updates in executor.map(_update_links_worker, file_paths, chunksize=64):
+                    self.updated_links_count += updated_count
+                    self.link_updates.extend(link_updates)
+        else:
+            for file_path in file_paths:
+                try:
+                    self._update_links_in_file(file_path)
+                except Exception as e:
+                    logger.error(f"Error updating links in {file_path}: {e}")
+        
+        logger.info(f"Updated {self.updated_links_count} links across all files")
+
+    def _iter_markdown_files(self, directory: str) -> Iterator[str]:
+        """
+        Yield the paths of all markdown files below a directory.
+        
+        Walks like os.walk (files of a directory before its subdirectories,
+        symlinked directories not followed), but with os.scandir directly so
+        the type of each entry comes from the directory listing.
         
-        # Process all markdown files in the vault
-        for root, dirs, files in os.walk(self.vault_path):
-            # Skip dot-prefixed directories
-            dirs[:] = [d for d in dirs if not (config_manager.exclude_dot_folders and d.startswith('.'))]
+        Args:
+            directory: Directory to walk
             
-            for file in files:
-                if file.endswith('.md'):
-                    file_path = os.path.join(root, file)
+        Yields:
+            str: Path of each .md file
+        """
+        subdirectories = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
                     try:
-                        self._update_links_in_file(file_path)
-                    except Exception as e:
-                        logger.error(f"Error updating links in {file_path}: {e}")
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    
+                    if is_dir:
+                        # Skip dot-prefixed directories
+                        if config_manager.exclude_dot_folders and entry.name.startswith('.'):
+                            continue
+                        if not entry.is_symlink():
+                            subdirectories.append(entry.path)
+                    elif entry.name.endswith('.md'):
+                        yield entry.path
+        except OSError:
+            return
         
-        logger.info(f"Updated {self.updated_links_count} links across all files")
+        for subdirectory in subdirectories:
+            yield from self._iter_markdown_files(subdirectory)
+
+    def _prepare_link_lookup(self) -> None:
+        """
+        Precompute the duplicate name lookups used while updating links.
+        
+        Every link that can resolve to a duplicate contains the duplicate's
+        basename without extension, so with only a few duplicates a plain
+        substring check can rule out most files before any regex runs.
+        
+        The basename index resolves wikilinks by note name in O(1). Only .md
+        duplicates are indexed, and the first duplicate with a given name wins.
+        """
+        self._wikilink_matches = {}
+        self._link_rewrites = {}
+        self._basename_index = {}
+        for order, key in enumerate(self.duplicate_to_survivor):
+            key_basename = os.path.basename(key)
+            if key_basename.endswith('.md'):
+                self._basename_index.setdefault(key_basename[:-3], (order, key))
+        
+        if len(self.duplicate_to_survivor) <= NAME_PREFILTER_LIMIT:
+            self._duplicate_stems = sorted({
+                os.path.splitext(os.path.basename(key))[0] for key in self.duplicate_to_survivor
+            })
+        else:
+            self._duplicate_stems = []
 
     def _update_links_in_file(self, file_path: str) -> None:
         """
@@ -147,162 +332,281 @@ class DeduplicationHandler:
             file_path: Path to the markdown file
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # One read and one contiguous decode, without the text-mode
+            # incremental decoder, but with the same newline translation
+            with open(file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size >= MMAP_MIN_BYTES:
+                    # Large note: search the mapped file for link markers and
+                    # only read it into a string if it has any
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if mm.find(b'[[') == -1 and mm.find(b'](') == -1:
+                            return
+                        content = mm[:].decode('utf-8')
+                else:
+                    content = f.read().decode('utf-8')
+            if '\r' in content:
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
+            
+            # Cheap substring checks before any regex work
+            if '[[' not in content and '](' not in content:
+                return
+            if self._duplicate_stems and not any(stem in content for stem in self._duplicate_stems):
+                return
             
-            original_content = content
-            updated_content = content
             relative_path = os.path.relpath(file_path, self.vault_path)
+            links_before = self.updated_links_count
             
-            # Process wikilinks: [[filename]] or [[filename|display]]
-            def process_wikilink(match):
-                link_content = match.group(1)
-                parts = link_content.split('|', 1)
-                filename_part = parts[0].strip()
-                display_part = parts[1] if len(parts) > 1 else None
-                
-                # Normalize paths - remove ../ prefix if present
-                normalized_filename = filename_part
-                if normalized_filename.startswith('../'):
-                    normalized_filename = normalized_filename[3:]  # Remove '../'
-                
-                # Normalize filename_part by removing extension if present
-                filename_without_ext = os.path.splitext(filename_part)[0]
-                normalized_without_ext = os.path.splitext(normalized_filename)[0]
-                filename_with_ext = filename_part if filename_part.endswith('.md') else filename_part + '.md'
-                
-                # Check if this link points to a duplicate
-                # Build variations to try
-                try_variations = [
-                    filename_part,
-                    normalized_filename,
-                    filename_with_ext,
-                    filename_without_ext,
-                    normalized_without_ext,
-                    filename_without_ext + '.md',
-                ]
-                
-                matched_key = None
-                survivor = None
-                
-                # Try direct key match first
-                for variant in try_variations:
-                    if variant in self.duplicate_to_survivor:
-                        matched_key = variant
-                        break
-                
-                # If no direct match, try basename matching
-                if not matched_key:
-                    for key in self.duplicate_to_survivor.keys():
-                        key_basename_no_ext = os.path.splitext(os.path.basename(key))[0]
-                        key_basename_with_ext = os.path.basename(key)
-                        
-                        # Check if filenames match (with or without extension)
-                        if (filename_without_ext == key_basename_no_ext or 
-                            filename_part == key_basename_with_ext or
-                            filename_with_ext == key_basename_with_ext or
-                            filename_without_ext == key_basename_with_ext[:-3] if key_basename_with_ext.endswith('.md') else False):
-                            matched_key = key
-                            break
-                
-                if matched_key:
-                    survivor = self.duplicate_to_survivor[matched_key]
-                    self.updated_links_count += 1
-                    
-                    # Build the updated link with proper path structure
-                    if filename_part.startswith('../'):
-                        # Preserve the ../ prefix and rebuild path with survivor
-                        updated_link = f"../{survivor}"
-                    else:
-                        updated_link = survivor
-                    
-                    # Track the link update
-                    self.link_updates.append({
-                        'file': relative_path,
-                        'original_link': filename_part,
-                        'updated_link': updated_link,
-                        'survivor': survivor,
-                        'type': 'wikilink'
-                    })
-                    
-                    logger.debug(f"Wikilink update: {relative_path}: {filename_part} -> {updated_link}")
-                    
-                    if display_part:
-                        return f"[[{updated_link}|{display_part}]]"
-                    else:
-                        return f"[[{updated_link}]]"
-                
-                return match.group(0)
+            # Process wikilinks ([[filename]] or [[filename|display]]) and
+            # markdown links ([text](filename.md)) in one pass
+            updated_content = LINK_RE.sub(functools.partial(self._process_link, relative_path), content)
             
-            wikilink_pattern = r'\[\[([^\]]+)\]\]'
-            updated_content = re.sub(wikilink_pattern, process_wikilink, updated_content)
+            # Write updated content back to file if changes were made. Links
+            # that are left alone are returned unchanged by _process_link, so
+            # the rewrite count (not the match count of subn) tells whether
+            # anything changed, without comparing the two strings.
+            if self.updated_links_count != links_before:
+                if os.linesep != '\n':
+                    updated_content = updated_content.replace('\n', os.linesep)
+                self._replace_file_content(file_path, updated_content)
+                logger.debug("Updated links in %s", relative_path)
+        
+        except Exception as e:
+            logger.error(f"Error updating links in {file_path}: {e}")
+
+    def _replace_file_content(self, file_path: str, content: str) -> None:
+        """
+        Atomically replace a file's content.
+        
+        Writes a uniquely named temporary file next to it, copies the original's
+        mode (and ownership, where permitted) and renames it over the original,
+        so an interrupted run never leaves a half-written note. No fsync is
+        forced. Symlinked and hardlinked notes, and notes whose owner can't be
+        carried over, are written in place to keep the link and ownership.
+        
+        Args:
+            file_path: Path to the file
+            content: New file content
+        """
+        data = content.encode('utf-8')
+        st = os.lstat(file_path)
+        if not os.path.islink(file_path) and st.st_nlink == 1:
+            fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(file_path) + '.',
+                                            suffix='.tmp', dir=os.path.dirname(file_path))
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                shutil.copymode(file_path, tmp_path)
+                tmp_st = os.stat(tmp_path)
+                if (tmp_st.st_uid, tmp_st.st_gid) != (st.st_uid, st.st_gid):
+                    os.chown(tmp_path, st.st_uid, st.st_gid)
+                os.replace(tmp_path, file_path)
+                return
+            except PermissionError:
+                os.remove(tmp_path)  # Can't keep the owner; fall back to writing in place
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        
+        with open(file_path, 'wb') as f:
+            f.write(data)
+
+    def _process_link(self, relative_path: str, match: re.Match) -> str:
+        """
+        Rewrite one LINK_RE match to point to its survivor, if it links a duplicate.
+        
+        Most vaults repeat the same few links many times, so the rewrite of each
+        distinct link text is resolved once and then replayed from a dict: a
+        repeated link costs one lookup instead of splitting, normalizing and
+        formatting it again.
+        
+        Args:
+            relative_path: Vault-relative path of the file being updated
+            match: Match of LINK_RE
             
-            # Process markdown links: [text](filename.md)
-            def process_markdown_link(match):
-                link_text = match.group(1)
-                link_target = match.group(2).strip()
-                
-                # Normalize paths - remove ../ prefix if present
-                normalized_target = link_target
-                if normalized_target.startswith('../'):
-                    normalized_target = normalized_target[3:]  # Remove '../'
-                
-                # Check if this link points to a duplicate
-                # Match both the full path and just the filename
-                base_name = os.path.basename(link_target)
-                matched_key = None
-                
-                # First try to match the full normalized path
-                if normalized_target in self.duplicate_to_survivor:
-                    matched_key = normalized_target
-                # Then try the original path
-                elif link_target in self.duplicate_to_survivor:
-                    matched_key = link_target
-                # Then try just the filename
-                elif base_name in self.duplicate_to_survivor:
-                    matched_key = base_name
-                
-                if matched_key:
-                    survivor = self.duplicate_to_survivor[matched_key]
-                    self.updated_links_count += 1
-                    
-                    # Update the link target while preserving path structure
-                    if link_target.startswith('../'):
-                        # Preserve the ../ structure with full path
-                        updated_target = f"../{survivor}"
-                    else:
-                        dir_path = os.path.dirname(link_target)
-                        if dir_path:
-                            updated_target = f"{dir_path}/{os.path.basename(survivor)}"
-                        else:
-                            updated_target = os.path.basename(survivor)
-                    
-                    # Track the link update
-                    self.link_updates.append({
-                        'file': relative_path,
-                        'original_link': link_target,
-                        'updated_link': updated_target,
-                        'survivor': survivor,
-                        'type': 'markdown'
-                    })
-                    
-                    logger.debug(f"Markdown link: {relative_path}: {link_target} -> {updated_target}")
-                    
-                    return f"[{link_text}]({updated_target})"
-                
-                return match.group(0)
+        Returns:
+            str: Replacement text for the match
+        """
+        original = match.group(0)
+        try:
+            rewrite = self._link_rewrites[original]
+        except KeyError:
+            if match.group(1) is not None:
+                rewrite = self._resolve_wikilink(match.group(1))
+            else:
+                rewrite = self._resolve_markdown_link(match.group(2), match.group(3))
+            self._link_rewrites[original] = rewrite
+        
+        if rewrite is None:
+            return original
+        
+        replacement, update = rewrite
+        self.updated_links_count += 1
+        
+        # Track the link update
+        self.link_updates.append({'file': relative_path, **update})
+        
+        logger.debug("%s link update: %s: %s -> %s", update['type'], relative_path,
+                     update['original_link'], update['updated_link'])
+        
+        return replacement
+
+    def _resolve_wikilink(self, link_content: str) -> Optional[Tuple[str, Dict]]:
+        """
+        Work out how a wikilink is rewritten, if it links a duplicate.
+        
+        Args:
+            link_content: Text between the brackets
             
-            markdown_link_pattern = r'\[([^\]]*)\]\(([^)]+)\)'
-            updated_content = re.sub(markdown_link_pattern, process_markdown_link, updated_content)
+        Returns:
+            Tuple of (replacement text, link update record without 'file'),
+            or None if the wikilink stays as it is
+        """
+        parts = link_content.split('|', 1)
+        filename_part = parts[0].strip()
+        display_part = parts[1] if len(parts) > 1 else None
+        
+        matched_key = self._match_wikilink_key(filename_part)
+        if not matched_key:
+            return None
+        
+        survivor = self.duplicate_to_survivor[matched_key]
+        
+        # Build the updated link with proper path structure
+        if filename_part.startswith('../'):
+            # Preserve the ../ prefix and rebuild path with survivor
+            updated_link = f"../{survivor}"
+        else:
+            updated_link = survivor
+        
+        if display_part:
+            replacement = f"[[{updated_link}|{display_part}]]"
+        else:
+            replacement = f"[[{updated_link}]]"
+        
+        return replacement, {
+            'original_link': filename_part,
+            'updated_link': updated_link,
+            'survivor': survivor,
+            'duplicate': matched_key,
+            'type': 'wikilink'
+        }
+
+    def _match_wikilink_key(self, filename_part: str) -> Optional[str]:
+        """
+        Find the duplicate a wikilink target refers to, if any.
+        
+        Results are memoized per link target, so notes linked from many
+        files are only resolved once per run.
+        
+        Args:
+            filename_part: Link target without display text
             
-            # Write updated content back to file if changes were made
-            if original_content != updated_content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(updated_content)
-                logger.debug(f"Updated links in {relative_path}")
+        Returns:
+            Matching key of duplicate_to_survivor, or None
+        """
+        if filename_part in self._wikilink_matches:
+            return self._wikilink_matches[filename_part]
         
-        except Exception as e:
-            logger.error(f"Error updating links in {file_path}: {e}")
+        # Normalize paths - remove ../ prefix if present
+        normalized_filename = filename_part
+        if normalized_filename.startswith('../'):
+            normalized_filename = normalized_filename[3:]  # Remove '../'
+        
+        # Normalize filename_part by removing extension if present
+        filename_without_ext = os.path.splitext(filename_part)[0]
+        normalized_without_ext = os.path.splitext(normalized_filename)[0]
+        filename_with_ext = filename_part if filename_part.endswith('.md') else filename_part + '.md'
+        
+        # Check if this link points to a duplicate
+        # Build variations to try
+        try_variations = [
+            filename_part,
+            normalized_filename,
+            filename_with_ext,
+            filename_without_ext,
+            normalized_without_ext,
+            filename_without_ext + '.md',
+        ]
+        
+        matched_key = None
+        
+        # Try direct key match first
+        for variant in try_variations:
+            if variant in self.duplicate_to_survivor:
+                matched_key = variant
+                break
+        
+        # If no direct match, try basename matching (with or without extension)
+        if not matched_key:
+            candidates = [self._basename_index.get(filename_without_ext)]
+            if not filename_part.endswith('.md'):
+                candidates.append(self._basename_index.get(filename_part))
+            candidates = [candidate for candidate in candidates if candidate]
+            if candidates:
+                matched_key = min(candidates)[1]
+        
+        self._wikilink_matches[filename_part] = matched_key
+        return matched_key
+
+    def _resolve_markdown_link(self, link_text: str, link_target: str) -> Optional[Tuple[str, Dict]]:
+        """
+        Work out how a markdown link is rewritten, if it links a duplicate.
+        
+        Args:
+            link_text: Link text
+            link_target: Link target
+            
+        Returns:
+            Tuple of (replacement text, link update record without 'file'),
+            or None if the link stays as it is
+        """
+        link_target = link_target.strip()
+        
+        # Normalize paths - remove ../ prefix if present
+        normalized_target = link_target
+        if normalized_target.startswith('../'):
+            normalized_target = normalized_target[3:]  # Remove '../'
+        
+        # Check if this link points to a duplicate
+        # Match both the full path and just the filename
+        base_name = os.path.basename(link_target)
+        matched_key = None
+        
+        # First try to match the full normalized path
+        if normalized_target in self.duplicate_to_survivor:
+            matched_key = normalized_target
+        # Then try the original path
+        elif link_target in self.duplicate_to_survivor:
+            matched_key = link_target
+        # Then try just the filename
+        elif base_name in self.duplicate_to_survivor:
+            matched_key = base_name
+        
+        if not matched_key:
+            return None
+        
+        survivor = self.duplicate_to_survivor[matched_key]
+        
+        # Update the link target while preserving path structure
+        if link_target.startswith('../'):
+            # Preserve the ../ structure with full path
+            updated_target = f"../{survivor}"
+        else:
+            dir_path = os.path.dirname(link_target)
+            if dir_path:
+                updated_target = f"{dir_path}/{os.path.basename(survivor)}"
+            else:
+                updated_target = os.path.basename(survivor)
+        
+        return f"[{link_text}]({updated_target})", {
+            'original_link': link_target,
+            'updated_link': updated_target,
+            'survivor': survivor,
+            'duplicate': matched_key,
+            'type': 'markdown'
+        }
 
     def rename_non_survivors(self) -> None:
         """
@@ -315,39 +619,59 @@ class DeduplicationHandler:
         
         logger.info("Renaming non-surviving duplicates...")
         
-        for file_hash, siblings in self.sibling_groups.items():
-            survivor = self.survivors[file_hash]
-            
-            for duplicate in siblings:
-                if duplicate == survivor:
-                    continue
-                
-                # Construct absolute path
-                duplicate_path = os.path.join(self.vault_path, duplicate)
-                
-                if os.path.exists(duplicate_path):
-                    # Get directory and filename
-                    dir_path = os.path.dirname(duplicate_path)
-                    filename = os.path.basename(duplicate_path)
-                    new_filename = f"dup-{filename}"
-                    new_path = os.path.join(dir_path, new_filename)
-                    
-                    try:
-                        os.rename(duplicate_path, new_path)
-                        relative_new_path = os.path.relpath(new_path, self.vault_path)
-                        
-                        self.renamed_files.append({
-                            'original': duplicate,
-                            'renamed': relative_new_path,
-                            'hash': file_hash[:8] + '...'
-                        })
-                        
-                        logger.debug(f"Renamed: {duplicate} -> {new_filename}")
-                    except Exception as e:
-                        logger.error(f"Failed to rename {duplicate}: {e}")
+        renames = [
+            (file_hash, duplicate)
+            for file_hash in self.sibling_groups
+            for duplicate in self._duplicates_by_hash[file_hash]
+        ]
+        
+        # os.rename releases the GIL, so renames run concurrently; they are
+        # issued directory by directory for metadata locality
+        order = sorted(range(len(renames)), key=lambda i: os.path.dirname(renames[i][1]))
+        with ThreadPoolExecutor(max_workers=RENAME_WORKERS) as executor:
+            results = dict(zip(order, executor.map(self._rename_duplicate, [renames[i] for i in order])))
+        
+        # Record renamed files in sibling group order
+        self.renamed_files.extend(results[i] for i in range(len(renames)) if results[i] is not None)
         
         logger.info(f"Renamed {len(self.renamed_files)} non-surviving files")
 
+    def _rename_duplicate(self, rename: Tuple[str, str]) -> Optional[Dict]:
+        """
+        Give one non-surviving file a "dup-" prefix.
+        
+        Args:
+            rename: Tuple of (group hash, vault-relative duplicate path)
+            
+        Returns:
+            Renamed file record, or None if the file is missing or the rename failed
+        """
+        file_hash, duplicate = rename
+        
+        # Construct absolute path
+        duplicate_path = os.path.join(self.vault_path, duplicate)
+        if not os.path.exists(duplicate_path):
+            return None
+        
+        # Get directory and filename
+        dir_path = os.path.dirname(duplicate_path)
+        filename = os.path.basename(duplicate_path)
+        new_filename = f"dup-{filename}"
+        new_path = os.path.join(dir_path, new_filename)
+        
+        try:
+            os.rename(duplicate_path, new_path)
+        except Exception as e:
+            logger.error(f"Failed to rename {duplicate}: {e}")
+            return None
+        
+        logger.debug("Renamed: %s -> %s", duplicate, new_filename)
+        return {
+            'original': duplicate,
+            'renamed': os.path.relpath(new_path, self.vault_path),
+            'hash': file_hash[:8] + '...'
+        }
+    
     def process_duplicates(self) -> bool:
         """
         Execute the complete deduplication process.
@@ -444,7 +768,7 @@ class DeduplicationHandler:
         # Add details about each sibling group
         for file_hash, siblings in self.sibling_groups.items():
             survivor = self.survivors[file_hash]
-            duplicates = [s for s in siblings if s != survivor]
+            duplicates = self._duplicates_by_hash[file_hash]
             report['sibling_groups'][file_hash] = {
                 'survivor': survivor,
                 'duplicates': duplicates,
@@ -465,29 +789,26 @@ class DeduplicationHandler:
             'without_links': {}
         }
         
-        # Get all duplicates that had links updated
-        linked_duplicates = set()
-        for update in self.link_updates:
-            # Find which duplicate this link originally pointed to
-            for dup, surv in self.duplicate_to_survivor.items():
-                if dup in update['original_link'] or update['original_link'].endswith(os.path.basename(dup)):
-                    linked_duplicates.add(dup)
-                    break
+        # Positions of the link updates, by the duplicate each one pointed to
+        updates_by_duplicate: Dict[str, List[int]] = defaultdict(list)
+        for index, update in enumerate(self.link_updates):
+            updates_by_duplicate[update['duplicate']].append(index)
         
         # Categorize sibling groups
         for file_hash, siblings in self.sibling_groups.items():
             survivor = self.survivors[file_hash]
-            duplicates = [s for s in siblings if s != survivor]
+            duplicates = self._duplicates_by_hash[file_hash]
             
-            # Check if any duplicate in this group had links
-            has_links = any(dup in linked_duplicates for dup in duplicates)
+            # Link updates that pointed to a duplicate in this group, in update order
+            update_indexes = sorted(index for dup in duplicates for index in updates_by_duplicate.get(dup, ()))
+            group_updates = [self.link_updates[index] for index in update_indexes]
             
-            category = 'with_links' if has_links else 'without_links'
+            category = 'with_links' if group_updates else 'without_links'
             categorized[category][file_hash] = {
                 'survivor': survivor,
                 'duplicates': duplicates,
                 'total_files': len(siblings),
-                'link_updates': [u for u in self.link_updates if any(dup in u['original_link'] for dup in duplicates)]
+                'link_updates': group_updates
             }
         
         return categorized
@@ -501,56 +822,136 @@ class DeduplicationHandler:
         categorized = self._categorize_deduplications()
         report_path = os.path.join(self.vault_path, "deduplication_report.html")
         
-        html_content = f"""<!DOCTYPE html>
+        try:
+            # Stream the report section by section instead of building it in memory
+            with open(report_path, 'w', encoding='utf-8', buffering=1 << 16) as out:
+                self._write_html_report(out, report, categorized)
+            logger.info(f"Deduplication HTML report generated at {report_path}")
+        except Exception as e:
+            logger.error(f"Failed to generate HTML report: {e}")
+
+    def _write_html_report(self, out, report: Dict, categorized: Dict) -> None:
+        """
+        Write the HTML deduplication report to an open file.
+        
+        Args:
+            out: Text file opened for writing
+            report: Report from generate_report()
+            categorized: Sibling groups from _categorize_deduplications()
+        """
+        out.write(DEDUP_REPORT_HEAD)
+        out.write(DEDUP_REPORT_SUMMARY.format(vault_path=self.vault_path, **report))
+        
+        # Add categorized sections
+        # Files WITH incoming links
+        if categorized['with_links']:
+            out.write(DEDUP_REPORT_WITH_LINKS_HEADING.format(group_count=len(categorized['with_links'])))
+            for file_hash, group_data in sorted(categorized['with_links'].items()):
+                link_updates = group_data['link_updates']
+                parts = [
+                    DEDUP_REPORT_LINKED_GROUP.format(
+                        short_hash=file_hash[:16], file_hash=file_hash,
+                        update_count=len(link_updates), duplicate_count=len(group_data['duplicates']),
+                        **group_data),
+                    *map(DEDUP_REPORT_DUPLICATE_ITEM.format, group_data['duplicates']),
+                    "            </ul>\n"
+                ]
+                
+                if link_updates:
+                    parts.append(DEDUP_REPORT_GROUP_UPDATES_TABLE.format(update_count=len(link_updates)))
+                    parts.extend(map(DEDUP_REPORT_GROUP_UPDATE_ROW.format_map, link_updates[:20]))  # Limit per group
+                    if len(link_updates) > 20:
+                        parts.append(f"                <tr><td colspan='3'>... and {len(link_updates) - 20} more</td></tr>")
+                    parts.append("            </table>\n")
+                
+                parts.append("        </div>\n")
+                out.write("".join(parts))
+        
+        # Files WITHOUT incoming links
+        if categorized['without_links']:
+            out.write(DEDUP_REPORT_WITHOUT_LINKS_HEADING.format(group_count=len(categorized['without_links'])))
+            for file_hash, group_data in sorted(categorized['without_links'].items()):
+                out.write("".join([
+                    DEDUP_REPORT_UNLINKED_GROUP.format(
+                        short_hash=file_hash[:16], file_hash=file_hash,
+                        duplicate_count=len(group_data['duplicates']), **group_data),
+                    *map(DEDUP_REPORT_DUPLICATE_ITEM.format, group_data['duplicates']),
+                    "            </ul>\n        </div>\n"
+                ]))
+        
+        # Add link updates section
+        if report['link_updates']:
+            parts = [DEDUP_REPORT_ALL_UPDATES_TABLE.format(count=len(report['link_updates']))]
+            for update in report['link_updates'][:100]:  # Limit to first 100
+                link_type_class = "link-type-wikilink" if update['type'] == 'wikilink' else "link-type-markdown"
+                parts.append(DEDUP_REPORT_UPDATE_ROW.format(link_type_class=link_type_class, **update))
+            if len(report['link_updates']) > 100:
+                parts.append(f"                <tr><td colspan='4'>... and {len(report['link_updates']) - 100} more link updates</td></tr>")
+            parts.append(DEDUP_REPORT_TABLE_END)
+            out.write("".join(parts))
+        
+        # Add renamed files section
+        if report['renamed_files']:
+            out.write("".join([
+                DEDUP_REPORT_RENAMED_TABLE.format(count=len(report['renamed_files'])),
+                *map(DEDUP_REPORT_RENAMED_ROW.format_map, report['renamed_files']),
+                "            </table>\n        </div>\n"
+            ]))
+        
+        out.write(DEDUP_REPORT_FOOT)
+
+
+# Static part of the deduplication HTML report, up to the summary cards
+DEDUP_REPORT_HEAD = """<!DOCTYPE html>
 <html>
 <head>
     <title>Deduplication Report</title>
     <style>
-        body {{
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             margin: 20px;
             background-color: #f5f5f5;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             padding: 30px;
             border-radius: 10px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        h1 {{
+        }
+        h1 {
             color: #2c3e50;
             border-bottom: 3px solid #3498db;
             padding-bottom: 10px;
-        }}
-        h2 {{
+        }
+        h2 {
             color: #34495e;
             margin-top: 30px;
-        }}
-        .summary {{
+        }
+        .summary {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 15px;
             margin: 20px 0;
-        }}
-        .stat-card {{
+        }
+        .stat-card {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 20px;
             border-radius: 8px;
             text-align: center;
-        }}
-        .stat-number {{
+        }
+        .stat-number {
             font-size: 2.5em;
             font-weight: bold;
             margin: 10px 0;
-        }}
-        .stat-label {{
+        }
+        .stat-label {
             font-size: 0.9em;
             opacity: 0.9;
-        }}
-        .collapsible {{
+        }
+        .collapsible {
             background-color: #3498db;
             color: white;
             cursor: pointer;
@@ -562,131 +963,127 @@ class DeduplicationHandler:
             font-size: 16px;
             border-radius: 5px;
             margin-top: 10px;
-        }}
-        .collapsible:hover {{
+        }
+        .collapsible:hover {
             background-color: #2980b9;
-        }}
-        .collapsible:after {{
+        }
+        .collapsible:after {
             content: '+';
             font-weight: bold;
             float: right;
             margin-left: 5px;
-        }}
-        .collapsible.active:after {{
+        }
+        .collapsible.active:after {
             content: '-';
-        }}
-        .content {{
+        }
+        .content {
             display: none;
             padding: 15px;
             background-color: #f8f9fa;
             border-left: 4px solid #3498db;
             margin-bottom: 10px;
-        }}
-        .content.active {{
+        }
+        .content.active {
             display: block;
-        }}
-        table {{
+        }
+        table {
             width: 100%;
             border-collapse: collapse;
             margin-top: 10px;
-        }}
-        th, td {{
+        }
+        th, td {
             padding: 12px;
             text-align: left;
             border-bottom: 1px solid #ddd;
-        }}
-        th {{
+        }
+        th {
             background-color: #3498db;
             color: white;
-        }}
-        tr:hover {{
+        }
+        tr:hover {
             background-color: #f5f5f5;
-        }}
-        .survivor {{
+        }
+        .survivor {
             color: #27ae60;
             font-weight: bold;
-        }}
-        .duplicate {{
+        }
+        .duplicate {
             color: #e74c3c;
-        }}
-        .link-type-wikilink {{
+        }
+        .link-type-wikilink {
             background-color: #ecf0f1;
             padding: 3px 8px;
             border-radius: 3px;
             font-family: monospace;
-        }}
-        .link-type-markdown {{
+        }
+        .link-type-markdown {
             background-color: #e8f5e9;
             padding: 3px 8px;
             border-radius: 3px;
             font-family: monospace;
-        }}
-        .code {{
+        }
+        .code {
             background-color: #f4f4f4;
             padding: 2px 6px;
             border-radius: 3px;
             font-family: monospace;
             font-size: 0.9em;
-        }}
+        }
     </style>
     <script>
-        function toggleSection(element) {{
+        function toggleSection(element) {
             element.classList.toggle('active');
             var content = element.nextElementSibling;
             content.classList.toggle('active');
-        }}
+        }
     </script>
 </head>
 <body>
     <div class="container">
         <h1>🔍 Deduplication Report</h1>
-        <p>Generated for: {self.vault_path}</p>
+"""
+
+# Report sections below are str.format templates, filled in per group/row
+DEDUP_REPORT_SUMMARY = """        <p>Generated for: {vault_path}</p>
         
         <div class="summary">
             <div class="stat-card">
-                <div class="stat-number">{report['total_sibling_groups']}</div>
+                <div class="stat-number">{total_sibling_groups}</div>
                 <div class="stat-label">Sibling Groups</div>
             </div>
             <div class="stat-card">
-                <div class="stat-number">{report['total_duplicates']}</div>
+                <div class="stat-number">{total_duplicates}</div>
                 <div class="stat-label">Duplicate Files</div>
             </div>
             <div class="stat-card">
-                <div class="stat-number">{report['links_updated']}</div>
+                <div class="stat-number">{links_updated}</div>
                 <div class="stat-label">Links Updated</div>
             </div>
             <div class="stat-card">
-                <div class="stat-number">{report['files_renamed']}</div>
+                <div class="stat-number">{files_renamed}</div>
                 <div class="stat-label">Files Renamed</div>
             </div>
         </div>
 """
-        
-        # Add categorized sections
-        # Files WITH incoming links
-        if categorized['with_links']:
-            html_content += f"""
-        <h2>📎 Deduplicated Files WITH Incoming Links ({len(categorized['with_links'])} groups)</h2>
+
+DEDUP_REPORT_WITH_LINKS_HEADING = """
+        <h2>📎 Deduplicated Files WITH Incoming Links ({group_count} groups)</h2>
         <p style="color: #7f8c8d;">These files had links pointing to them that were updated to point to survivors.</p>
 """
-            for file_hash, group_data in sorted(categorized['with_links'].items()):
-                html_content += f"""
+
+DEDUP_REPORT_LINKED_GROUP = """
         <button class="collapsible" onclick="toggleSection(this)">
-            🔗 Group: {file_hash[:16]}... ({group_data['total_files']} files, {len(group_data['link_updates'])} link updates)
+            🔗 Group: {short_hash}... ({total_files} files, {update_count} link updates)
         </button>
         <div class="content">
             <p><strong>Hash:</strong> <code>{file_hash}</code></p>
-            <p><strong>Survivor:</strong> <span class="survivor">{group_data['survivor']}</span></p>
-            <p><strong>Duplicates ({len(group_data['duplicates'])}):</strong></p>
+            <p><strong>Survivor:</strong> <span class="survivor">{survivor}</span></p>
+            <p><strong>Duplicates ({duplicate_count}):</strong></p>
             <ul>
 """
-                for dup in group_data['duplicates']:
-                    html_content += f"                <li class=\"duplicate\">{dup}</li>\n"
-                html_content += "            </ul>\n"
-                
-                if group_data['link_updates']:
-                    html_content += f"""
-            <p><strong>Link Updates ({len(group_data['link_updates'])}):</strong></p>
+
+DEDUP_REPORT_GROUP_UPDATES_TABLE = """
+            <p><strong>Link Updates ({update_count}):</strong></p>
             <table style="font-size: 0.9em;">
                 <tr>
                     <th>File</th>
@@ -694,47 +1091,37 @@ class DeduplicationHandler:
                     <th>Updated Link</th>
                 </tr>
 """
-                    for update in group_data['link_updates'][:20]:  # Limit per group
-                        html_content += f"""
+
+DEDUP_REPORT_GROUP_UPDATE_ROW = """
                 <tr>
-                    <td>{update['file']}</td>
-                    <td class="code">{update['original_link']}</td>
-                    <td class="code">{update['updated_link']}</td>
+                    <td>{file}</td>
+                    <td class="code">{original_link}</td>
+                    <td class="code">{updated_link}</td>
                 </tr>
 """
-                    if len(group_data['link_updates']) > 20:
-                        html_content += f"                <tr><td colspan='3'>... and {len(group_data['link_updates']) - 20} more</td></tr>"
-                    html_content += "            </table>\n"
-                
-                html_content += "        </div>\n"
-        
-        # Files WITHOUT incoming links
-        if categorized['without_links']:
-            html_content += f"""
-        <h2>📦 Deduplicated Files WITHOUT Incoming Links ({len(categorized['without_links'])} groups)</h2>
+
+DEDUP_REPORT_WITHOUT_LINKS_HEADING = """
+        <h2>📦 Deduplicated Files WITHOUT Incoming Links ({group_count} groups)</h2>
         <p style="color: #7f8c8d;">These files had no links pointing to them (orphaned duplicates).</p>
 """
-            for file_hash, group_data in sorted(categorized['without_links'].items()):
-                html_content += f"""
+
+DEDUP_REPORT_UNLINKED_GROUP = """
         <button class="collapsible" onclick="toggleSection(this)">
-            📁 Group: {file_hash[:16]}... ({group_data['total_files']} files)
+            📁 Group: {short_hash}... ({total_files} files)
         </button>
         <div class="content">
             <p><strong>Hash:</strong> <code>{file_hash}</code></p>
-            <p><strong>Survivor:</strong> <span class="survivor">{group_data['survivor']}</span></p>
-            <p><strong>Duplicates ({len(group_data['duplicates'])}):</strong></p>
+            <p><strong>Survivor:</strong> <span class="survivor">{survivor}</span></p>
+            <p><strong>Duplicates ({duplicate_count}):</strong></p>
             <ul>
 """
-                for dup in group_data['duplicates']:
-                    html_content += f"                <li class=\"duplicate\">{dup}</li>\n"
-                html_content += "            </ul>\n        </div>\n"
-        
-        # Add link updates section
-        if report['link_updates']:
-            html_content += """
+
+DEDUP_REPORT_DUPLICATE_ITEM = "                <li class=\"duplicate\">{}</li>\n"
+
+DEDUP_REPORT_ALL_UPDATES_TABLE = """
         <h2>🔗 Link Updates</h2>
         <button class="collapsible" onclick="toggleSection(this)">
-            View All Link Updates ({len(report['link_updates'])})
+            View All Link Updates ({count})
         </button>
         <div class="content">
             <table>
@@ -745,29 +1132,25 @@ class DeduplicationHandler:
                     <th>Updated Link</th>
                 </tr>
 """
-            for update in report['link_updates'][:100]:  # Limit to first 100
-                link_type_class = "link-type-wikilink" if update['type'] == 'wikilink' else "link-type-markdown"
-                html_content += f"""
+
+DEDUP_REPORT_UPDATE_ROW = """
                 <tr>
-                    <td>{update['file']}</td>
-                    <td><span class="{link_type_class}">{update['type']}</span></td>
-                    <td class="code">{update['original_link']}</td>
-                    <td class="code">{update['updated_link']}</td>
+                    <td>{file}</td>
+                    <td><span class="{link_type_class}">{type}</span></td>
+                    <td class="code">{original_link}</td>
+                    <td class="code">{updated_link}</td>
                 </tr>
 """
-            if len(report['link_updates']) > 100:
-                html_content += f"                <tr><td colspan='4'>... and {len(report['link_updates']) - 100} more link updates</td></tr>"
-            html_content += """
+
+DEDUP_REPORT_TABLE_END = """
             </table>
         </div>
 """
-        
-        # Add renamed files section
-        if report['renamed_files']:
-            html_content += """
+
+DEDUP_REPORT_RENAMED_TABLE = """
         <h2>📝 Renamed Files</h2>
         <button class="collapsible" onclick="toggleSection(this)">
-            View All Renamed Files ({len(report['renamed_files'])})
+            View All Renamed Files ({count})
         </button>
         <div class="content">
             <table>
@@ -776,27 +1159,57 @@ class DeduplicationHandler:
                     <th>Renamed To</th>
                 </tr>
 """
-            for renamed in report['renamed_files']:
-                html_content += f"""
+
+DEDUP_REPORT_RENAMED_ROW = """
                 <tr>
-                    <td>{renamed['original']}</td>
-                    <td class="duplicate">{renamed['renamed']}</td>
+                    <td>{original}</td>
+                    <td class="duplicate">{renamed}</td>
                 </tr>
 """
-            html_content += "            </table>\n        </div>\n"
-        
-        html_content += """
+
+DEDUP_REPORT_FOOT = """
     </div>
 </body>
 </html>
 """
+
+
+# Handler used by link update worker processes, set up by _init_link_worker
+_worker_handler = None
+
+
+def _init_link_worker(log_file: str, vault_path: str, duplicate_to_survivor: Dict[str, str]) -> None:
+    """
+    Set up the per-process handler for parallel link updates.
+    
+    Args:
+        log_file: Path of the parent process's log file
+        vault_path: Path to the vault
+        duplicate_to_survivor: Final duplicate -> survivor mapping
+    """
+    global _worker_handler
+    logger.use_direct_handlers(log_file)
+    _worker_handler = DeduplicationHandler()
+    _worker_handler.vault_path = vault_path
+    _worker_handler.duplicate_to_survivor = duplicate_to_survivor
+    _worker_handler._prepare_link_lookup()
+
+
+def _update_links_worker(file_path: str) -> Tuple[int, List[Dict]]:
+    """
+    Update links in one file inside a worker process.
+    
+    Args:
+        file_path: Path to the markdown file
         
-        try:
-            with open(report_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            logger.info(f"Deduplication HTML report generated at {report_path}")
-        except Exception as e:
-            logger.error(f"Failed to generate HTML report: {e}")
+    Returns:
+        Tuple of (number of links updated, link update records)
+    """
+    handler = _worker_handler
+    handler.updated_links_count = 0
+    handler.link_updates = []
+    handler._update_links_in_file(file_path)
+    return handler.updated_links_count, handler.link_updates
 
 
 # Global deduplication handler instance
@@ -5,7 +5,7 @@ Duplicate Link Resolver for Obsidian Vault Merger
 Handles duplicate file resolution by updating links to point to a single survivor.
 
 Key Features:
-- Identifies "sibling groups" (files with identical MD5 hashes)
+- Identifies "sibling groups" (files with identical content hashes)
 - Selects "survivor" (shortest filename) for each sibling group
 - Updates all internal links to point to survivors instead of duplicates
 - Verifies no files become orphaned after link updates
@@ -13,12 +13,11 @@ Key Features:
 """
 
 import os
-import re
 import sys
 from collections import defaultdict
 from typing import Dict, List, Set
 from logger import logger
-from link_processor import link_processor
+from link_processor import link_processor, WIKILINK_RE, MARKDOWN_LINK_RE
 
 
 class DuplicateLinkResolver:
@@ -50,7 +49,7 @@ class DuplicateLinkResolver:
 
     def identify_sibling_groups(self) -> None:
         """
-        Identify sibling groups (files with identical MD5 hashes) from the link mapping file.
+        Identify sibling groups (files with identical content hashes) from the link mapping file.
         """
         logger.info("Identifying sibling groups...")
         
@@ -115,8 +114,8 @@ class DuplicateLinkResolver:
             self.survivors[file_hash] = survivor
             
             duplicates = [s for s in siblings if s != survivor]
-            logger.debug(f"Hash {file_hash}: Selected survivor '{survivor}' from {len(siblings)} files")
-            logger.debug(f"  Duplicates to be replaced: {duplicates}")
+            logger.debug("Hash %s: Selected survivor '%s' from %d files", file_hash, survivor, len(siblings))
+            logger.debug("  Duplicates to be replaced: %s", duplicates)
 
     def update_internal_links(self) -> None:
         """
@@ -181,8 +180,7 @@ class DuplicateLinkResolver:
                 
                 return match.group(0)
             
-            wikilink_pattern = r'\[\[([^\]]+)\]\]'
-            updated_content = re.sub(wikilink_pattern, process_wikilink, updated_content)
+            updated_content = WIKILINK_RE.sub(process_wikilink, updated_content)
             
             # Process markdown links: [text](filename.md) or [text](path/filename.md)
             def process_markdown_link(match):
@@ -210,14 +208,13 @@ class DuplicateLinkResolver:
                 
                 return match.group(0)
             
-            markdown_link_pattern = r'\[([^\]]*)\]\(([^)]+)\)'
-            updated_content = re.sub(markdown_link_pattern, process_markdown_link, updated_content)
+            updated_content = MARKDOWN_LINK_RE.sub(process_markdown_link, updated_content)
             
             # Write updated content back to file if changes were made
             if original_content != updated_content:
                 with open(file_path, 'w', encoding='utf-8') as f:
                     f.write(updated_content)
-                logger.debug(f"Updated links in {relative_file_path}")
+                logger.debug("Updated links in %s", relative_file_path)
         
         except Exception as e:
             logger.error(f"Error updating links in {file_path}: {e}")
@@ -252,7 +249,7 @@ class DuplicateLinkResolver:
                                 'new_path': os.path.relpath(new_path, self.vault_path),
                                 'hash': file_hash
                             })
-                            logger.debug(f"Renamed: {duplicate} -> {new_filename}")
+                            logger.debug("Renamed: %s -> %s", duplicate, new_filename)
                         except Exception as e:
                             logger.error(f"Failed to rename {duplicate}: {e}")
         
@@ -275,7 +272,7 @@ class DuplicateLinkResolver:
             if os.path.exists(new_path):
                 try:
                     os.rename(new_path, original_path)
-                    logger.debug(f"Rolled back: {rename_info['new_path']} -> {rename_info['original_path']}")
+                    logger.debug("Rolled back: %s -> %s", rename_info['new_path'], rename_info['original_path'])
                 except Exception as e:
                     logger.error(f"Failed to rollback {rename_info['new_path']}: {e}")
         
@@ -68,7 +68,7 @@ class FileCopier:
         }
         self.copy_log.append(copy_info)
         
-        logger.debug(f"Copied '{source_path}' to '{dest_path}'")
+        logger.debug("Copied '%s' to '%s'", source_path, dest_path)
 
     def get_copy_log(self) -> List[Dict]:
         """
@@ -1,4 +1,5 @@
 import os
+from collections import Counter
 from typing import List, Dict
 from config_manager import config_manager
 from logger import logger
@@ -12,7 +13,13 @@ class FileScanner:
     """
 
     def __init__(self):
-        self.file_inventory: List[Dict] = []
+        # Inventory stored column-wise: entry i is (original_paths[i],
+        # relative_paths[i], filenames[i], base_paths[i])
+        self.original_paths: List[str] = []
+        self.relative_paths: List[str] = []
+        self.filenames: List[str] = []
+        self.base_paths: List[str] = []
+        self._file_inventory: List[Dict] = []  # Dicts built so far by get_file_inventory
         self.filename_counts: Dict[str, int] = {}
 
     def scan_vaults(self) -> None:
@@ -23,37 +30,70 @@ class FileScanner:
         for source_path in config_manager.source_paths:
             logger.info(f"Scanning vault: {source_path}")
             self._scan_directory(source_path, source_path)
-        logger.info(f"Scan complete. Found {len(self.file_inventory)} files.")
+        
+        # Count filenames for collision detection in one pass over the inventory
+        self.filename_counts = Counter(self.filenames)
+        logger.info(f"Scan complete. Found {len(self.filenames)} files.")
 
     def _scan_directory(self, base_path: str, current_path: str) -> None:
         """
-        Recursively scan a directory and its subdirectories.
+        Scan a directory and its subdirectories.
+        
+        Uses os.scandir, whose entries carry the file type from the directory
+        listing, so most files and folders need no extra stat() call. The walk
+        keeps an explicit stack of open directory iterators instead of
+        recursing, but visits entries in the same depth-first order as before.
+        Symlinks are still followed.
         
         Args:
             base_path: The root path of the vault being scanned
             current_path: The current directory being scanned
         """
-        try:
-            for item in os.listdir(current_path):
-                item_path = os.path.join(current_path, item)
+        stack = []
+        self._push_directory(stack, current_path)
+        
+        while stack:
+            directory, entries = stack[-1]
+            try:
+                entry = next(entries, None)
+                if entry is None:
+                    entries.close()
+                    stack.pop()
+                    continue
                 
                 # Skip dot-prefixed folders if configured to do so
-                if config_manager.exclude_dot_folders and item.startswith('.'):
-                    if os.path.isdir(item_path):
-                        logger.debug(f"Skipping dot-prefixed folder: {item_path}")
+                if config_manager.exclude_dot_folders and entry.name.startswith('.'):
+                    if entry.is_dir():
+                        logger.debug("Skipping dot-prefixed folder: %s", entry.path)
                         continue
                 
-                if os.path.isfile(item_path):
+                if entry.is_file():
                     # Check if file type is included
-                    if self._is_included_file(item):
-                        self._add_file_to_inventory(base_path, item_path)
-                elif os.path.isdir(item_path):
-                    # Recursively scan subdirectories
-                    self._scan_directory(base_path, item_path)
+                    if self._is_included_file(entry.name):
+                        self._add_file_to_inventory(base_path, entry.path)
+                elif entry.is_dir():
+                    # Scan subdirectories before the rest of this directory
+                    self._push_directory(stack, entry.path)
+            except Exception as e:
+                # Give up on this directory, like the recursive scan did
+                logger.error(f"Error scanning {directory}: {e}")
+                entries.close()
+                stack.pop()
+    
+    def _push_directory(self, stack: List, path: str) -> None:
+        """
+        Open a directory for scanning and push its iterator onto the stack.
+        
+        Args:
+            stack: Stack of (directory path, os.scandir iterator) tuples
+            path: Directory to open
+        """
+        try:
+            stack.append((path, os.scandir(path)))
         except PermissionError as e:
-            logger.error(f"Permission denied when scanning {current_path}: {e}")
+            logger.error(f"Permission denied when scanning {path}: {e}")
         except Exception as e:
-            logger.error(f"Error scanning {current_path}: {e}")
+            logger.error(f"Error scanning {path}: {e}")
 
     def _is_included_file(self, filename: str) -> bool:
         """
@@ -77,31 +117,21 @@ class FileScanner:
 
     def _add_file_to_inventory(self, base_path: str, file_path: str) -> None:
         """
-        Add a file to the inventory and track filename counts for collision detection.
+        Add a file to the inventory.
+        
+        Filenames are counted for collision detection once the scan is done.
         
         Args:
             base_path: The root path of the vault being scanned
             file_path: Full path to the file
         """
         relative_path = os.path.relpath(file_path, base_path)
-        filename = os.path.basename(file_path)
-        
-        # Track filename counts for collision detection
-        if filename in self.filename_counts:
-            self.filename_counts[filename] += 1
-        else:
-            self.filename_counts[filename] = 1
-            
-        file_info = {
-            "original_path": file_path,
-            "relative_path": relative_path,
-            "filename": filename,
-            "base_path": base_path,
-            "collision_count": self.filename_counts[filename]
-        }
         
-        self.file_inventory.append(file_info)
-        logger.debug(f"Added file to inventory: {relative_path}")
+        self.original_paths.append(file_path)
+        self.relative_paths.append(relative_path)
+        self.filenames.append(os.path.basename(file_path))
+        self.base_paths.append(base_path)
+        logger.debug("Added file to inventory: %s", relative_path)
 
     def get_collision_candidates(self) -> List[str]:
         """
@@ -112,14 +142,35 @@ class FileScanner:
         """
         return [filename for filename, count in self.filename_counts.items() if count > 1]
 
+    def get_file_count(self) -> int:
+        """
+        Get the number of files in the inventory.
+        
+        Returns:
+            int: Number of files found by the scan
+        """
+        return len(self.filenames)
+    
     def get_file_inventory(self) -> List[Dict]:
         """
         Get the complete file inventory.
         
+        The dicts are built from the inventory columns on the first call and
+        then reused, so changes made to them (e.g. by the collision resolver)
+        are kept.
+        
         Returns:
             List[Dict]: List of file information dictionaries
         """
-        return self.file_inventory
+        inventory = self._file_inventory
+        for i in range(len(inventory), len(self.filenames)):
+            inventory.append({
+                "original_path": self.original_paths[i],
+                "relative_path": self.relative_paths[i],
+                "filename": self.filenames[i],
+                "base_path": self.base_paths[i]
+            })
+        return inventory
 
 
 # Global file scanner instance
@@ -1,7 +1,11 @@
 import os
 import re
 import hashlib
-from typing import List, Dict, Set, Optional
+import mmap
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Dict, FrozenSet, Optional, Tuple
 from config_manager import config_manager
 from collision_resolver import collision_resolver
 from logger import logger
@@ -9,6 +13,34 @@ from logger import logger
 global LINKMAPFILE 
 LINKMAPFILE = "linkmap.txt"
 
+# Content hash for the link map. With SHA extensions (most x86 and ARM CPUs
+# since ~2017) OpenSSL's SHA-256 outruns both MD5 and BLAKE2b.
+HASH_ALGORITHM = "sha256"
+
+# Wikilinks [[filename]] or [[filename|display]], and markdown links
+# [text](filename.md); compiled once instead of looked up per note
+WIKILINK_RE = re.compile(r'\[\[([^\]]+)\]\]')
+MARKDOWN_LINK_RE = re.compile(r'\[([^\]]*)\]\(([^)]+)\)')
+
+# Up to this many renamed files, notes mentioning none of them skip the link update
+RENAME_PREFILTER_LIMIT = 50
+
+# Notes at least this large are hashed and checked for link markers via mmap
+MMAP_MIN_BYTES = 1 << 20
+
+# Vaults with at least this many notes have their links processed in worker processes
+PARALLEL_LINK_PROCESSING_MIN_FILES = 256
+
+# Link map lines collected before each write, and the file buffer they go through
+LINKMAP_WRITE_BATCH = 10000
+LINKMAP_BUFFER_SIZE = 1 << 20
+
+# Seconds between redraws of the hashing progress line
+PROGRESS_INTERVAL = 0.1
+
+# Threads hashing files concurrently; file_digest releases the GIL while reading
+HASH_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
 class LinkProcessor:
     """
     Processes internal links in markdown files.
@@ -17,9 +49,11 @@ class LinkProcessor:
     """
 
     def __init__(self):
-        self.link_mapping: List[str] = []
+        self.link_mapping: List[Tuple[str, str, str]] = []  # (source file, target, link type)
         self.unresolved_links: List[str] = []
-        self.vault_files: Set[str] = set()  # Set of all files in the vault
+        self.vault_files: FrozenSet[str] = frozenset()  # Filenames of all files in the vault
+        self._vault_file_list: Optional[List[Tuple[str, str]]] = None  # (relative path, path) from the last vault walk
+        self._file_hashes: Dict[str, str] = {}  # normalized path -> hash of notes read since the last link map
 
     def process_links(self) -> None:
         """
@@ -32,17 +66,7 @@ class LinkProcessor:
         self._build_vault_file_set()
         
         # Process all markdown files in destination vault
-        for root, dirs, files in os.walk(config_manager.destination_path):
-            # Skip dot-prefixed directories
-            dirs[:] = [d for d in dirs if not (config_manager.exclude_dot_folders and d.startswith('.'))]
-            
-            for file in files:
-                if file.endswith('.md'):
-                    file_path = os.path.join(root, file)
-                    try:
-                        self._process_file(file_path, rename_log)
-                    except Exception as e:
-                        logger.error(f"Failed to process links in {file_path}: {e}")
+        self._process_markdown_files(self._collect_markdown_files(), rename_log, analyze_only=False)
         
         # Generate link mapping file
         self.generate_link_mapping_file()
@@ -59,34 +83,97 @@ class LinkProcessor:
         self._build_vault_file_set()
         
         # Process all markdown files in the vault for link analysis
-        for root, dirs, files in os.walk(config_manager.destination_path):
-            # Skip dot-prefixed directories
-            dirs[:] = [d for d in dirs if not (config_manager.exclude_dot_folders and d.startswith('.'))]
-            
-            for file in files:
-                if file.endswith('.md'):
-                    file_path = os.path.join(root, file)
-                    try:
-                        self._process_single_file(file_path, analyze_only=True)
-                    except Exception as e:
-                        logger.error(f"Failed to analyze links in {file_path}: {e}")
+        self._process_markdown_files(self._collect_markdown_files(), analyze_only=True)
         
         # Generate link mapping file with both link mappings and hashes for all files
         self.generate_link_mapping_file()
         logger.info(f"Standalone link analysis complete. Found {len(self.link_mapping)} valid links.")
 
+    def _collect_markdown_files(self) -> List[str]:
+        """
+        Collect the paths of all markdown files in the destination vault.
+        
+        Returns:
+            List[str]: Paths in os.walk order
+        """
+        return [file_path for relative_path, file_path in self._vault_file_list if file_path.endswith('.md')]
+
+    def _process_markdown_files(self, file_paths: List[str], rename_log: Optional[Dict[str, str]] = None,
+                                analyze_only: bool = False) -> None:
+        """
+        Read the links of (and, unless analyzing, update links in) markdown files.
+        
+        Each note is handled independently, so large vaults are spread over
+        worker processes. Their link mappings and hashes are merged back in
+        file order, so the result is the same as processing them one by one.
+        
+        Args:
+            file_paths: Paths of the markdown files
+            rename_log: Dictionary mapping original filenames to new filenames (optional)
+            analyze_only: If True, only analyze links without updating them
+        """
+        workers = os.cpu_count() or 1
+        if workers > 1 and len(file_paths) >= PARALLEL_LINK_PROCESSING_MIN_FILES:
+            logger.info(f"Processing links in {len(file_paths)} files with {workers} worker processes")
+            # Spawn fresh interpreters: forking this process while the logger's
+            # listener thread runs could deadlock a worker on a lock held at fork
+            mp_context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                                     initializer=_init_link_worker,
+                                     initargs=(logger.log_file, config_manager.destination_path, self.vault_files,
+                                               rename_log, analyze_only)) as executor:
+                for link_mapping, file_hashes in executor.map(_process_links_worker, file_paths, chunksize=64):
+                    self.link_mapping.extend(link_mapping)
+                    self._file_hashes.update(file_hashes)
+            return
+        
+        for file_path in file_paths:
+            try:
+                self._process_single_file(file_path, rename_log, analyze_only=analyze_only)
+            except Exception as e:
+                if analyze_only:
+                    logger.error(f"Failed to analyze links in {file_path}: {e}")
+                else:
+                    logger.error(f"Failed to process links in {file_path}: {e}")
+
     def _build_vault_file_set(self) -> None:
         """
-        Build a set of all files in the vault for quick lookup.
+        Walk the vault once and build a set of all filenames for quick lookup.
+        
+        The list of files found is kept for collecting the markdown files and
+        for hashing all files in generate_link_mapping_file, so the vault is
+        not walked again for them.
+        """
+        self._vault_file_list = self._walk_vault_files()
+        self.vault_files = frozenset(os.path.basename(file_path) for relative_path, file_path in self._vault_file_list)
+        
+        logger.debug(f"Built vault file set with {len(self.vault_files)} files")
+    
+    def _walk_vault_files(self) -> List[Tuple[str, str]]:
+        """
+        List all files in the destination vault.
+        
+        Returns:
+            List of (vault-relative path, path) tuples in os.walk order
         """
-        for root, dirs, files in os.walk(config_manager.destination_path):
+        vault_path = config_manager.destination_path
+        exclude_dot_folders = config_manager.exclude_dot_folders
+        
+        # os.walk joins every root onto vault_path, so the relative root is
+        # what follows this prefix
+        prefix_length = len(os.path.join(vault_path, ''))
+        
+        vault_files = []
+        for root, dirs, files in os.walk(vault_path, topdown=True, followlinks=False):
             # Skip dot-prefixed directories
-            dirs[:] = [d for d in dirs if not (config_manager.exclude_dot_folders and d.startswith('.'))]
+            if exclude_dot_folders:
+                dirs[:] = [d for d in dirs if not d.startswith('.')]
             
+            relative_root = root[prefix_length:]
             for file in files:
-                self.vault_files.add(file)
-        
-        logger.debug(f"Built vault file set with {len(self.vault_files)} files")
+                relative_path = os.path.join(relative_root, file) if relative_root else file
+                vault_files.append((relative_path, os.path.join(root, file)))
+        return vault_files
 
     def _is_internal_vault_link(self, filename: str) -> bool:
         """
@@ -98,16 +185,13 @@ class LinkProcessor:
         Returns:
             bool: True if it's an internal vault link, False otherwise
         """
-        # Check if it looks like a URL
-        if filename.startswith(('http://', 'https://', 'www.')):
+        # Check if it's a file in our vault first: a single set lookup that
+        # rules out most link targets
+        if filename not in self.vault_files:
             return False
-            
-        # Check if it's an email link
-        if filename.startswith('mailto:'):
-            return False
-            
-        # Check if it's a file in our vault
-        return filename in self.vault_files
+        
+        # Check if it looks like a URL or an email link
+        return not filename.startswith(('http://', 'https://', 'www.', 'mailto:'))
 
     def _process_single_file(self, file_path: str, rename_log: Optional[Dict[str, str]] = None, analyze_only: bool = False) -> Dict:
         """
@@ -121,12 +205,24 @@ class LinkProcessor:
         Returns:
             Dict: Information about the file including links and hash
         """
-        # Read file content
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # Read file content once: hash the raw bytes, then decode them with
+        # the same newline translation as text mode. Large notes are hashed
+        # and searched for link markers through mmap, and only copied and
+        # decoded if they can contain a link.
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size >= MMAP_MIN_BYTES:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    file_hash = hashlib.new(HASH_ALGORITHM, mm).hexdigest()
+                    data = mm[:] if mm.find(b'[[') != -1 or mm.find(b'](') != -1 else b''
+            else:
+                data = f.read()
+                file_hash = hashlib.new(HASH_ALGORITHM, data).hexdigest()
+        content = data.decode('utf-8')
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
         
-        # Calculate file hash
-        file_hash = self._calculate_file_hash(file_path)
+        # Keep the file hash for the link mapping file
+        self._file_hashes[os.path.normpath(file_path)] = file_hash
         
         # Get relative path for source tracking
         source_file = os.path.relpath(file_path, config_manager.destination_path)
@@ -134,9 +230,13 @@ class LinkProcessor:
         # Extract all links from the file
         links = []
         
+        # Every wikilink contains "[[" and every markdown link "](": notes
+        # without them skip the corresponding regex pass entirely
+        has_wikilinks = '[[' in content
+        has_markdown_links = '](' in content
+        
         # Process wikilinks: [[filename]] or [[filename|display]]
-        wikilink_pattern = r'\[\[([^\]]+)\]\]'
-        wikilink_matches = re.finditer(wikilink_pattern, content)
+        wikilink_matches = WIKILINK_RE.finditer(content) if has_wikilinks else ()
         
         for match in wikilink_matches:
             link_content = match.group(1)
@@ -155,11 +255,10 @@ class LinkProcessor:
                     'original_match': match.group(0)
                 }
                 links.append(link_info)
-                self.link_mapping.append(f"{filename_part} <- {source_file} (wikilink)")
+                self.link_mapping.append((source_file, filename_part, 'wikilink'))
         
         # Process markdown links: [text](filename.md) or [text](path/filename.md)
-        markdown_link_pattern = r'\[([^\]]*)\]\(([^)]+)\)'
-        markdown_link_matches = re.finditer(markdown_link_pattern, content)
+        markdown_link_matches = MARKDOWN_LINK_RE.finditer(content) if has_markdown_links else ()
         
         for match in markdown_link_matches:
             link_text = match.group(1)
@@ -176,11 +275,12 @@ class LinkProcessor:
                     'original_match': match.group(0)
                 }
                 links.append(link_info)
-                self.link_mapping.append(f"{link_target} <- {source_file} (markdown)")
+                self.link_mapping.append((source_file, link_target, 'markdown'))
         
         # Update links if not in analyze-only mode and rename_log is provided
         updated_content = content
-        if not analyze_only and rename_log:
+        if (not analyze_only and rename_log and (has_wikilinks or has_markdown_links)
+                and self._mentions_renamed_file(content, rename_log)):
             # Process wikilinks for updates
             def process_wikilink(match):
                 link_content = match.group(1)
@@ -198,7 +298,8 @@ class LinkProcessor:
                 
                 return match.group(0)
             
-            updated_content = re.sub(wikilink_pattern, process_wikilink, updated_content)
+            if has_wikilinks:
+                updated_content = WIKILINK_RE.sub(process_wikilink, updated_content)
             
             # Process markdown links for updates
             def process_markdown_link(match):
@@ -222,13 +323,19 @@ class LinkProcessor:
                 
                 return match.group(0)
             
-            updated_content = re.sub(markdown_link_pattern, process_markdown_link, updated_content)
+            if '](' in updated_content:
+                updated_content = MARKDOWN_LINK_RE.sub(process_markdown_link, updated_content)
             
-            # Write updated content back to file if changes were made
+            # Write updated content back to file if changes were made, hashing
+            # the written bytes so the link mapping doesn't read the note again
             if content != updated_content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(updated_content)
-                logger.debug(f"Updated links in {file_path}")
+                if os.linesep != '\n':
+                    updated_content = updated_content.replace('\n', os.linesep)
+                data = updated_content.encode('utf-8')
+                with open(file_path, 'wb') as f:
+                    f.write(data)
+                self._file_hashes[os.path.normpath(file_path)] = hashlib.new(HASH_ALGORITHM, data).hexdigest()
+                logger.debug("Updated links in %s", file_path)
         
         # Return file information
         return {
@@ -238,6 +345,26 @@ class LinkProcessor:
             'links': links
         }
 
+    def _mentions_renamed_file(self, content: str, rename_log: Dict[str, str]) -> bool:
+        """
+        Check whether a note can contain a link to a renamed file.
+        
+        A link is only updated when its target (wikilinks) or target filename
+        (markdown links) is a key of the rename log, so a note that contains
+        none of the keys has nothing to update. With many renames the
+        substring checks would cost more than the regex pass they save.
+        
+        Args:
+            content: Note content
+            rename_log: Dictionary mapping original filenames to new filenames
+            
+        Returns:
+            bool: False if no link in the note can need an update
+        """
+        if len(rename_log) > RENAME_PREFILTER_LIMIT:
+            return True
+        return any(filename in content for filename in rename_log)
+    
     def _process_file(self, file_path: str, rename_log: Dict[str, str]) -> None:
         """
         Process a single markdown file to update internal links.
@@ -248,22 +375,28 @@ class LinkProcessor:
         """
         self._process_single_file(file_path, rename_log, analyze_only=False)
 
-    def _calculate_file_hash(self, file_path: str) -> str:
+    def _calculate_file_hash(self, file_path: str, missing: Optional[str] = None) -> str:
         """
-        Calculate MD5 hash of a file.
+        Calculate the HASH_ALGORITHM (SHA-256) hash of a file.
+        
+        Uses hashlib.file_digest, which reads the file in C with a reusable
+        buffer instead of feeding Python-level chunks to the hash object.
         
         Args:
             file_path: Path to the file
+            missing: Value to return if the file doesn't exist (default: log an error)
             
         Returns:
-            str: MD5 hash of the file
+            str: SHA-256 hash of the file
         """
-        hash_md5 = hashlib.md5()
         try:
             with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
+                return hashlib.file_digest(f, HASH_ALGORITHM).hexdigest()
+        except FileNotFoundError as e:
+            if missing is not None:
+                return missing
+            logger.error(f"Failed to calculate hash for {file_path}: {e}")
+            return "ERROR"
         except Exception as e:
             logger.error(f"Failed to calculate hash for {file_path}: {e}")
             return "ERROR"
@@ -273,81 +406,125 @@ class LinkProcessor:
         Generate a link mapping file showing all internal references with file hashes.
         Always writes link mappings first, then hashes all files if hash_all_files is enabled or in analyze-only mode.
         Format: SOURCEFILE ; LINK_TO_FILE ; HASHNUMBER
+        
+        Files are hashed on a thread pool so their reads overlap; each linked
+        target is hashed once no matter how often it is linked, and notes
+        already hashed while their links were read are not read again. Lines
+        are still written in the same order.
         """
         mapping_file_path = os.path.join(config_manager.destination_path, LINKMAPFILE)
         try:
-            with open(mapping_file_path, 'w', encoding='utf-8') as f:
-                # First, write the existing link mappings
-                for mapping in self.link_mapping:
-                    # Parse the existing mapping format: "target <- source (type)"
-                    parts = mapping.split(" <- ")
-                    if len(parts) >= 2:
-                        target = parts[0].strip()
-                        source_and_type = parts[1].strip()
-                        source_parts = source_and_type.split(" (")
-                        source_file = source_parts[0].strip() if source_parts else "unknown"
-                        link_type = source_parts[1].rstrip(")").strip() if len(source_parts) > 1 else "unknown"
+            link_rows = [(source_file, target.strip()) for source_file, target, link_type in self.link_mapping]
+            
+            with ThreadPoolExecutor(max_workers=HASH_WORKERS) as executor:
+                # Calculate hash for each target file that exists
+                targets = list(dict.fromkeys(target for source_file, target in link_rows))
+                target_hashes = dict(zip(targets, executor.map(self._calculate_target_hash, targets)))
+                
+                with open(mapping_file_path, 'w', encoding='utf-8', buffering=LINKMAP_BUFFER_SIZE) as f:
+                    # First, write the link mappings (SOURCEFILE ; LINK_TO_FILE ; HASHNUMBER)
+                    # with a single write
+                    f.write("".join([
+                        f"{source_file} ; {target} ; {target_hashes[target]}\n"
+                        for source_file, target in link_rows
+                    ]))
+                    
+                    # If hash_all_files option is enabled OR we're in analyze-only mode, hash all other files in the vault
+                    if config_manager.hash_all_files or config_manager.analyze_only:
+                        # Get all files in the vault, from the walk that built the
+                        # vault file set if links were just processed; the link
+                        # map itself is being written and is left out
+                        all_files = self._vault_file_list
+                        if all_files is None:
+                            all_files = self._walk_vault_files()
+                        all_files = [(relative_path, file_path) for relative_path, file_path in all_files
+                                     if relative_path != LINKMAPFILE]
                         
-                        # Calculate hash for the target file if it exists
-                        target_file_path = os.path.join(config_manager.destination_path, target)
-                        file_hash = self._calculate_file_hash(target_file_path) if os.path.exists(target_file_path) else "NOT_FOUND"
+                        # Create a set of files that are already in the link mapping to avoid duplicates
+                        linked_files = {target for source_file, target in link_rows}
                         
-                        # Write in the new format: SOURCEFILE ; LINK_TO_FILE ; HASHNUMBER
-                        f.write(f"{source_file} ; {target} ; {file_hash}\n")
-                    else:
-                        # Handle any mappings that don't match the expected format
-                        f.write(f"unknown ; {mapping} ; ERROR\n")
-                
-                # If hash_all_files option is enabled OR we're in analyze-only mode, hash all other files in the vault
-                if config_manager.hash_all_files or config_manager.analyze_only:
-                    # Get all files in the vault
-                    all_files = []
-                    for root, dirs, files in os.walk(config_manager.destination_path):
-                        # Skip dot-prefixed directories
-                        dirs[:] = [d for d in dirs if not (config_manager.exclude_dot_folders and d.startswith('.'))]
+                        # Hash all files that are not linked, in order, while the
+                        # progress loop below consumes the results
+                        file_hashes = executor.map(
+                            self._cached_file_hash,
+                            [file_path for relative_path, file_path in all_files if relative_path not in linked_files]
+                        )
                         
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            relative_path = os.path.relpath(file_path, config_manager.destination_path)
-                            all_files.append((relative_path, file_path))
-                    
-                    # Create a set of files that are already in the link mapping to avoid duplicates
-                    linked_files = set()
-                    for mapping in self.link_mapping:
-                        parts = mapping.split(" <- ")
-                        if len(parts) >= 1:
-                            target = parts[0].strip()
-                            linked_files.add(target)
-                    
-                    # Calculate total number of files for progress bar
-                    total_files = len(all_files)
-                    processed_files = 0
-                    
-                    # Process all files with progress indication, but skip already linked files
-                    for relative_path, file_path in all_files:
-                        # Skip files that are already in the link mapping
-                        if relative_path not in linked_files:
-                            file_hash = self._calculate_file_hash(file_path)
-                            # For files that are not linked, we use "UNLINKED" as source
-                            f.write(f"UNLINKED ; {relative_path} ; {file_hash}\n")
+                        # Calculate total number of files for progress bar, which is
+                        # redrawn at most every PROGRESS_INTERVAL seconds rather
+                        # than for every file
+                        total_files = len(all_files)
+                        processed_files = 0
+                        next_progress = 0.0
+                        lines = []
                         
-                        # Update progress
-                        processed_files += 1
-                        if total_files > 0:
-                            progress = (processed_files / total_files) * 100
-                            print(f"\rHashing files: {progress:.1f}% ({processed_files}/{total_files})", end='', flush=True)
-                    
-                    print()  # New line after progress bar
+                        # Process all files with progress indication, but skip already linked files
+                        for relative_path, file_path in all_files:
+                            # Skip files that are already in the link mapping
+                            if relative_path not in linked_files:
+                                file_hash = next(file_hashes)
+                                # For files that are not linked, we use "UNLINKED" as source
+                                lines.append(f"UNLINKED ; {relative_path} ; {file_hash}\n")
+                                if len(lines) >= LINKMAP_WRITE_BATCH:
+                                    f.write("".join(lines))
+                                    lines.clear()
+                            
+                            # Update progress
+                            processed_files += 1
+                            now = time.monotonic()
+                            if now >= next_progress or processed_files == total_files:
+                                next_progress = now + PROGRESS_INTERVAL
+                                progress = (processed_files / total_files) * 100
+                                print(f"\rHashing files: {progress:.1f}% ({processed_files}/{total_files})", end='', flush=True)
+                        
+                        f.write("".join(lines))
+                        print()  # New line after progress bar
             logger.info(f"Link mapping file generated at {mapping_file_path}")
         except Exception as e:
             logger.error(f"Failed to generate link mapping file: {e}")
+        finally:
+            # Files may change before the next link map; walk and hash them afresh then
+            self._file_hashes.clear()
+            self._vault_file_list = None
+
+    def _calculate_target_hash(self, target: str) -> str:
+        """
+        Calculate the hash of a link target, if the file exists.
+        
+        Whether it exists is found out by opening it, rather than with a
+        separate os.path.exists() call first.
+        
+        Args:
+            target: Vault-relative path of the linked file
+            
+        Returns:
+            str: Hash of the file, or "NOT_FOUND"
+        """
+        target_file_path = os.path.join(config_manager.destination_path, target)
+        return self._cached_file_hash(target_file_path, missing="NOT_FOUND")
+
+    def _cached_file_hash(self, file_path: str, missing: Optional[str] = None) -> str:
+        """
+        Get the hash of a file, reusing the one computed when the note was read.
+        
+        Args:
+            file_path: Path to the file
+            missing: Value to return if the file doesn't exist (default: log an error)
+            
+        Returns:
+            str: Hash of the file
+        """
+        file_hash = self._file_hashes.get(os.path.normpath(file_path))
+        if file_hash is None:
+            file_hash = self._calculate_file_hash(file_path, missing)
+        return file_hash
 
-    def get_link_mapping(self) -> List[str]:
+    def get_link_mapping(self) -> List[Tuple[str, str, str]]:
         """
         Get the link mapping list.
         
         Returns:
-            List[str]: List of link mappings
+            List[Tuple[str, str, str]]: (source file, target, link type) of each link
         """
         return self.link_mapping
 
@@ -363,5 +540,55 @@ class LinkProcessor:
         return self.unresolved_links
 
 
+# Processor used by link processing worker processes, set up by _init_link_worker
+_worker_processor = None
+_worker_rename_log = None
+_worker_analyze_only = False
+
+
+def _init_link_worker(log_file: str, destination_path: str, vault_files: FrozenSet[str],
+                      rename_log: Optional[Dict[str, str]], analyze_only: bool) -> None:
+    """
+    Set up a worker process for _process_links_worker.
+    
+    Args:
+        log_file: Path of the parent process's log file
+        destination_path: Path to the vault
+        vault_files: Filenames of all files in the vault
+        rename_log: Dictionary mapping original filenames to new filenames (optional)
+        analyze_only: If True, only analyze links without updating them
+    """
+    global _worker_processor, _worker_rename_log, _worker_analyze_only
+    logger.use_direct_handlers(log_file)
+    config_manager.destination_path = destination_path
+    _worker_processor = LinkProcessor()
+    _worker_processor.vault_files = vault_files
+    _worker_rename_log = rename_log
+    _worker_analyze_only = analyze_only
+
+
+def _process_links_worker(file_path: str) -> Tuple[List[Tuple[str, str, str]], Dict[str, str]]:
+    """
+    Process the links of one markdown file inside a worker process.
+    
+    Args:
+        file_path: Path to the markdown file
+        
+    Returns:
+        Tuple of (link mapping entries, cached file hashes)
+    """
+    processor = _worker_processor
+    processor.link_mapping = []
+    processor._file_hashes = {}
+    try:
+        processor._process_single_file(file_path, _worker_rename_log, analyze_only=_worker_analyze_only)
+    except Exception as e:
+        if _worker_analyze_only:
+            logger.error(f"Failed to analyze links in {file_path}: {e}")
+        else:
+            logger.error(f"Failed to process links in {file_path}: {e}")
+    return processor.link_mapping, processor._file_hashes
+
+
 # Global link processor instance
 link_processor = LinkProcessor()
\ No newline at end of file
@@ -1,9 +1,37 @@
+import atexit
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 from config_manager import config_manager
 
 
+class BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler that lets the file's write buffer batch records.
+    
+    logging.FileHandler flushes after every record, which is one write
+    syscall per log line. This handler only flushes for errors (so they are
+    on disk right away) and when it is closed at exit.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.stream is None:
+            if self.mode != 'w' or not self._closed:
+                self.stream = self._open()
+            else:
+                return
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.stream.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
 class Logger:
     """
     Handles logging for the Obsidian Vault Merger tool.
@@ -20,12 +48,12 @@ class Logger:
             console_handler = logging.StreamHandler()
             console_handler.setLevel(logging.INFO)
             
-            # Create file handler
+            # Create file handler; the file is opened on the first record
             log_dir = os.path.join(config_manager.destination_path, ".merge_logs")
             os.makedirs(log_dir, exist_ok=True)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             log_file = os.path.join(log_dir, f"merge_{timestamp}.log")
-            file_handler = logging.FileHandler(log_file)
+            file_handler = BufferedFileHandler(log_file, delay=True)
             file_handler.setLevel(logging.DEBUG)
             
             # Create formatter
@@ -35,29 +63,55 @@ class Logger:
             console_handler.setFormatter(formatter)
             file_handler.setFormatter(formatter)
             
+            # The handlers run on a background thread: a log call only puts
+            # the record on a queue and never waits for console or file I/O.
+            # Stopping the listener at exit writes out what is still queued.
+            log_queue = queue.SimpleQueue()
+            self._console_handler = console_handler
+            self._file_handler = file_handler
+            self._queue_handler = QueueHandler(log_queue)
+            self._listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+            self._listener.start()
+            atexit.register(self._listener.stop)
+            
             # Add handlers to logger
-            self.logger.addHandler(console_handler)
-            self.logger.addHandler(file_handler)
-
-    def debug(self, message: str) -> None:
-        """Log debug message."""
-        self.logger.debug(message)
-
-    def info(self, message: str) -> None:
-        """Log info message."""
-        self.logger.info(message)
-
-    def warning(self, message: str) -> None:
-        """Log warning message."""
-        self.logger.warning(message)
+            self.logger.addHandler(self._queue_handler)
+            self.log_file = log_file
+        
+        # Level methods are the logging.Logger's own bound methods, so a call
+        # doesn't pass through a forwarding method first. %-style args are
+        # formatted only if the record is emitted.
+        self.debug = self.logger.debug
+        self.info = self.logger.info
+        self.warning = self.logger.warning
+        self.error = self.logger.error
+        self.critical = self.logger.critical
 
-    def error(self, message: str) -> None:
-        """Log error message."""
-        self.logger.error(message)
+    def use_direct_handlers(self, log_file: str) -> None:
+        """
+        Log directly from a worker process to the parent's log file.
+        
+        Worker pools are started with "spawn", so a worker imports a fresh
+        logger with its own listener thread and its own timestamped log file.
+        The listener is stopped and records go straight to the console and to
+        an unbuffered handler on the parent's log file, so nothing is left in
+        a queue when the worker exits.
+        
+        Args:
+            log_file: Path of the parent process's log file
+        """
+        self._listener.stop()
+        atexit.unregister(self._listener.stop)
+        file_handler = logging.FileHandler(log_file, delay=True)
+        file_handler.setLevel(self._file_handler.level)
+        file_handler.setFormatter(self._file_handler.formatter)
+        self.logger.removeHandler(self._queue_handler)
+        self.logger.addHandler(self._console_handler)
+        self.logger.addHandler(file_handler)
 
-    def critical(self, message: str) -> None:
-        """Log critical message."""
-        self.logger.critical(message)
+    def is_debug_enabled(self) -> bool:
+        """Check whether debug messages are emitted, to skip building costly ones."""
+        return self.logger.isEnabledFor(logging.DEBUG)
 
 
 # Global logger instance
@@ -82,6 +82,7 @@ def apply_config_to_args(args, config: Dict[str, Any]) -> None:
         'output_directory': 'output',
         'ocr_prompt': 'prompt',
         'device': 'device',
+        'hash_algorithm': 'hash_algorithm',
     }
     
     for config_key, arg_name in config_to_arg_map.items():
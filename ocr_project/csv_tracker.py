@@ -5,28 +5,61 @@ This is an index (not a log) where each OCR'd document appears only once.
 Columns: source_filename, results_filename, summary
 """
 
+import atexit
 import csv
 import os
 from pathlib import Path
 from datetime import datetime
 
 
+def _hash_from_results_filename(results_filename):
+    """
+    Extract the content hash from an OCR results filename.
+    
+    Handles both the OCR-{first8}-{last8}-{hash}.{ext} names written by main.py
+    and the older *_OCR_{hash}.{ext} pattern.
+    
+    Args:
+        results_filename: Output OCR results file name
+        
+    Returns:
+        str: Lowercase 8-character hash, or None if the name carries no hash
+    """
+    stem = results_filename.split('.')[0]
+    if '_OCR_' in stem:
+        hash_part = stem.split('_OCR_')[1]
+    elif stem.startswith('OCR-'):
+        hash_part = stem.rsplit('-', 1)[-1]
+    else:
+        return None
+    return hash_part.lower() if len(hash_part) == 8 else None  # 8-character hash
+
+
 class CSVTracker:
     """Tracks OCR processing results in CSV index file."""
     
-    def __init__(self, csv_path):
+    def __init__(self, csv_path, flush_every=256):
         """
         Initialize CSV tracker.
         
         Args:
             csv_path: Path to CSV file (relative to output directory)
+            flush_every: Number of buffered entries that triggers a rewrite of the CSV file (default: 256)
         """
         self.csv_path = Path(csv_path)
         self.csv_path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        
+        # Entries not yet written to disk (source_filename -> row)
+        self._pending = {}
+        atexit.register(self.flush)
         
         # Ensure CSV file exists with header
         if not self.csv_path.exists():
             self._create_csv()
+        
+        # Hashes of all indexed results (on disk or pending), for O(1) lookups
+        self.result_hashes = self.get_all_hashes()
     
     def _create_csv(self):
         """Create CSV file with headers."""
@@ -41,14 +74,35 @@ class CSVTracker:
         This ensures each document appears only once (by source filename).
         If entry exists, it updates it; otherwise adds new entry.
         
+        Entries are buffered in memory and merged into the CSV file every
+        `flush_every` entries and at interpreter exit, instead of rewriting
+        the whole index for every document. Call flush() to write them now.
+        
         Args:
             source_filename: Original source file path/name
             results_filename: Output OCR results file name
             summary: Document summary (extracted from document if available)
         """
+        source_str = str(source_filename)
+        self._pending[source_str] = {
+            'source_filename': source_str,
+            'results_filename': str(results_filename),
+            'summary': str(summary) if summary else ""
+        }
+        result_hash = _hash_from_results_filename(str(results_filename))
+        if result_hash:
+            self.result_hashes.add(result_hash)
+        
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+    
+    def flush(self):
+        """Merge all buffered entries into the CSV index with a single rewrite."""
+        if not self._pending:
+            return
+        
         # Read existing entries
         entries = {}
-        source_to_row = {}
         
         if self.csv_path.exists():
             with open(self.csv_path, 'r', encoding='utf-8') as f:
@@ -57,15 +111,9 @@ class CSVTracker:
                     src = row.get('source_filename', '')
                     if src:
                         entries[src] = row
-                        source_to_row[src] = len(entries) - 1
         
-        # Update or add entry
-        source_str = str(source_filename)
-        entries[source_str] = {
-            'source_filename': source_str,
-            'results_filename': str(results_filename),
-            'summary': str(summary) if summary else ""
-        }
+        # Update or add buffered entries
+        entries.update(self._pending)
         
         # Write all entries back (this maintains the index - one entry per document)
         with open(self.csv_path, 'w', newline='', encoding='utf-8') as f:
@@ -79,35 +127,46 @@ class CSVTracker:
                     row['results_filename'],
                     row['summary']
                 ])
+        
+        self._pending.clear()
     
     def get_all_hashes(self):
         """
         Get all hashes currently in CSV (for backward compatibility).
         
-        Note: This extracts hash from results_filename which follows pattern *_OCR_{hash}.*
+        Note: This extracts hash from results_filename, which follows the pattern
+        OCR-{first8}-{last8}-{hash}.* (or the older *_OCR_{hash}.*)
         
         Returns:
             set: Set of hash strings
         """
         hashes = set()
         
+        self.flush()
         if not self.csv_path.exists():
             return hashes
         
         with open(self.csv_path, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
             for row in reader:
-                results_fn = row.get('results_filename', '')
-                # Extract hash from filename pattern: *_OCR_{hash}.{ext}
-                if '_OCR_' in results_fn:
-                    parts = results_fn.split('_OCR_')
-                    if len(parts) >= 2:
-                        hash_part = parts[1].split('.')[0]
-                        if len(hash_part) == 8:  # 8-character hash
-                            hashes.add(hash_part.lower())
+                result_hash = _hash_from_results_filename(row.get('results_filename', ''))
+                if result_hash:
+                    hashes.add(result_hash)
         
         return hashes
     
+    def has_result_hash(self, hash_value):
+        """
+        Check whether a result for content with this hash is in the index.
+        
+        Args:
+            hash_value: 8-character hash
+            
+        Returns:
+            bool: True if an indexed results filename carries the hash
+        """
+        return bool(hash_value) and hash_value.lower() in self.result_hashes
+    
     def entry_exists(self, source_filename):
         """
         Check if an entry exists for the given source filename.
@@ -118,10 +177,13 @@ class CSVTracker:
         Returns:
             bool: True if entry exists
         """
+        source_str = str(source_filename)
+        if source_str in self._pending:
+            return True
+        
         if not self.csv_path.exists():
             return False
         
-        source_str = str(source_filename)
         with open(self.csv_path, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
             for row in reader:
@@ -1,34 +1,122 @@
 """
-Hash Manager for v0.2 - Calculate and check SHA-256 hashes.
+Hash Manager for v0.2 - Calculate and check content hashes.
 
 Implements hash-based duplicate detection per Issue #2 specifications.
+
+The hash algorithm is chosen explicitly (hash_algorithm in the config,
+--hash-algorithm on the command line) so the same file gets the same ID on
+every machine. SHA-256 is the default; the faster non-cryptographic blake3
+and xxh3_128 need the optional "fast-hash" extra. Switching algorithms changes
+the hash of new output files.
 """
 
 import hashlib
+import mmap
 import os
 from pathlib import Path
 import re
 
+# Optional fast hash backends (only used when selected)
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+HASH_ALGORITHMS = ("sha256", "blake3", "xxh3_128")
+DEFAULT_HASH_ALGORITHM = "sha256"
+
+# Bytes fed to the hasher per update() call
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
 
-def calculate_image_hash(image_path):
+
+def _new_hasher(algorithm=DEFAULT_HASH_ALGORITHM):
     """
-    Calculate SHA-256 hash of image file.
+    Create a hash object for the given algorithm.
     
     Args:
-        image_path: Path to image file
+        algorithm: One of HASH_ALGORITHMS
         
     Returns:
-        str: First 8 characters of SHA-256 hash (per RULES.md)
+        Hash object with update() and hexdigest()
+        
+    Raises:
+        Exception: If the algorithm is unknown or its package not installed
+    """
+    if algorithm == "sha256":
+        return hashlib.sha256()
+    if algorithm == "blake3":
+        if blake3 is None:
+            raise Exception("blake3 library not installed. Install it with: uv pip install blake3")
+        return blake3.blake3()
+    if algorithm == "xxh3_128":
+        if xxhash is None:
+            raise Exception("xxhash library not installed. Install it with: uv pip install xxhash")
+        return xxhash.xxh3_128()
+    raise Exception(f"Unknown hash algorithm '{algorithm}' (expected one of: {', '.join(HASH_ALGORITHMS)})")
+
+
+def check_hash_algorithm(algorithm):
     """
-    sha256_hash = hashlib.sha256()
+    Verify that a hash algorithm is known and its package is installed.
+    
+    Args:
+        algorithm: One of HASH_ALGORITHMS
+        
+    Raises:
+        Exception: If the algorithm is unknown or its package not installed
+    """
+    _new_hasher(algorithm)
+
+
+def calculate_content_digest(image_path, algorithm=DEFAULT_HASH_ALGORITHM):
+    """
+    Calculate the full content digest of a file.
+    
+    The 8-character hash is only meant for filenames; anything that decides
+    whether content was already processed should compare full digests.
+    
+    Args:
+        image_path: Path to image or PDF file
+        algorithm: One of HASH_ALGORITHMS (default: sha256)
+        
+    Returns:
+        str: Full hex digest
+    """
+    file_hash = _new_hasher(algorithm)
     
     with open(image_path, 'rb') as f:
-        # Read file in chunks to handle large files
-        for chunk in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(chunk)
+        # mmap can't map empty files; they hash to the empty digest
+        if os.fstat(f.fileno()).st_size > 0:
+            # Hash the mapped file in large slices: no per-chunk read buffers,
+            # and memory use stays flat regardless of file size
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    for offset in range(0, len(view), HASH_CHUNK_SIZE):
+                        file_hash.update(view[offset:offset + HASH_CHUNK_SIZE])
+                finally:
+                    view.release()
+    
+    return file_hash.hexdigest()
+
+
+def calculate_image_hash(image_path, algorithm=DEFAULT_HASH_ALGORITHM):
+    """
+    Calculate content hash of image file.
     
-    full_hash = sha256_hash.hexdigest()
-    return full_hash[:8]  # First 8 characters per RULES.md
+    Args:
+        image_path: Path to image file
+        algorithm: One of HASH_ALGORITHMS (default: sha256)
+        
+    Returns:
+        str: First 8 characters of the hex digest (per RULES.md)
+    """
+    return calculate_content_digest(image_path, algorithm)[:8]  # First 8 characters per RULES.md
 
 
 def find_hash_in_filenames(hash_value, search_directory):
@@ -5,9 +5,77 @@ Handles parsing JSON schemas, generating prompts, and validating output.
 """
 
 import json
+import math
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+# Faster JSON backend if installed (falls back to the stdlib json module)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _has_non_finite(data: Any) -> bool:
+    """
+    Check whether data contains NaN or infinite floats.
+    
+    Args:
+        data: JSON-serializable data
+        
+    Returns:
+        True if any float in data is NaN or infinite
+    """
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(_has_non_finite(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(_has_non_finite(item) for item in data)
+    return False
+
+
+def _json_dumps(data: Any) -> str:
+    """
+    Serialize data as 2-space indented JSON, keeping non-ASCII characters.
+    
+    orjson writes NaN and Infinity as null, so data containing them goes
+    through the stdlib, which keeps them as NaN/Infinity like before.
+    
+    Args:
+        data: JSON-serializable data
+        
+    Returns:
+        JSON string
+    """
+    if orjson is not None and not _has_non_finite(data):
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits - let the stdlib handle it
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _json_loads(text: str) -> Any:
+    """
+    Parse a JSON string.
+    
+    Args:
+        text: JSON text
+        
+    Returns:
+        Parsed data
+        
+    Raises:
+        json.JSONDecodeError: If the text is not valid JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass  # Re-parse with the stdlib for its error message and extensions (NaN, big numbers)
+    return json.loads(text)
+
 
 class JSONTemplateHandler:
     """Handles JSON schema templates for structured OCR extraction."""
@@ -103,6 +171,7 @@ class JSONTemplateHandler:
         
         prompt_parts.append(f"\nReturn ONLY valid JSON in this format:")
         prompt_parts.append(f"```json")
+        # ASCII-escaped like the prompt has always been, so the model sees the same text
         prompt_parts.append(json.dumps(json_example, indent=2))
         prompt_parts.append("```")
         
@@ -187,7 +256,7 @@ class JSONTemplateHandler:
         
         # Parse JSON
         try:
-            parsed = json.loads(json_text)
+            parsed = _json_loads(json_text)
             return parsed
         except json.JSONDecodeError as e:
             print(f"⚠️  Failed to parse JSON: {e}")
@@ -294,7 +363,7 @@ class JSONTemplateHandler:
             return self._apply_template(self.result_template, data)
         
         # Default: return formatted JSON
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        return _json_dumps(data)
     
     def _apply_template(self, template: str, data: Dict[str, Any]) -> str:
         """
@@ -336,7 +405,7 @@ class JSONTemplateHandler:
                     return ', '.join(str(item) for item in value)
             elif isinstance(value, dict):
                 # For nested objects, format as JSON
-                return json.dumps(value, indent=2, ensure_ascii=False)
+                return _json_dumps(value)
             else:
                 return str(value)
         
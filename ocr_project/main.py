@@ -20,16 +20,25 @@ import os
 import json
 import glob
 import re
+import functools
+import itertools
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from tqdm import tqdm
+
 # Import OCR modules at module level
 try:
     from ocr_project.image_processor import ImagePreprocessor
     from ocr_project.ocr_engine import VisionOCREngine
-    from ocr_project.hash_manager import calculate_image_hash, check_duplicate
+    from ocr_project.hash_manager import (
+        HASH_ALGORITHMS, DEFAULT_HASH_ALGORITHM, calculate_content_digest, check_duplicate, check_hash_algorithm
+    )
     from ocr_project.csv_tracker import CSVTracker
     from ocr_project.processing_log import ProcessingLog
-    from ocr_project.pdf_processor import convert_pdf_to_images, is_pdf_file
+    from ocr_project.pdf_processor import read_pdf_info, iter_pdf_images, is_pdf_file
 except ImportError:
     # Fall back to relative imports (when running from within ocr_project)
     from image_processor import ImagePreprocessor
@@ -37,10 +46,12 @@ except ImportError:
         from ocr_engine import VisionOCREngine
     except ImportError:
         VisionOCREngine = None
-    from hash_manager import calculate_image_hash, check_duplicate
+    from hash_manager import (
+        HASH_ALGORITHMS, DEFAULT_HASH_ALGORITHM, calculate_content_digest, check_duplicate, check_hash_algorithm
+    )
     from csv_tracker import CSVTracker
     from processing_log import ProcessingLog
-    from pdf_processor import convert_pdf_to_images, is_pdf_file
+    from pdf_processor import read_pdf_info, iter_pdf_images, is_pdf_file
 
 # Hardcoded defaults per v0.1 spec
 DEFAULT_TEMPERATURE = 0.1
@@ -48,6 +59,23 @@ DEFAULT_MAX_NEW_TOKENS = 1024
 DEFAULT_DO_SAMPLE = False
 DEFAULT_PROMPT = "Extract and transcribe all visible text from this image."
 
+# Supported input file extensions
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp']
+PDF_EXTENSIONS = ['.pdf']
+SUPPORTED_EXTENSIONS = frozenset(IMAGE_EXTENSIONS + PDF_EXTENSIONS)
+
+# Patterns applied to every processed document, compiled once
+SUMMARY_RE = re.compile(r'##\s*SUMMARY\s*##\s*\n(.*?)(?:\n\n|\n##|\Z)', re.IGNORECASE | re.DOTALL)
+SUMMARY_WORD_RE = re.compile(r'SUMMARY', re.IGNORECASE)
+SUMMARY_HEADING = "## SUMMARY ##"
+TABLE_RULE_RE = re.compile(r'^[\|\s\|]+$')
+
+# Background image preparation: the GPU consumes one image at a time, so a
+# couple of workers and a short look-ahead keep it fed without holding many
+# decoded full-resolution images in memory
+DEFAULT_PREFETCH_WORKERS = 2
+PREFETCH_DEPTH = 2
+
 # Global verbose flag
 VERBOSE = False
 
@@ -85,6 +113,24 @@ def parse_arguments():
         default=None,
         help="Device (cuda, cpu, mps). If not provided, auto-detect."
     )
+    parser.add_argument(
+        "--quantization",
+        choices=["int8", "int4", "fp8"],
+        default=None,
+        help="Weight quantization for transformers models (int8/int4 need bitsandbytes, fp8 needs torchao)"
+    )
+    parser.add_argument(
+        "--pdf-backend",
+        choices=["pdf2image", "pdfium"],
+        default="pdf2image",
+        help="PDF rasterizer: pdf2image (poppler subprocesses, default) or pdfium (in-process, needs pypdfium2)"
+    )
+    parser.add_argument(
+        "--hash-algorithm",
+        choices=HASH_ALGORITHMS,
+        default=None,
+        help=f"Content hash for output filenames and resume checks (default: {DEFAULT_HASH_ALGORITHM}; blake3 and xxh3_128 need the fast-hash extra). Can also be set via config file."
+    )
     parser.add_argument(
         "--prompt",
         type=str,
@@ -138,6 +184,12 @@ def parse_arguments():
         default=None,
         help="Path to configuration file relative to root (default: .obsidian/OCRconfig.yaml). Omit to use default."
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help=f"Worker processes that hash and decode upcoming images while the model runs (default: {DEFAULT_PREFETCH_WORKERS}, 0 disables)"
+    )
     
     args = parser.parse_args()
     global VERBOSE
@@ -179,6 +231,9 @@ def _expand_input_pattern(input_pattern):
     """
     Expand input pattern to list of files (images and PDFs).
     
+    Candidates are filtered lazily and only the matching paths are collected
+    (sorted, so files are processed in a stable order).
+    
     Args:
         input_pattern: File path or glob pattern
         
@@ -187,38 +242,190 @@ def _expand_input_pattern(input_pattern):
     """
     path = Path(input_pattern)
     
-    # Supported file extensions
-    image_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp']
-    pdf_extensions = ['.pdf']
-    supported_extensions = image_extensions + pdf_extensions
-    
     # If it's a wildcard pattern, expand it
     if '*' in str(input_pattern) or '?' in str(input_pattern) or '[' in str(input_pattern):
-        all_files = sorted(glob.glob(str(input_pattern), recursive='**' in str(input_pattern)))
-        files = [Path(f) for f in all_files if Path(f).is_file()]
-        # Filter to supported extensions
-        files = [f for f in files if f.suffix.lower() in [ext.lower() for ext in supported_extensions]]
-        return files
-    # If it's a directory, get all image and PDF files
+        matches = glob.iglob(str(input_pattern), recursive='**' in str(input_pattern))
+        return sorted(
+            file_path for file_path in map(Path, matches)
+            if file_path.suffix.lower() in SUPPORTED_EXTENSIONS and file_path.is_file()
+        )
+    # If it's a directory, get all image and PDF files in a single directory pass
     elif path.is_dir():
-        files = []
-        for ext in supported_extensions:
-            files.extend(path.glob(f'*{ext}'))
-            files.extend(path.glob(f'*{ext.upper()}'))
-        return sorted(files)
+        with os.scandir(path) as entries:
+            return sorted(
+                path / entry.name for entry in entries
+                if os.path.splitext(entry.name)[1].lower() in SUPPORTED_EXTENSIONS and entry.is_file()
+            )
     # Single file
     elif path.is_file():
         # Check if it's a supported format
-        if path.suffix.lower() not in [ext.lower() for ext in supported_extensions]:
-            raise ValueError(f"Unsupported file type: {path.suffix}. Supported: {', '.join(supported_extensions)}")
+        if path.suffix.lower() not in SUPPORTED_EXTENSIONS:
+            raise ValueError(f"Unsupported file type: {path.suffix}. Supported: {', '.join(IMAGE_EXTENSIONS + PDF_EXTENSIONS)}")
         return [path]
     else:
         raise FileNotFoundError(f"Input not found: {input_pattern}")
 
 
+def _find_summary_section(text):
+    """
+    Find the body of a "## SUMMARY ##" section in extracted text.
+    
+    The canonical "## SUMMARY ##" heading is located with str.find and sliced
+    directly. Other spellings fall back to the section regex, which is only run
+    from the first "SUMMARY" occurrence onwards, so long documents without a
+    summary are rejected by a single literal scan.
+    
+    Args:
+        text: Extracted document text
+        
+    Returns:
+        str: Stripped section body, or None if the document has no summary section
+    """
+    heading = text.find(SUMMARY_HEADING)
+    # Only valid if no earlier "summary" could start a different section
+    if heading != -1 and SUMMARY_WORD_RE.search(text, 0, heading + len(SUMMARY_HEADING)).start() == heading + 3:
+        # Like the regex, skip the whitespace after the heading up to its last newline
+        pos = heading + len(SUMMARY_HEADING)
+        ws_end = pos
+        while ws_end < len(text) and text[ws_end].isspace():
+            ws_end += 1
+        newline = text.rfind('\n', pos, ws_end)
+        if newline != -1:
+            body_start = newline + 1
+            ends = [end for end in (text.find('\n\n', body_start), text.find('\n##', body_start)) if end != -1]
+            return text[body_start:min(ends, default=len(text))].strip()
+    
+    word_match = SUMMARY_WORD_RE.search(text)
+    if not word_match:
+        return None
+    
+    # A section heading starts at the last "##" before the word (if any)
+    start = text.rfind('##', 0, word_match.start())
+    summary_match = SUMMARY_RE.search(text, start if start != -1 else word_match.start())
+    if not summary_match:
+        return None
+    return summary_match.group(1).strip()
+
+
+@functools.cache
+def _get_transformers_engine():
+    """
+    Import TransformersOCREngine on first use.
+    
+    The transformers/torch stack is heavy, so it is only imported when
+    --format transformers is selected, and only once.
+    
+    Returns:
+        TransformersOCREngine class
+    """
+    try:
+        from ocr_engine_transformers import TransformersOCREngine
+    except ImportError:
+        try:
+            from ocr_project.ocr_engine_transformers import TransformersOCREngine
+        except ImportError:
+            raise ImportError("Could not import TransformersOCREngine")
+    return TransformersOCREngine
+
+
+def _write_output(output_path, content):
+    """
+    Write an output file with a single unbuffered write.
+    
+    Skips the buffered text writer; no fsync, so the OS batches the flush.
+    
+    Args:
+        output_path: Destination file path
+        content: Text to write (UTF-8 encoded)
+    """
+    data = memoryview(content.encode('utf-8'))
+    fd = os.open(str(output_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        while data:
+            written = os.write(fd, data)
+            data = data[written:]
+    finally:
+        os.close(fd)
+
+
+@functools.lru_cache(maxsize=4096)
+def _stem_tokens(stem):
+    """
+    Get the first and last 8 characters of a filename stem for output names.
+    
+    Names shorter than 8 characters are padded with zeros: the first token on
+    the right, the last token on the left.
+    
+    Args:
+        stem: Input filename without extension
+        
+    Returns:
+        tuple: (first8, last8)
+    """
+    if len(stem) >= 8:
+        return stem[:8], stem[-8:]
+    return stem.ljust(8, '0'), stem.rjust(8, '0')
+
+
+def _prepare_image(input_path, hash_algorithm=DEFAULT_HASH_ALGORITHM):
+    """
+    Hash and decode an image file ahead of OCR (runs in a worker process).
+    
+    Args:
+        input_path: Path to input image
+        hash_algorithm: Content hash algorithm (see hash_manager.HASH_ALGORITHMS)
+        
+    Returns:
+        tuple: (content_digest, image, load_error) - image is None and load_error holds
+               the error message if the file could not be decoded
+    """
+    content_digest = calculate_content_digest(str(input_path), hash_algorithm)
+    try:
+        image = ImagePreprocessor().load_image(str(input_path))
+        image.load()  # Decode now so the pixels travel back to the main process
+    except Exception as e:
+        return content_digest, None, str(e)
+    return content_digest, image, None
+
+
+def _prefetch_images(pool, input_files, depth, hash_algorithm=DEFAULT_HASH_ALGORITHM):
+    """
+    Yield input files together with their background preparation.
+    
+    Keeps up to `depth` images ahead of the current file hashing and decoding in
+    `pool`, so CPU-bound preprocessing overlaps with inference on the main process
+    (which owns the single OCR engine).
+    
+    Args:
+        pool: ProcessPoolExecutor, or None to disable prefetching
+        input_files: Iterable of input file paths
+        depth: Number of files to prepare ahead
+        hash_algorithm: Content hash algorithm passed to the workers
+        
+    Yields:
+        tuple: (input_file, prepared) where prepared is a Future of _prepare_image
+               (or of calculate_content_digest for PDFs), or None when prefetching is disabled
+    """
+    def submit(input_file):
+        if pool is None:
+            return None
+        if is_pdf_file(input_file):
+            return pool.submit(calculate_content_digest, str(input_file), hash_algorithm)
+        return pool.submit(_prepare_image, input_file, hash_algorithm)
+    
+    files = iter(input_files)
+    window = deque((input_file, submit(input_file)) for input_file in itertools.islice(files, depth))
+    while window:
+        input_file, prepared = window.popleft()
+        next_file = next(files, None)
+        if next_file is not None:
+            window.append((next_file, submit(next_file)))
+        yield input_file, prepared
+
+
 def process_single_image(input_path, ocr_engine, image_processor, csv_tracker, processing_log, 
                          output_dir, ocr_prompt, json_template, model_format, args, model_name,
-                         csv_json_summary_field="summary"):
+                         csv_json_summary_field="summary", prepared=None):
     """
     Process a single image through the OCR pipeline.
     
@@ -233,6 +440,7 @@ def process_single_image(input_path, ocr_engine, image_processor, csv_tracker, p
         json_template: JSON template handler (or None)
         model_format: Model format string
         args: Command-line arguments
+        prepared: Optional Future of _prepare_image with the hash and decoded image
         
     Returns:
         True if successful, False if skipped
@@ -240,7 +448,9 @@ def process_single_image(input_path, ocr_engine, image_processor, csv_tracker, p
     try:
         # Check if source has already been OCR'd using CSV index
         if csv_tracker.entry_exists(str(input_path)):
-            print(f"⚠️  Skip: {input_path.name}")
+            if prepared is not None:
+                prepared.cancel()
+            tqdm.write(f"⚠️  Skip: {input_path.name}")
             processing_log.log_skipped(
                 str(input_path),
                 "",
@@ -249,15 +459,35 @@ def process_single_image(input_path, ocr_engine, image_processor, csv_tracker, p
             )
             return False
         
-        # Calculate hash for filename
+        # Calculate hash for filename (already done by a worker if prefetched)
         vprint(f"Calculating hash for: {input_path}")
-        image_hash = calculate_image_hash(str(input_path))
+        if prepared is not None:
+            content_digest, prepared_image, load_error = prepared.result()
+        else:
+            content_digest, prepared_image, load_error = calculate_content_digest(str(input_path), args.hash_algorithm), None, None
+        image_hash = content_digest[:8]
+        # The log records which algorithm produced the digest
+        digest_key = f"{args.hash_algorithm}:{content_digest}"
         vprint(f"  Hash: {image_hash}")
         
+        # Skip content that was already OCR'd (e.g. same file under another name)
+        # CSV rows are buffered, so only trust log entries whose index row was written too
+        if processing_log.is_processed(digest_key) and csv_tracker.has_result_hash(image_hash):
+            tqdm.write(f"⚠️  Skip: {input_path.name}")
+            processing_log.log_skipped(
+                str(input_path),
+                image_hash,
+                "Content already processed (hash found in processing log)",
+                ""
+            )
+            return False
+        
         # Load and preprocess image
         vprint(f"Loading image: {input_path}")
         try:
-            image = image_processor.load_image(str(input_path))
+            if load_error:
+                raise Exception(load_error)
+            image = prepared_image if prepared_image is not None else image_processor.load_image(str(input_path))
             original_size = image.size
             vprint(f"  Original size: {original_size[0]}x{original_size[1]}")
             
@@ -265,7 +495,7 @@ def process_single_image(input_path, ocr_engine, image_processor, csv_tracker, p
             if image_processor.is_too_small(image):
                 total_pixels = original_size[0] * original_size[1]
                 reason = f"Image too small ({original_size[0]}x{original_size[1]} = {total_pixels} pixels, minimum: {image_processor.min_size_pixels})"
-                print(f"⚠️  Skip: {input_path.name} ({reason})")
+                tqdm.write(f"⚠️  Skip: {input_path.name} ({reason})")
                 processing_log.log_skipped(
                     str(input_path),
                     "",
@@ -305,7 +535,7 @@ def process_single_image(input_path, ocr_engine, image_processor, csv_tracker, p
         except Exception as e:
             # Corrupted image - log and skip
             error_msg = f"Failed to load/preprocess image: {str(e)}"
-            print(f"❌ ERROR: {error_msg}", file=sys.stderr)
+            tqdm.write(f"❌ ERROR: {error_msg}", file=sys.stderr)
             processing_log.log_error(str(input_path), "Corrupted Image", error_msg)
             return False
         
@@ -326,22 +556,34 @@ def process_single_image(input_path, ocr_engine, image_processor, csv_tracker, p
         vprint("Extracting text from image...")
         tile_texts = []
         
+        # Collect non-blank tiles so they can be sent to the engine as one batch
+        batch_tiles = []
         for i, (tile_image, (x, y)) in enumerate(tiles):
-            if len(tiles) > 1:
-                vprint(f"  Processing tile {i+1}/{len(tiles)} (position: {x},{y})...")
-            
             # Skip mostly blank tiles
             if len(tiles) > 1 and image_processor.is_mostly_blank(tile_image):
                 vprint(f"  ⏭️  Skipping mostly blank tile {i+1} (position: {x},{y})")
                 continue
-            
+            batch_tiles.append((i, x, y, tile_image))
+        
+        if len(tiles) > 1:
+            vprint(f"  Processing {len(batch_tiles)}/{len(tiles)} tiles...")
+        
+        # Each engine isolates failures per tile: a tile that fails gives None
+        try:
+            batch_results = ocr_engine.extract_text_batch(
+                images=[image_processor.preprocess(tile_image) for _, _, _, tile_image in batch_tiles],
+                prompts=extraction_prompt,
+                stop_at_json=json_template is not None
+            )
+        except Exception as e:
+            vprint(f"  ⚠️  Warning: Failed to process tiles: {str(e)}")
+            batch_results = [None] * len(batch_tiles)
+        
+        for (i, x, y, _), tile_text in zip(batch_tiles, batch_results):
+            if tile_text is None:
+                vprint(f"  ⚠️  Warning: Failed to process tile {i+1}")
+                continue
             try:
-                tile_to_process = image_processor.preprocess(tile_image)
-                tile_text = ocr_engine.extract_text(
-                    image=tile_to_process,
-                    prompt=extraction_prompt
-                )
-                
                 # Filter artifacts
                 if tile_text.strip():
                     lines = [line.strip() for line in tile_text.strip().split('\n') if line.strip()]
@@ -429,26 +671,18 @@ Extracted text:
                 lines = extracted_text.split('\n')
                 cleaned_lines = []
                 for line in lines:
-                    if line.strip() and not re.match(r'^[\|\s\|]+$', line.strip()):
+                    if line.strip() and not TABLE_RULE_RE.match(line.strip()):
                         cleaned_lines.append(line)
                 extracted_text = '\n'.join(cleaned_lines).strip()
                 
             except Exception as e:
                 error_msg = f"Text extraction failed: {str(e)}"
-                print(f"❌ ERROR: {error_msg}", file=sys.stderr)
+                tqdm.write(f"❌ ERROR: {error_msg}", file=sys.stderr)
                 processing_log.log_error(str(input_path), "Text Extraction Error", error_msg)
                 return False
         
         # Generate output filename: OCR-{first8}-{last8}-{hash}.{ext}
-        input_stem = input_path.stem
-        # Get first 8 and last 8 characters (pad if name is shorter than 8 chars)
-        if len(input_stem) >= 8:
-            first8 = input_stem[:8]
-            last8 = input_stem[-8:]
-        else:
-            # Pad with zeros: first8 padded on right, last8 padded on left
-            first8 = input_stem.ljust(8, '0')[:8]
-            last8 = input_stem.rjust(8, '0')[-8:]
+        first8, last8 = _stem_tokens(input_path.stem)
         
         if is_json_mode and json_data:
             # Use appropriate extension based on template
@@ -462,8 +696,7 @@ Extracted text:
             output_content = extracted_text
         
         # Save to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(output_content)
+        _write_output(output_path, output_content)
         
         # Extract summary from document
         summary = ""
@@ -473,10 +706,8 @@ Extracted text:
             summary = json_data.get(csv_json_summary_field, '') or json_data.get('title', '')
         else:
             # Extract summary from markdown text if it has "## SUMMARY ##" section
-            summary_match = re.search(r'##\s*SUMMARY\s*##\s*\n(.*?)(?:\n\n|\n##|$)', extracted_text, re.IGNORECASE | re.DOTALL)
-            if summary_match:
-                summary = summary_match.group(1).strip()
-            else:
+            summary = _find_summary_section(extracted_text)
+            if summary is None:
                 # Fallback: use first 200 characters of text if no summary section
                 summary = extracted_text[:200].replace('\n', ' ').strip() if extracted_text else ""
         
@@ -484,13 +715,13 @@ Extracted text:
         csv_tracker.add_entry(str(input_path), output_filename, summary)
         
         # Log successful processing
-        processing_log.log_processed(str(input_path), image_hash, str(output_path))
+        processing_log.log_processed(str(input_path), image_hash, str(output_path), digest_key)
         
         # Print success for this image
         if VERBOSE:
             print(f"✅ Processed: {input_path.name} → {output_filename}")
         else:
-            print(f"✅ {input_path.name}")
+            tqdm.write(f"✅ {input_path.name}")
         if VERBOSE:
             if is_json_mode and json_data:
                 print(f"\n📋 Extracted JSON:\n{'-' * 60}")
@@ -504,7 +735,7 @@ Extracted text:
         return True
         
     except Exception as e:
-        print(f"❌ {input_path.name}: {str(e)}", file=sys.stderr)
+        tqdm.write(f"❌ {input_path.name}: {str(e)}", file=sys.stderr)
         if VERBOSE:
             import traceback
             traceback.print_exc()
@@ -514,7 +745,7 @@ Extracted text:
 
 def process_pdf(input_path, ocr_engine, image_processor, csv_tracker, processing_log,
                 output_dir, ocr_prompt, json_template, model_format, args, model_name,
-                csv_json_summary_field="summary"):
+                csv_json_summary_field="summary", prepared=None):
     """
     Process a PDF file by converting pages to images and processing each page.
     
@@ -530,6 +761,7 @@ def process_pdf(input_path, ocr_engine, image_processor, csv_tracker, processing
         model_format: Model format string
         args: Command-line arguments
         model_name: Model name/path
+        prepared: Optional Future of calculate_content_digest with the PDF digest
         
     Returns:
         True if successful, False if failed
@@ -537,7 +769,9 @@ def process_pdf(input_path, ocr_engine, image_processor, csv_tracker, processing
     try:
         # Check if source has already been OCR'd using CSV index
         if csv_tracker.entry_exists(str(input_path)):
-            print(f"⚠️  Skip: {input_path.name}")
+            if prepared is not None:
+                prepared.cancel()
+            tqdm.write(f"⚠️  Skip: {input_path.name}")
             processing_log.log_skipped(
                 str(input_path),
                 "",
@@ -546,59 +780,69 @@ def process_pdf(input_path, ocr_engine, image_processor, csv_tracker, processing
             )
             return False
         
-        # Calculate hash for filename
+        # Calculate hash once (already done by a worker if prefetched); it is
+        # reused for the skip check, output filename, CSV row and log entry
         vprint(f"Calculating hash for PDF: {input_path}")
-        pdf_hash = calculate_image_hash(str(input_path))
+        pdf_digest = prepared.result() if prepared is not None else calculate_content_digest(str(input_path), args.hash_algorithm)
+        pdf_hash = pdf_digest[:8]
+        digest_key = f"{args.hash_algorithm}:{pdf_digest}"
         vprint(f"  PDF Hash: {pdf_hash}")
         
-        # Convert PDF pages to images
+        # Skip already OCR'd content before rasterizing any pages
+        # CSV rows are buffered, so only trust log entries whose index row was written too
+        if processing_log.is_processed(digest_key) and csv_tracker.has_result_hash(pdf_hash):
+            tqdm.write(f"⚠️  Skip: {input_path.name}")
+            processing_log.log_skipped(
+                str(input_path),
+                pdf_hash,
+                "Content already processed (hash found in processing log)",
+                ""
+            )
+            return False
+        
+        # JSON mode downscales each whole page to the model input size, so render
+        # only as many pixels as survive that; tiled OCR keeps the full 200 dpi
+        target_long_edge = max(image_processor.target_size) if json_template is not None else None
+        
+        # Read the page count (and page sizes) once up front; pages are then
+        # rasterized lazily, so only the page being OCR'd is held in memory
         if VERBOSE:
             print(f"📄 Converting PDF to images...")
         try:
-            pdf_pages = convert_pdf_to_images(str(input_path), dpi=200)
-            vprint(f"  Converted {len(pdf_pages)} page(s)")
+            pdf_info = read_pdf_info(str(input_path), backend=args.pdf_backend,
+                                     page_sizes=target_long_edge is not None)
+            page_count = int(pdf_info["Pages"])
+            vprint(f"  PDF has {page_count} page(s)")
         except Exception as e:
             error_msg = f"Failed to convert PDF to images: {str(e)}"
-            print(f"❌ ERROR: {error_msg}", file=sys.stderr)
+            tqdm.write(f"❌ ERROR: {error_msg}", file=sys.stderr)
             processing_log.log_error(str(input_path), "PDF Conversion Error", error_msg)
             return False
         
-        if len(pdf_pages) == 0:
+        if page_count == 0:
             error_msg = "PDF has no pages"
-            print(f"❌ ERROR: {error_msg}", file=sys.stderr)
+            tqdm.write(f"❌ ERROR: {error_msg}", file=sys.stderr)
             processing_log.log_error(str(input_path), "PDF Error", error_msg)
             return False
         
-        # Check if all PDF pages are too small (skip if all pages are below threshold)
-        valid_pages = [page for page in pdf_pages if not image_processor.is_too_small(page[0])]
-        if len(valid_pages) == 0:
-            # All pages are too small - show info about first page
-            first_page_image = pdf_pages[0][0]
-            first_page_size = first_page_image.size
-            total_pixels = first_page_size[0] * first_page_size[1]
-            reason = f"All PDF pages too small (example: {first_page_size[0]}x{first_page_size[1]} = {total_pixels} pixels, minimum: {image_processor.min_size_pixels})"
-            print(f"⚠️  Skip: {input_path.name} ({reason})")
-            processing_log.log_skipped(
-                str(input_path),
-                "",
-                reason,
-                ""
-            )
-            return False
-        
-        # Use only valid (non-too-small) pages
-        if len(valid_pages) < len(pdf_pages):
-            skipped_count = len(pdf_pages) - len(valid_pages)
-            vprint(f"  ⚠️  Skipping {skipped_count} page(s) that are too small")
-            pdf_pages = valid_pages
-        
         # Process each page
         page_texts = []
         page_json_data = []
+        small_pages = 0
+        first_page_size = None
         
-        for page_image, page_number in pdf_pages:
+        for page_image, page_number in iter_pdf_images(str(input_path), dpi=200, target_long_edge=target_long_edge,
+                                                         backend=args.pdf_backend, pdf_info=pdf_info):
             page_num = page_number
-            vprint(f"  Processing page {page_num}/{len(pdf_pages)}...")
+            if first_page_size is None:
+                first_page_size = page_image.size
+            
+            # Skip pages that are too small
+            if image_processor.is_too_small(page_image):
+                small_pages += 1
+                continue
+            
+            vprint(f"  Processing page {page_num}/{page_count}...")
             
             # Save page as temporary image for processing
             # Use process_single_image logic but with the page image directly
@@ -615,15 +859,15 @@ def process_pdf(input_path, ocr_engine, image_processor, csv_tracker, processing
                         preprocessed_image = image_processor.preprocess(page_image)
                         tiles = [(preprocessed_image, (0, 0))]
                 
-                # Extract text from tiles
+                # Extract text from all tiles of this page in one batch
+                tile_results = ocr_engine.extract_text_batch(
+                    images=[image_processor.preprocess(tile_image) for tile_image, _ in tiles],
+                    prompts=ocr_prompt,
+                    stop_at_json=json_template is not None
+                )
                 tile_texts = []
-                for tile_image, (x, y) in tiles:
-                    tile_to_process = image_processor.preprocess(tile_image)
-                    tile_text = ocr_engine.extract_text(
-                        image=tile_to_process,
-                        prompt=ocr_prompt
-                    )
-                    if tile_text.strip():
+                for (_, (x, y)), tile_text in zip(tiles, tile_results):
+                    if tile_text and tile_text.strip():
                         tile_texts.append((x, y, tile_text))
                 
                 # Combine tile texts
@@ -654,10 +898,27 @@ def process_pdf(input_path, ocr_engine, image_processor, csv_tracker, processing
                 
             except Exception as e:
                 error_msg = f"Failed to process page {page_num}: {str(e)}"
-                print(f"  ⚠️  Warning: {error_msg}")
+                tqdm.write(f"  ⚠️  Warning: {error_msg}")
                 page_texts.append(f"[Error processing page {page_num}]")
                 continue
         
+        # Skip the PDF if all pages are too small
+        if small_pages == page_count:
+            # All pages are too small - show info about first page
+            total_pixels = first_page_size[0] * first_page_size[1]
+            reason = f"All PDF pages too small (example: {first_page_size[0]}x{first_page_size[1]} = {total_pixels} pixels, minimum: {image_processor.min_size_pixels})"
+            tqdm.write(f"⚠️  Skip: {input_path.name} ({reason})")
+            processing_log.log_skipped(
+                str(input_path),
+                "",
+                reason,
+                ""
+            )
+            return False
+        
+        if small_pages:
+            vprint(f"  ⚠️  Skipped {small_pages} page(s) that are too small")
+        
         # Combine all pages
         if json_template and page_json_data:
             # For JSON mode, we need to combine JSON objects
@@ -706,15 +967,7 @@ def process_pdf(input_path, ocr_engine, image_processor, csv_tracker, processing
             is_json_mode = False
         
         # Generate output filename: OCR-{first8}-{last8}-{hash}.{ext}
-        input_stem = input_path.stem
-        # Get first 8 and last 8 characters (pad if name is shorter than 8 chars)
-        if len(input_stem) >= 8:
-            first8 = input_stem[:8]
-            last8 = input_stem[-8:]
-        else:
-            # Pad with zeros: first8 padded on right, last8 padded on left
-            first8 = input_stem.ljust(8, '0')[:8]
-            last8 = input_stem.rjust(8, '0')[-8:]
+        first8, last8 = _stem_tokens(input_path.stem)
         
         if is_json_mode and json_data:
             # Use appropriate extension based on template
@@ -728,8 +981,7 @@ def process_pdf(input_path, ocr_engine, image_processor, csv_tracker, processing
             output_content = extracted_text
         
         # Save to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(output_content)
+        _write_output(output_path, output_content)
         
         # Extract summary from document
         summary = ""
@@ -739,10 +991,8 @@ def process_pdf(input_path, ocr_engine, image_processor, csv_tracker, processing
             summary = json_data.get(csv_json_summary_field, '') or json_data.get('title', '')
         else:
             # Extract summary from markdown text if it has "## SUMMARY ##" section
-            summary_match = re.search(r'##\s*SUMMARY\s*##\s*\n(.*?)(?:\n\n|\n##|$)', extracted_text, re.IGNORECASE | re.DOTALL)
-            if summary_match:
-                summary = summary_match.group(1).strip()
-            else:
+            summary = _find_summary_section(extracted_text)
+            if summary is None:
                 # Fallback: use first 200 characters of text if no summary section
                 summary = extracted_text[:200].replace('\n', ' ').strip() if extracted_text else ""
         
@@ -750,19 +1000,19 @@ def process_pdf(input_path, ocr_engine, image_processor, csv_tracker, processing
         csv_tracker.add_entry(str(input_path), output_filename, summary)
         
         # Log successful processing
-        processing_log.log_processed(str(input_path), pdf_hash, str(output_path))
+        processing_log.log_processed(str(input_path), pdf_hash, str(output_path), digest_key)
         
         # Print success
         if VERBOSE:
-            print(f"✅ Processed PDF ({len(pdf_pages)} pages): {input_path.name} → {output_filename}")
+            print(f"✅ Processed PDF ({page_count - small_pages} pages): {input_path.name} → {output_filename}")
         else:
-            print(f"✅ {input_path.name}")
+            tqdm.write(f"✅ {input_path.name}")
         
         return True
         
     except Exception as e:
         error_msg = f"An unexpected error occurred while processing PDF {input_path.name}: {str(e)}"
-        print(f"❌ FATAL ERROR: {error_msg}", file=sys.stderr)
+        tqdm.write(f"❌ FATAL ERROR: {error_msg}", file=sys.stderr)
         processing_log.log_error(str(input_path), "PDF Processing Error", error_msg)
         return False
 
@@ -812,6 +1062,16 @@ def main():
         # PyYAML not available - continue without config
         pass
     
+    # Content hash algorithm (CLI, then config file, then default)
+    if not args.hash_algorithm:
+        args.hash_algorithm = DEFAULT_HASH_ALGORITHM
+    try:
+        check_hash_algorithm(args.hash_algorithm)
+    except Exception as e:
+        print(f"ERROR: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    vprint(f"Hash algorithm: {args.hash_algorithm}")
+    
     # Detect model format
     model_format = _detect_model_format(args.model)
     vprint(f"Detected model format: {model_format}")
@@ -905,20 +1165,14 @@ def main():
             print("⏳ Loading OCR model (this may take a moment)...")
         try:
             if model_format == "transformers":
-                try:
-                    from ocr_engine_transformers import TransformersOCREngine
-                except ImportError:
-                    try:
-                        from ocr_project.ocr_engine_transformers import TransformersOCREngine
-                    except ImportError:
-                        raise ImportError("Could not import TransformersOCREngine")
-                
+                TransformersOCREngine = _get_transformers_engine()
                 ocr_engine = TransformersOCREngine(
                     model_name=args.model,
                     device=args.device if args.device else "auto",
                     temperature=DEFAULT_TEMPERATURE,
                     max_new_tokens=DEFAULT_MAX_NEW_TOKENS,
-                    do_sample=DEFAULT_DO_SAMPLE
+                    do_sample=DEFAULT_DO_SAMPLE,
+                    quantization=args.quantization
                 )
             else:
                 if VisionOCREngine is None:
@@ -950,35 +1204,58 @@ def main():
         skipped = 0
         failed = 0
         
-        for i, input_file in enumerate(input_files, 1):
-            if VERBOSE:
-                print(f"\n[{i}/{len(input_files)}] {input_file.name}")
-            else:
-                print(f"[{i}/{len(input_files)}] {input_file.name}", end=' ', flush=True)
-            
-            # Route to appropriate processor based on file type
-            # Get CSV JSON summary field from args (defaults to "summary")
-            csv_json_summary_field = getattr(args, 'csv_json_summary_field', 'summary')
-            
-            if is_pdf_file(input_file):
-                result = process_pdf(
-                    input_file, ocr_engine, image_processor, csv_tracker, 
-                    processing_log, output_dir, ocr_prompt, json_template, 
-                    model_format, args, args.model, csv_json_summary_field
-                )
-            else:
-                result = process_single_image(
-                    input_file, ocr_engine, image_processor, csv_tracker, 
-                    processing_log, output_dir, ocr_prompt, json_template, 
-                    model_format, args, args.model, csv_json_summary_field
-                )
-            
-            if result:
-                successful += 1
-            elif result is False:
-                skipped += 1
-            else:
-                failed += 1
+        # Hash and decode upcoming images in worker processes while the model runs.
+        # Use "spawn" so workers do not inherit the loaded model or GPU context.
+        workers = args.workers if args.workers is not None else DEFAULT_PREFETCH_WORKERS
+        pool = None
+        if workers > 0 and len(input_files) > 1:
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        
+        # Progress bar for normal mode; redraws are coalesced instead of flushing per file.
+        # Per-file messages go through tqdm.write so they print above the bar.
+        progress = tqdm(total=len(input_files), unit="file", mininterval=0.25, disable=VERBOSE)
+        try:
+            prefetched = _prefetch_images(pool, input_files, depth=PREFETCH_DEPTH, hash_algorithm=args.hash_algorithm)
+            for i, (input_file, prepared) in enumerate(prefetched, 1):
+                if VERBOSE:
+                    print(f"\n[{i}/{len(input_files)}] {input_file.name}")
+                else:
+                    progress.set_postfix_str(input_file.name, refresh=False)
+                
+                # Route to appropriate processor based on file type
+                # Get CSV JSON summary field from args (defaults to "summary")
+                csv_json_summary_field = getattr(args, 'csv_json_summary_field', 'summary')
+                
+                if is_pdf_file(input_file):
+                    result = process_pdf(
+                        input_file, ocr_engine, image_processor, csv_tracker, 
+                        processing_log, output_dir, ocr_prompt, json_template, 
+                        model_format, args, args.model, csv_json_summary_field,
+                        prepared=prepared
+                    )
+                else:
+                    result = process_single_image(
+                        input_file, ocr_engine, image_processor, csv_tracker, 
+                        processing_log, output_dir, ocr_prompt, json_template, 
+                        model_format, args, args.model, csv_json_summary_field,
+                        prepared=prepared
+                    )
+                
+                if result:
+                    successful += 1
+                elif result is False:
+                    skipped += 1
+                else:
+                    failed += 1
+                progress.update()
+        finally:
+            progress.close()
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        
+        # Write out buffered CSV index and log entries
+        csv_tracker.flush()
+        processing_log.flush()
         
         # Final summary
         if VERBOSE:
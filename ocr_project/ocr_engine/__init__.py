@@ -6,16 +6,30 @@ Supports quantized models for efficient local inference.
 """
 
 import os
+from io import BytesIO
 from pathlib import Path
-from llama_cpp import Llama
+from llama_cpp import Llama, LlamaRAMCache
 from llama_cpp.llama_chat_format import Llava15ChatHandler
 import sys
 
+# SIMD base64 (same API as the stdlib module) if installed
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+
+# System prompts are kept byte-identical across calls so llama.cpp can reuse
+# the KV cache for the shared prompt prefix instead of re-evaluating it
+OCR_SYSTEM_PROMPT = "You are a text extraction tool. Output only the extracted text, no explanations or conversational formatting."
+TEXT_SYSTEM_PROMPT = "You are a text analysis tool. Generate clear, concise summaries and analysis."
+
 
 class VisionOCREngine:
     """Vision OCR Engine using Gemma 3 VLM with llama.cpp (GGUF)."""
     
-    def __init__(self, model_name, device=None, temperature=0.1, max_new_tokens=1024, do_sample=False, verbose=False):
+    def __init__(self, model_name, device=None, temperature=0.1, max_new_tokens=1024, do_sample=False, verbose=False,
+                 prompt_cache_bytes=0):
         """
         Initialize OCR engine with GGUF model.
         
@@ -26,6 +40,7 @@ class VisionOCREngine:
             max_new_tokens: Maximum tokens to generate (default: 1024)
             do_sample: Whether to use sampling (default: False, ignored for now)
             verbose: Whether to print verbose output (default: False)
+            prompt_cache_bytes: RAM budget for a llama.cpp cache of full prompt KV states (default: 0, disabled)
         """
         self.model_name = model_name
         self.device_arg = device
@@ -33,6 +48,28 @@ class VisionOCREngine:
         self.max_new_tokens = max_new_tokens
         self.do_sample = do_sample
         self.verbose = verbose
+        self.prompt_cache_bytes = prompt_cache_bytes
+        
+        # Message templates built once; extract_text only fills in the image URL
+        # and prompt. The image comes before the prompt text, so only the system
+        # prompt is a prefix shared between requests
+        self._vision_messages = [
+            {"role": "system", "content": OCR_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": [
+                    {"type": "image_url", "image_url": {"url": ""}},
+                    {"type": "text", "text": ""}
+                ]
+            }
+        ]
+        self._text_messages = [
+            {"role": "system", "content": TEXT_SYSTEM_PROMPT},
+            {"role": "user", "content": ""}
+        ]
+        
+        # Reused for encoding each image before it is sent to the model
+        self._image_buffer = BytesIO()
         
         # Find GGUF model files
         self.model_path, self.mmproj_path = self._find_model_files()
@@ -51,20 +88,20 @@ class VisionOCREngine:
         
         # If it's a directory, look for GGUF files
         if os.path.isdir(model_path_str):
-            files = os.listdir(model_path_str)
+            gguf_entries = self._scan_gguf_files(model_path_str)
             
             # Find main model (usually largest or matches pattern)
-            model_files = [f for f in files if f.endswith('.gguf') and 'mmproj' not in f.lower()]
-            mmproj_files = [f for f in files if f.endswith('.gguf') and 'mmproj' in f.lower()]
+            model_entries = [(name, size) for name, size in gguf_entries if 'mmproj' not in name.lower()]
+            mmproj_files = [name for name, _ in gguf_entries if 'mmproj' in name.lower()]
             
-            if not model_files:
+            if not model_entries:
                 raise Exception(
                     f"No GGUF model file found in {model_path_str}. "
                     "Expected a .gguf file (e.g., gemma-3-12b-it-Q4_K_M.gguf)"
                 )
             
             # Use largest model file if multiple found
-            model_file = max(model_files, key=lambda f: os.path.getsize(os.path.join(model_path_str, f)))
+            model_file = max(model_entries, key=lambda entry: entry[1])[0]
             model_path = os.path.join(model_path_str, model_file)
             
             # Find mmproj file for vision
@@ -78,7 +115,7 @@ class VisionOCREngine:
         elif os.path.isfile(model_path_str) and model_path_str.endswith('.gguf'):
             # Look for mmproj in same directory
             model_dir = os.path.dirname(model_path_str)
-            mmproj_files = [f for f in os.listdir(model_dir) if f.endswith('.gguf') and 'mmproj' in f.lower()]
+            mmproj_files = [name for name, _ in self._scan_gguf_files(model_dir or '.') if 'mmproj' in name.lower()]
             
             mmproj_path = os.path.join(model_dir, mmproj_files[0]) if mmproj_files else None
             
@@ -89,6 +126,20 @@ class VisionOCREngine:
                 "Expected a directory with .gguf files or a .gguf file path."
             )
     
+    @staticmethod
+    def _scan_gguf_files(directory):
+        """
+        List the GGUF files in a directory with their sizes in a single pass.
+        
+        Args:
+            directory: Directory to scan
+            
+        Returns:
+            list: (filename, size_in_bytes) tuples in directory order
+        """
+        with os.scandir(directory) as entries:
+            return [(entry.name, entry.stat().st_size) for entry in entries if entry.name.endswith('.gguf')]
+    
     def _vprint(self, *args, **kwargs):
         """Print only if verbose mode is enabled."""
         if self.verbose:
@@ -126,10 +177,17 @@ class VisionOCREngine:
                 model_path=self.model_path,
                 chat_handler=chat_handler,
                 n_ctx=8192,  # Increased context window for image embeddings
+                n_batch=512,  # Prompt tokens evaluated per decode step
                 n_gpu_layers=n_gpu_layers,
                 verbose=self.verbose  # Use verbose flag
             )
             
+            # Optional cache of full prompt KV states. llama.cpp already reuses the
+            # common prefix (just the system prompt, as the image precedes the
+            # prompt text) from its live KV state, so this is opt-in
+            if self.prompt_cache_bytes:
+                self.model.set_cache(LlamaRAMCache(capacity_bytes=self.prompt_cache_bytes))
+            
             self._vprint("  Model loaded successfully")
             
             # Verify GPU usage
@@ -142,14 +200,16 @@ class VisionOCREngine:
         except Exception as e:
             raise Exception(f"FATAL: Model loading failed - {str(e)}. Aborting process.")
     
-    def extract_text(self, image, prompt):
+    def extract_text(self, image, prompt, stop_at_json=False):
         """
         Extract text from image using VLM, or generate text from prompt only.
         
         Args:
             image: PIL.Image (preprocessed) or None for text-only inference
             prompt: Text prompt for OCR or text generation
-            
+            stop_at_json: If True, stream the response and stop generating as soon
+                as the first top-level JSON object is closed (JSON template mode)
+                
         Returns:
             str: Extracted text or generated text
         """
@@ -165,69 +225,138 @@ class VisionOCREngine:
             # If image is None, do text-only inference
             if image is None:
                 # Text-only mode (for summaries, etc.)
-                messages = [
-                    {
-                        "role": "system",
-                        "content": "You are a text analysis tool. Generate clear, concise summaries and analysis."
-                    },
-                    {
-                        "role": "user",
-                        "content": full_prompt
-                    }
-                ]
+                messages = self._text_messages
+                messages[1]["content"] = full_prompt
             elif self.mmproj_path:
-                # Convert PIL Image to base64
-                import base64
-                from io import BytesIO
-                
-                # Convert image to base64
-                buffer = BytesIO()
-                image.save(buffer, format='PNG')
-                image_bytes = buffer.getvalue()
-                image_base64 = base64.b64encode(image_bytes).decode('utf-8')
-                image_url = f"data:image/png;base64,{image_base64}"
+                # Encode as JPEG: the vision encoder downsamples the image anyway,
+                # and JPEG is much cheaper to produce and smaller than PNG
+                if image.mode not in ('RGB', 'L'):
+                    image = image.convert('RGB')
+                self._image_buffer.seek(0)
+                self._image_buffer.truncate(0)
+                image.save(self._image_buffer, format='JPEG', quality=85, optimize=False)
+                # Encode straight from the buffer without copying it to bytes;
+                # the view must be released before the buffer is truncated again
+                with self._image_buffer.getbuffer() as image_view:
+                    image_base64 = base64.b64encode(image_view).decode('ascii')
+                image_url = f"data:image/jpeg;base64,{image_base64}"
                 
                 # Vision model - use chat format with base64 image
                 # System message to suppress conversational formatting
-                messages = [
-                    {
-                        "role": "system",
-                        "content": "You are a text extraction tool. Output only the extracted text, no explanations or conversational formatting."
-                    },
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "image_url", "image_url": {"url": image_url}},
-                            {"type": "text", "text": full_prompt}
-                        ]
-                    }
-                ]
+                messages = self._vision_messages
+                messages[1]["content"][0]["image_url"]["url"] = image_url
+                messages[1]["content"][1]["text"] = full_prompt
                 self._vprint(f"  Image encoded: {len(image_base64)} characters")
             else:
                 # Text-only model (no vision)
-                messages = [
-                    {
-                        "role": "system",
-                        "content": "You are a text analysis tool. Generate clear, concise summaries and analysis."
-                    },
-                    {
-                        "role": "user",
-                        "content": full_prompt
-                    }
-                ]
+                messages = self._text_messages
+                messages[1]["content"] = full_prompt
             
             # Generate response using llama.cpp chat API
             self._vprint("  Generating response...")
-            response = self.model.create_chat_completion(
-                messages=messages,
-                max_tokens=self.max_new_tokens,
-                temperature=self.temperature if self.do_sample else 0.0,
-            )
-            
-            # Extract text from response
-            extracted_text = response['choices'][0]['message']['content'].strip()
+            if stop_at_json:
+                extracted_text = self._generate_until_json_closed(messages)
+            else:
+                response = self.model.create_chat_completion(
+                    messages=messages,
+                    max_tokens=self.max_new_tokens,
+                    temperature=self.temperature if self.do_sample else 0.0,
+                )
+                
+                # Extract text from response
+                extracted_text = response['choices'][0]['message']['content'].strip()
             
             return extracted_text
             
         except Exception as e:
             raise Exception(f"Text extraction failed: {str(e)}")
+        finally:
+            # Don't keep the encoded image alive until the next call
+            self._vision_messages[1]["content"][0]["image_url"]["url"] = ""
+    
+    def _generate_until_json_closed(self, messages):
+        """
+        Stream a chat completion and stop once a top-level JSON object closes.
+        
+        Braces inside JSON strings are ignored, so values such as "{x}" do not
+        end generation early. Closing the stream cancels the remaining decode.
+        
+        Args:
+            messages: Chat messages for create_chat_completion
+            
+        Returns:
+            str: Generated text up to and including the closing brace
+        """
+        stream = self.model.create_chat_completion(
+            messages=messages,
+            max_tokens=self.max_new_tokens,
+            temperature=self.temperature if self.do_sample else 0.0,
+            stream=True,
+        )
+        
+        parts = []
+        depth = 0
+        opened = False
+        in_string = False
+        escaped = False
+        try:
+            for chunk in stream:
+                piece = chunk['choices'][0]['delta'].get('content')
+                if not piece:
+                    continue
+                
+                for pos, char in enumerate(piece):
+                    if in_string:
+                        if escaped:
+                            escaped = False
+                        elif char == '\\':
+                            escaped = True
+                        elif char == '"':
+                            in_string = False
+                    elif char == '"':
+                        in_string = opened
+                    elif char == '{':
+                        depth += 1
+                        opened = True
+                    elif char == '}' and opened:
+                        depth -= 1
+                        if depth == 0:
+                            parts.append(piece[:pos + 1])
+                            self._vprint("  JSON object closed, stopping generation")
+                            return "".join(parts).strip()
+                
+                parts.append(piece)
+        finally:
+            stream.close()
+        
+        return "".join(parts).strip()
+    
+    def extract_text_batch(self, images, prompts, stop_at_json=False):
+        """
+        Extract text from several images, isolating failures per image.
+        
+        llama.cpp's chat API decodes one sequence at a time, so this runs
+        extract_text for each image in turn. An image that fails gives None
+        instead of discarding the results of the others.
+        
+        Args:
+            images: List of PIL.Image (preprocessed) or None for text-only inference
+            prompts: List of prompts (one per image) or a single prompt shared by all
+            stop_at_json: Stop each generation once its JSON object is closed
+            
+        Returns:
+            list: Extracted text for each image (None if it failed), in input order
+        """
+        if isinstance(prompts, str):
+            prompts = [prompts] * len(images)
+        if len(prompts) != len(images):
+            raise ValueError(f"Expected {len(images)} prompts, got {len(prompts)}")
+        
+        results = []
+        for n, (image, prompt) in enumerate(zip(images, prompts), 1):
+            try:
+                results.append(self.extract_text(image=image, prompt=prompt, stop_at_json=stop_at_json))
+            except Exception as e:
+                self._vprint(f"  ⚠️  Warning: Failed to process image {n}/{len(images)}: {str(e)}")
+                results.append(None)
+        return results
@@ -5,15 +5,42 @@ Handles loading and inference for Transformers-based Vision Language Models.
 Supports safetensors format models.
 """
 
+import importlib.util
 import os
+import sys
+import types
+from collections import OrderedDict
 from pathlib import Path
 import warnings
 
+# Heavy dependencies are imported once here; this module itself is only
+# imported when the transformers backend is selected
+try:
+    from transformers import AutoProcessor, AutoConfig, AutoModelForCausalLM
+    import torch
+    _TRANSFORMERS_OK = True
+except ImportError:
+    _TRANSFORMERS_OK = False
+
+try:
+    from transformers import AutoModelForVision2Seq
+except ImportError:
+    AutoModelForVision2Seq = None  # Removed in newer transformers releases
+
+
+# KV cache lengths for CUDA graph decoding are rounded up to a multiple of this,
+# bounding the number of captured graphs (one per cache length)
+CUDA_GRAPH_CACHE_STEP = 512
+
+# Captured decode graphs kept at once; each holds a full StaticCache on the GPU
+CUDA_GRAPH_MAX_CACHED = 2
+
 
 class TransformersOCREngine:
     """Vision OCR Engine using Transformers library (safetensors)."""
     
-    def __init__(self, model_name, device=None, temperature=0.1, max_new_tokens=1024, do_sample=False):
+    def __init__(self, model_name, device=None, temperature=0.1, max_new_tokens=1024, do_sample=False,
+                 cuda_graphs=False, compile_model=True, quantization=None, static_cache=True):
         """
         Initialize OCR engine with Transformers model.
         
@@ -23,82 +50,138 @@ class TransformersOCREngine:
             temperature: Sampling temperature (default: 0.1)
             max_new_tokens: Maximum tokens to generate (default: 1024)
             do_sample: Whether to use sampling (default: False)
+            cuda_graphs: Replay greedy decode steps from a captured CUDA graph when the
+                         model runs on a single CUDA device and its generation config
+                         adds no logits processors; bypasses generate() (default: False)
+            compile_model: Compile the model forward with torch.compile(mode="reduce-overhead")
+                           on CUDA; CPU always runs eagerly (default: True)
+            quantization: Weight quantization: "int8" or "int4" (bitsandbytes), "fp8"
+                          (torchao, Hopper+ GPUs) or None for full precision (default: None)
+            static_cache: Have generate() use a preallocated fixed-shape KV cache
+                          (cache_implementation="static") on CUDA (default: True)
         """
-        try:
-            from transformers import AutoProcessor, AutoConfig
-            import torch
-        except ImportError as e:
+        if not _TRANSFORMERS_OK:
             raise ImportError(
                 "Transformers dependencies not installed. "
                 "Please install: transformers, torch, accelerate, safetensors"
-            ) from e
+            )
         
         self.model_name = model_name
         self.device_arg = device
         self.temperature = temperature
         self.max_new_tokens = max_new_tokens
         self.do_sample = do_sample
+        if quantization not in (None, "int8", "int4", "fp8"):
+            raise ValueError(f"Unsupported quantization: {quantization}. Use int8, int4 or fp8.")
+        
+        self.compile_model = compile_model
+        self.quantization = quantization
+        self.compiled = False
         self.model = None
         self.processor = None
         self.torch = torch
         
         # Load model and processor
         self._load_model()
+        
+        # Captured decode graphs by KV cache length, least recently used first
+        # (see _generate_with_cuda_graph)
+        self._decode_graphs = OrderedDict()
+        # Page-locked host staging buffers for input tensors, by input name
+        self._pinned_buffers = {}
+        # Tokenized prompt tensors by (prompt, image metadata); None disables reuse
+        self._prompt_cache = {}
+        self.use_cuda_graphs = (
+            cuda_graphs
+            and not self.compiled  # reduce-overhead already captures CUDA graphs
+            and not do_sample
+            and torch.cuda.is_available()
+            and str(getattr(self.model, 'device', 'cpu')).startswith('cuda')
+            and not self._spans_multiple_devices()  # graphs and the cache assume one device
+            and self._is_plain_greedy()  # the decode loop applies no logits processors
+        )
+        
+        # generate() keeps a preallocated StaticCache on the model and resets it per
+        # call instead of growing a dynamic cache; fixed shapes also keep the
+        # compiled forward from recompiling for every new sequence length
+        self.use_static_cache = (
+            static_cache
+            and torch.cuda.is_available()
+            and str(getattr(self.model, 'device', 'cpu')).startswith('cuda')
+        )
+        
+        # Side stream for host-to-device input copies
+        self._copy_stream = None
+        if torch.cuda.is_available() and str(getattr(self.model, 'device', 'cpu')).startswith('cuda'):
+            self._copy_stream = torch.cuda.Stream(device=self.model.device)
     
     def _load_model(self):
         """Load the Vision Language Model using Transformers."""
         try:
-            # Import model loading functions
-            from transformers import AutoProcessor, AutoConfig
-            import sys
-            
             model_path_str = str(self.model_name)
             
             print(f"  Loading Transformers model from: {model_path_str}")
             
             # Check if it's a local path and has custom modeling files
             is_local = os.path.isdir(model_path_str) or os.path.isfile(model_path_str)
+            quantization_kwargs = self._quantization_kwargs()
             
             if is_local and os.path.exists(os.path.join(model_path_str, "modeling_deepseekocr.py")):
                 # Custom model - load directly
                 print(f"  Detected custom DeepSeek OCR model")
-                sys.path.insert(0, model_path_str)
                 try:
-                    from modeling_deepseekocr import DeepseekOCRForCausalLM
+                    DeepseekOCRForCausalLM = self._load_custom_model_class(
+                        model_path_str, "modeling_deepseekocr", "DeepseekOCRForCausalLM"
+                    )
                     config = AutoConfig.from_pretrained(model_path_str, trust_remote_code=True)
-                    self.model = DeepseekOCRForCausalLM.from_pretrained(
+                    self.model = self._from_pretrained(
+                        DeepseekOCRForCausalLM,
                         model_path_str,
                         config=config,
-                        dtype=self.torch.bfloat16 if self.device_arg == "cuda" else self.torch.float32,
+                        dtype=self._pick_dtype(),
                         device_map="auto" if self.device_arg == "auto" else self.device_arg,
-                        trust_remote_code=True
+                        trust_remote_code=True,
+                        **quantization_kwargs
                     )
                 except ImportError as e:
                     raise Exception(f"Failed to load custom model: {str(e)}")
             else:
                 # Standard model - try AutoModelForVision2Seq
                 try:
-                    from transformers import AutoModelForVision2Seq
-                    self.model = AutoModelForVision2Seq.from_pretrained(
+                    if AutoModelForVision2Seq is None:
+                        raise ImportError("AutoModelForVision2Seq is not available in this transformers version")
+                    self.model = self._from_pretrained(
+                        AutoModelForVision2Seq,
                         model_path_str,
-                        torch_dtype=self.torch.bfloat16 if self.device_arg == "cuda" else self.torch.float32,
+                        torch_dtype=self._pick_dtype(),
                         device_map="auto" if self.device_arg == "auto" else self.device_arg,
-                        trust_remote_code=True
+                        trust_remote_code=True,
+                        **quantization_kwargs
                     )
                 except Exception as e:
                     warnings.warn(f"Failed to load with AutoModelForVision2Seq: {e}")
                     # Try AutoModelForCausalLM as fallback
-                    from transformers import AutoModelForCausalLM
-                    self.model = AutoModelForCausalLM.from_pretrained(
+                    self.model = self._from_pretrained(
+                        AutoModelForCausalLM,
                         model_path_str,
-                        torch_dtype=self.torch.bfloat16 if self.device_arg == "cuda" else self.torch.float32,
+                        torch_dtype=self._pick_dtype(),
                         device_map="auto" if self.device_arg == "auto" else self.device_arg,
-                        trust_remote_code=True
+                        trust_remote_code=True,
+                        **quantization_kwargs
                     )
             
+            if self.quantization == "fp8":
+                self._quantize_fp8()
+            
+            self._compile_model()
+            
             # Load processor
             self.processor = AutoProcessor.from_pretrained(model_path_str, trust_remote_code=True)
             
+            # Resolve the special token ids once instead of on every decode
+            self._tokenizer = getattr(self.processor, 'tokenizer', self.processor)
+            self._special_ids = frozenset(getattr(self._tokenizer, 'all_special_ids', ()))
+            
             print("  Model loaded successfully")
             
             # Verify device
@@ -110,13 +193,260 @@ class TransformersOCREngine:
         except Exception as e:
             raise Exception(f"FATAL: Model loading failed - {str(e)}. Aborting process.")
     
-    def extract_text(self, image, prompt):
+    def _spans_multiple_devices(self):
+        """
+        Check whether the model was sharded across devices (e.g. device_map="auto").
+        
+        Returns:
+            bool: True if the device map places modules on more than one device
+        """
+        device_map = getattr(self.model, 'hf_device_map', None) or {}
+        return len({str(device) for device in device_map.values()}) > 1
+    
+    def _is_plain_greedy(self):
+        """
+        Check whether generate() would pick each token by plain argmax.
+        
+        The CUDA graph decode loop bypasses generate(), so it may only be used
+        when the generation config asks for no logits processing (repetition
+        penalties, n-gram blocking, minimum lengths, suppressed or forced tokens).
+        
+        Returns:
+            bool: True if the generation config adds no logits processors
+        """
+        config = getattr(self.model, 'generation_config', None)
+        if config is None:
+            return True
+        neutral = {
+            'repetition_penalty': (None, 1.0),
+            'encoder_repetition_penalty': (None, 1.0),
+            'no_repeat_ngram_size': (None, 0),
+            'encoder_no_repeat_ngram_size': (None, 0),
+            'min_length': (None, 0),
+            'min_new_tokens': (None, 0),
+        }
+        if any(getattr(config, name, None) not in values for name, values in neutral.items()):
+            return False
+        unset = ('bad_words_ids', 'suppress_tokens', 'begin_suppress_tokens', 'forced_bos_token_id',
+                 'forced_eos_token_id', 'forced_decoder_ids', 'sequence_bias',
+                 'exponential_decay_length_penalty', 'renormalize_logits')
+        return not any(getattr(config, name, None) for name in unset)
+    
+    def _pick_dtype(self):
+        """
+        Choose the weight dtype for the target device.
+        
+        CUDA always runs bfloat16. On CPU, bfloat16 is only faster than float32
+        with native bf16 support (AVX512-BF16 or AMX, Sapphire Rapids and later);
+        older CPUs emulate it and run much slower, so they stay on float32.
+        
+        Returns:
+            torch.dtype: bfloat16 or float32
+        """
+        torch = self.torch
+        if self.device_arg == "cuda":
+            return torch.bfloat16
+        if self.device_arg not in (None, "cpu"):
+            return torch.float32
+        
+        cpu = getattr(torch, 'cpu', None)
+        for check in ("_is_amx_tile_supported", "_is_avx512_bf16_supported"):
+            try:
+                if getattr(cpu, check)():
+                    return torch.bfloat16
+            except Exception:
+                pass
+        
+        try:
+            with open("/proc/cpuinfo", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith("flags"):
+                        flags = line.split()
+                        if "avx512_bf16" in flags or "amx_bf16" in flags:
+                            return torch.bfloat16
+                        break
+        except OSError:
+            pass
+        return torch.float32
+    
+    def _load_custom_model_class(self, model_path_str, module_name, class_name):
+        """
+        Import a model class from a modeling file in a local model directory.
+        
+        The directory is registered as a package of its own, so the modeling
+        file's relative imports resolve to its sibling files without putting the
+        directory on sys.path (which every later import would then stat).
+        
+        Args:
+            model_path_str: Local model directory
+            module_name: Modeling file name without .py
+            class_name: Class to return from that module
+            
+        Returns:
+            type: The model class
+            
+        Raises:
+            ImportError: If the module or class can't be loaded
+        """
+        package_name = f"_ocr_local_model_{abs(hash(os.path.abspath(model_path_str))):x}"
+        qualified_name = f"{package_name}.{module_name}"
+        module = sys.modules.get(qualified_name)
+        
+        if module is None:
+            package = types.ModuleType(package_name)
+            package.__path__ = [model_path_str]
+            sys.modules[package_name] = package
+            
+            spec = importlib.util.spec_from_file_location(
+                qualified_name, os.path.join(model_path_str, f"{module_name}.py")
+            )
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[qualified_name] = module
+            try:
+                spec.loader.exec_module(module)
+            except ModuleNotFoundError:
+                # Modeling files written for sys.path use absolute sibling imports;
+                # allow those for the duration of this import only
+                sys.path.insert(0, model_path_str)
+                try:
+                    spec.loader.exec_module(module)
+                except BaseException:
+                    sys.modules.pop(qualified_name, None)
+                    raise
+                finally:
+                    sys.path.remove(model_path_str)
+            except BaseException:
+                sys.modules.pop(qualified_name, None)
+                raise
+        
+        try:
+            return getattr(module, class_name)
+        except AttributeError:
+            raise ImportError(f"{class_name} not found in {module_name}.py")
+    
+    def _attention_implementations(self):
+        """
+        Attention backends to try at load time, fastest first.
+        
+        FlashAttention 2 needs an Ampere or newer GPU and the flash-attn package;
+        otherwise PyTorch SDPA is used. The list always ends with None, meaning
+        the model's own default.
+        
+        Returns:
+            list: attn_implementation values in order of preference
+        """
+        torch = self.torch
+        candidates = []
+        if (self.device_arg in ("cuda", "auto") and torch.cuda.is_available()
+                and torch.cuda.get_device_capability()[0] >= 8
+                and importlib.util.find_spec("flash_attn") is not None):
+            candidates.append("flash_attention_2")
+        candidates.append("sdpa")
+        candidates.append(None)
+        return candidates
+    
+    def _from_pretrained(self, model_class, model_path_str, **kwargs):
+        """
+        Load a model with the fastest attention backend it supports.
+        
+        Args:
+            model_class: Model class with a from_pretrained() classmethod
+            model_path_str: Local path or Hugging Face model ID
+            **kwargs: Additional from_pretrained() arguments
+            
+        Returns:
+            Loaded model
+        """
+        for attention in self._attention_implementations():
+            if attention is None:
+                return model_class.from_pretrained(model_path_str, **kwargs)
+            try:
+                model = model_class.from_pretrained(model_path_str, attn_implementation=attention, **kwargs)
+                print(f"  Attention backend: {attention}")
+                return model
+            except (ValueError, ImportError) as e:
+                # Custom/older models reject backends they don't implement
+                warnings.warn(f"attn_implementation={attention!r} not supported, trying next backend: {e}")
+    
+    def _quantization_kwargs(self):
+        """
+        Build from_pretrained() arguments for bitsandbytes weight quantization.
+        
+        INT8 halves and INT4 (NF4) quarters the weight bytes read per decoded token,
+        which is what bounds single-image decode speed. FP8 is applied after loading.
+        
+        Returns:
+            dict: Extra keyword arguments for from_pretrained()
+        """
+        if self.quantization not in ("int8", "int4"):
+            return {}
+        
+        try:
+            from transformers import BitsAndBytesConfig
+            import bitsandbytes  # noqa: F401 - required by BitsAndBytesConfig at load time
+        except ImportError as e:
+            raise ImportError(f"{self.quantization} quantization requires bitsandbytes: pip install bitsandbytes") from e
+        
+        print(f"  Quantizing weights to {self.quantization} (bitsandbytes)")
+        if self.quantization == "int8":
+            return {"quantization_config": BitsAndBytesConfig(load_in_8bit=True)}
+        return {
+            "quantization_config": BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_compute_dtype=self.torch.bfloat16,
+                bnb_4bit_quant_type="nf4",
+            )
+        }
+    
+    def _quantize_fp8(self):
+        """Quantize the loaded model's weights to FP8 in place using torchao."""
+        try:
+            from torchao.quantization import quantize_, Float8WeightOnlyConfig
+        except ImportError as e:
+            raise ImportError("fp8 quantization requires torchao: pip install torchao") from e
+        
+        print("  Quantizing weights to fp8 (torchao)")
+        quantize_(self.model, Float8WeightOnlyConfig())
+    
+    def _compile_model(self):
+        """
+        Compile the model forward with torch.compile for fused kernels and CUDA graphs.
+        
+        Only used on CUDA with torch >= 2.4. Inductor's FX graph cache is kept in a
+        persistent directory so later runs skip most of the compile cold start.
+        """
+        torch = self.torch
+        if not self.compile_model or self.device_arg not in ("cuda", "auto") or not torch.cuda.is_available():
+            return
+        
+        if self.quantization in ("int8", "int4"):
+            # bitsandbytes kernels don't trace reliably under torch.compile
+            return
+        
+        version = tuple(int(part) for part in torch.__version__.split('+')[0].split('.')[:2])
+        if version < (2, 4):
+            print(f"  torch {torch.__version__} is too old for torch.compile here, running eagerly")
+            return
+        
+        os.environ.setdefault("TORCHINDUCTOR_FX_GRAPH_CACHE", "1")
+        os.environ.setdefault(
+            "TORCHINDUCTOR_CACHE_DIR",
+            str(Path.home() / ".cache" / "ocr_project" / "torchinductor")
+        )
+        
+        # Compile forward rather than the module so generate() uses the compiled graph
+        self.model.forward = torch.compile(self.model.forward, mode="reduce-overhead", fullgraph=False, dynamic=False)
+        self.compiled = True
+        print("  Model compiled with torch.compile (reduce-overhead)")
+    
+    def extract_text(self, image, prompt, stop_at_json=False):
         """
         Extract text from image using VLM, or generate text from prompt only.
         
         Args:
             image: PIL.Image (preprocessed) or None for text-only inference
             prompt: Text prompt for OCR or text generation
+            stop_at_json: Accepted for API compatibility with VisionOCREngine (unused)
             
         Returns:
             str: Extracted text or generated text
@@ -131,37 +461,388 @@ class TransformersOCREngine:
                 raise Exception("Text-only inference not supported with Transformers engine")
             
             # Prepare inputs using processor
-            from transformers.image_utils import load_image
-            
             # Convert PIL Image if needed
             if hasattr(image, 'save'):
-                inputs = self.processor(images=image, text=prompt, return_tensors="pt")
+                inputs = self._prepare_inputs(image, prompt)
             else:
                 inputs = self.processor(images=[image], text=prompt, return_tensors="pt")
             
             # Move inputs to model device
             if hasattr(self.model, 'device'):
-                inputs = {k: v.to(self.model.device) for k, v in inputs.items() if hasattr(v, 'to')}
+                inputs = self._to_device(inputs)
             
-            # Generate
+            # Generate (inference_mode also skips autograd version-counter tracking)
             print("  Generating response...")
-            with self.torch.no_grad():
-                outputs = self.model.generate(
-                    **inputs,
-                    max_new_tokens=self.max_new_tokens,
-                    temperature=self.temperature if self.do_sample else 0.0,
-                    do_sample=self.do_sample,
-                )
-            
-            # Decode output
-            extracted_text = self.processor.decode(outputs[0], skip_special_tokens=True)
+            with self.torch.inference_mode():
+                outputs = None
+                if self.use_cuda_graphs:
+                    try:
+                        outputs = self._generate_with_cuda_graph(inputs)
+                    except Exception as e:
+                        # Not every architecture can be captured; use generate() from now on
+                        warnings.warn(f"CUDA graph decoding unavailable, falling back to generate(): {e}")
+                        self.use_cuda_graphs = False
+                        self._decode_graphs.clear()
+                
+                if outputs is None:
+                    outputs = self._generate(inputs)
             
-            # Remove the input prompt from the output if it's there
-            if prompt in extracted_text:
-                extracted_text = extracted_text.replace(prompt, "").strip()
+            # Decoder-only outputs start with the prompt tokens; decode only the
+            # generated ones instead of searching the text for the prompt
+            generated_ids = outputs[0]
+            if 'input_ids' in inputs and not getattr(self.model.config, 'is_encoder_decoder', False):
+                generated_ids = generated_ids[inputs['input_ids'].shape[1]:]
             
-            return extracted_text.strip()
+            return self._decode(generated_ids)
             
         except Exception as e:
             raise Exception(f"Text extraction failed: {str(e)}")
-
+    
+    def _generate(self, inputs, **kwargs):
+        """
+        Call model.generate(), with a static KV cache when enabled.
+        
+        Falls back to the default dynamic cache (and stays there) if the model
+        doesn't support cache_implementation="static". Any other error (out of
+        memory, bad inputs) propagates and leaves the static cache enabled.
+        
+        Args:
+            inputs: Processor outputs already moved to the model device
+            **kwargs: Extra generate() arguments
+            
+        Returns:
+            Tensor of generated token ids
+        """
+        generate_kwargs = dict(
+            max_new_tokens=self.max_new_tokens,
+            temperature=self.temperature if self.do_sample else 0.0,
+            do_sample=self.do_sample,
+            use_cache=True,
+            **kwargs
+        )
+        if self.use_static_cache:
+            try:
+                return self.model.generate(**inputs, cache_implementation="static", **generate_kwargs)
+            except (TypeError, ValueError) as e:
+                # Only the cache setup rejecting "static" means the model can't use it
+                if 'cache' not in str(e).lower():
+                    raise
+                warnings.warn(f"Static KV cache unavailable, falling back to dynamic cache: {e}")
+                self.use_static_cache = False
+        return self.model.generate(**inputs, **generate_kwargs)
+    
+    def _prepare_inputs(self, image, prompt):
+        """
+        Run the processor, reusing the tokenized prompt when it can't have changed.
+        
+        The text tokens (including expanded image placeholders) only depend on the
+        prompt and the image metadata the processor derives (pixel tensor shape,
+        image sizes / grids). When both match an earlier call, only the image
+        processor runs and the cached input_ids / attention_mask are reused.
+        
+        Args:
+            image: PIL.Image (preprocessed)
+            prompt: Text prompt
+            
+        Returns:
+            dict: Processor outputs
+        """
+        image_processor = getattr(self.processor, 'image_processor', None)
+        if self._prompt_cache is None or image_processor is None:
+            return self.processor(images=image, text=prompt, return_tensors="pt")
+        
+        image_inputs = image_processor(image, return_tensors="pt")
+        key = (prompt, self._image_metadata_key(image_inputs))
+        text_inputs = self._prompt_cache.get(key)
+        if text_inputs is not None:
+            return {**text_inputs, **image_inputs}
+        
+        inputs = self.processor(images=image, text=prompt, return_tensors="pt")
+        
+        # Only cache if the standalone image processor reproduces the processor's
+        # image outputs; otherwise tokenize every time
+        if self._image_metadata_key({k: inputs[k] for k in image_inputs if k in inputs}) != key[1]:
+            self._prompt_cache = None
+            return inputs
+        
+        if len(self._prompt_cache) >= 32:
+            self._prompt_cache.clear()
+        self._prompt_cache[key] = {k: v for k, v in inputs.items() if k not in image_inputs}
+        return inputs
+    
+    def _image_metadata_key(self, image_inputs):
+        """
+        Build a hashable key from image processor outputs, ignoring pixel values.
+        
+        Args:
+            image_inputs: Image processor outputs
+            
+        Returns:
+            tuple: Sorted (name, shape, values) entries; pixel tensors contribute only their shape
+        """
+        entries = []
+        for name, value in sorted(image_inputs.items()):
+            if isinstance(value, self.torch.Tensor):
+                if 'pixel' in name:
+                    entries.append((name, tuple(value.shape), None))
+                else:
+                    entries.append((name, tuple(value.shape), tuple(value.flatten().tolist())))
+            else:
+                entries.append((name, None, repr(value)))
+        return tuple(entries)
+    
+    def _to_device(self, inputs):
+        """
+        Move processor outputs to the model device.
+        
+        For CUDA, each tensor is staged through a reusable page-locked host buffer
+        (grown when a larger input arrives) and copied asynchronously on a side
+        stream, so staging the next tensor overlaps with the previous transfer.
+        The compute stream waits for the copies before the tensors are used.
+        
+        Args:
+            inputs: Processor outputs (BatchFeature or dict)
+            
+        Returns:
+            dict: Tensors on the model device (non-tensor entries are dropped)
+        """
+        device = self.model.device
+        if not str(device).startswith('cuda') or self._copy_stream is None:
+            return {k: v.to(device) for k, v in inputs.items() if hasattr(v, 'to')}
+        
+        torch = self.torch
+        compute_stream = torch.cuda.current_stream(device)
+        # Copies must not start before earlier work on the compute stream is queued
+        self._copy_stream.wait_stream(compute_stream)
+        
+        moved = {}
+        for name, value in inputs.items():
+            if not hasattr(value, 'to'):
+                continue
+            if not isinstance(value, self.torch.Tensor) or value.is_cuda:
+                moved[name] = value.to(device)
+                continue
+            
+            buffer = self._pinned_buffers.get(name)
+            if buffer is None or buffer.dtype != value.dtype or buffer.numel() < value.numel():
+                buffer = self.torch.empty(value.numel(), dtype=value.dtype, pin_memory=True)
+                self._pinned_buffers[name] = buffer
+            staged = buffer[:value.numel()].view(value.shape)
+            staged.copy_(value)
+            with torch.cuda.stream(self._copy_stream):
+                copied = staged.to(device, non_blocking=True)
+            # Memory allocated on the copy stream is used on the compute stream
+            copied.record_stream(compute_stream)
+            moved[name] = copied
+        
+        compute_stream.wait_stream(self._copy_stream)
+        return moved
+    
+    def _get_decode_graph(self, max_cache_len):
+        """
+        Get the static KV cache and captured single-token decode graph for a cache length.
+        
+        The graph is captured on first use after a few warmup steps (cuBLAS
+        initialization, kernel autotuning) and replayed for every later token.
+        Only the CUDA_GRAPH_MAX_CACHED most recently used cache lengths are kept;
+        older graphs and their caches are freed before a new one is allocated.
+        
+        Args:
+            max_cache_len: Static KV cache length (prompt + generated tokens)
+            
+        Returns:
+            tuple: (cache, graph, static_ids, static_position, static_logits)
+        """
+        entry = self._decode_graphs.get(max_cache_len)
+        if entry is not None:
+            self._decode_graphs.move_to_end(max_cache_len)
+            return entry
+        
+        from transformers import StaticCache
+        torch = self.torch
+        device = self.model.device
+        
+        if len(self._decode_graphs) >= CUDA_GRAPH_MAX_CACHED:
+            while len(self._decode_graphs) >= CUDA_GRAPH_MAX_CACHED:
+                _, (_, old_graph, *_) = self._decode_graphs.popitem(last=False)
+                old_graph.reset()  # Releases the graph's private memory pool
+            del old_graph
+            torch.cuda.empty_cache()
+        
+        cache = StaticCache(
+            config=self.model.config,
+            max_batch_size=1,
+            max_cache_len=max_cache_len,
+            device=device,
+            dtype=self.model.dtype,
+        )
+        static_ids = torch.zeros((1, 1), dtype=torch.long, device=device)
+        static_position = torch.full((1,), max_cache_len - 1, dtype=torch.long, device=device)
+        
+        def decode_step():
+            return self.model(
+                input_ids=static_ids,
+                past_key_values=cache,
+                cache_position=static_position,
+                use_cache=True,
+                return_dict=True,
+            ).logits[:, -1, :]
+        
+        with torch.no_grad():
+            # Warm up on a side stream before capturing
+            stream = torch.cuda.Stream()
+            stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(stream):
+                for _ in range(3):
+                    decode_step()
+            torch.cuda.current_stream().wait_stream(stream)
+            
+            graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(graph):
+                static_logits = decode_step()
+        
+        entry = (cache, graph, static_ids, static_position, static_logits)
+        self._decode_graphs[max_cache_len] = entry
+        return entry
+    
+    def _generate_with_cuda_graph(self, inputs):
+        """
+        Greedy generation that replays a captured CUDA graph for each decoded token.
+        
+        The prefill (image + prompt) runs eagerly into a static KV cache; every
+        following token only copies its id and position into the graph's static
+        input tensors and replays it, instead of launching each kernel from Python.
+        
+        Args:
+            inputs: Processor outputs already moved to the model device
+            
+        Returns:
+            Tensor of shape (1, prompt_len + generated_len), like generate()
+        """
+        torch = self.torch
+        input_ids = inputs['input_ids']
+        prompt_len = input_ids.shape[1]
+        needed = prompt_len + self.max_new_tokens
+        max_cache_len = -(-needed // CUDA_GRAPH_CACHE_STEP) * CUDA_GRAPH_CACHE_STEP
+        cache, graph, static_ids, static_position, static_logits = self._get_decode_graph(max_cache_len)
+        
+        eos_token_id = getattr(self.model.generation_config, 'eos_token_id', None)
+        eos_ids = set(eos_token_id if isinstance(eos_token_id, (list, tuple)) else [eos_token_id]) - {None}
+        
+        with torch.no_grad():
+            # Clears the warmup / previous image in place; tensor addresses stay the same
+            cache.reset()
+            logits = self.model(
+                **inputs,
+                past_key_values=cache,
+                cache_position=torch.arange(prompt_len, device=input_ids.device),
+                use_cache=True,
+                return_dict=True,
+            ).logits[:, -1, :]
+            next_token = logits.argmax(dim=-1)
+            
+            generated = [next_token]
+            for step in range(1, self.max_new_tokens):
+                if int(next_token) in eos_ids:
+                    break
+                static_ids.copy_(next_token.view(1, 1))
+                static_position.fill_(prompt_len + step - 1)
+                graph.replay()
+                next_token = static_logits.argmax(dim=-1)
+                generated.append(next_token)
+        
+        return torch.cat([input_ids, torch.stack(generated, dim=1)], dim=1)
+    
+    def extract_text_batch(self, images, prompts, stop_at_json=False):
+        """
+        Extract text from several images in a single call.
+        
+        All images go through one padded processor call and one generate() call,
+        so prefill and kernel launches are shared across the batch. Falls back to
+        one call per image if the processor or model can't batch; there an image
+        that fails gives None instead of discarding the results of the others.
+        
+        Args:
+            images: List of PIL.Image (preprocessed)
+            prompts: List of prompts (one per image) or a single prompt shared by all
+            stop_at_json: Accepted for API compatibility with VisionOCREngine (unused)
+            
+        Returns:
+            list: Extracted text for each image (None if it failed), in input order
+        """
+        if isinstance(prompts, str):
+            prompts = [prompts] * len(images)
+        if len(prompts) != len(images):
+            raise ValueError(f"Expected {len(images)} prompts, got {len(prompts)}")
+        
+        if len(images) > 1:
+            try:
+                return self._generate_batch(images, prompts)
+            except Exception as e:
+                warnings.warn(f"Batched generation failed, processing images one at a time: {e}")
+        
+        results = []
+        for n, (image, prompt) in enumerate(zip(images, prompts), 1):
+            try:
+                results.append(self.extract_text(image=image, prompt=prompt))
+            except Exception as e:
+                warnings.warn(f"Failed to process image {n}/{len(images)}: {e}")
+                results.append(None)
+        return results
+    
+    def _generate_batch(self, images, prompts):
+        """
+        Run one padded processor call and one generate() call for several images.
+        
+        Args:
+            images: List of PIL.Image (preprocessed)
+            prompts: List of prompts, one per image
+            
+        Returns:
+            list: Extracted text for each image, in input order
+        """
+        print(f"  Running batched inference ({len(images)} images)...")
+        
+        # Decoder-only models must be padded on the left to generate from a batch;
+        # the tokenizer's own setting is restored for every other caller
+        tokenizer = getattr(self.processor, 'tokenizer', None)
+        old_padding_side = getattr(tokenizer, 'padding_side', None)
+        if tokenizer is not None:
+            tokenizer.padding_side = "left"
+        try:
+            inputs = self.processor(images=images, text=prompts, return_tensors="pt", padding=True)
+        finally:
+            if tokenizer is not None:
+                tokenizer.padding_side = old_padding_side
+        prompt_len = inputs['input_ids'].shape[1]
+        if hasattr(self.model, 'device'):
+            inputs = self._to_device(inputs)
+        
+        with self.torch.inference_mode():
+            outputs = self._generate(inputs, num_return_sequences=1)
+        
+        # Decoder-only outputs start with the (padded) prompt tokens
+        if not getattr(self.model.config, 'is_encoder_decoder', False):
+            outputs = outputs[:, prompt_len:]
+        
+        return [self._decode(ids) for ids in outputs]
+    
+    def _decode(self, token_ids):
+        """
+        Decode generated token ids to text without special tokens.
+        
+        Special tokens are dropped against the set cached at load time, and the
+        tokenizer decodes the rest directly instead of going through the
+        processor's skip_special_tokens path.
+        
+        Args:
+            token_ids: 1-D tensor of token ids
+            
+        Returns:
+            str: Decoded text, stripped
+        """
+        if not self._special_ids:
+            return self.processor.decode(token_ids, skip_special_tokens=True).strip()
+        special_ids = self._special_ids
+        ids = [token_id for token_id in token_ids.tolist() if token_id not in special_ids]
+        return self._tokenizer.decode(ids, skip_special_tokens=False).strip()
@@ -5,44 +5,319 @@ Handles PDF to image conversion for OCR processing.
 """
 
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Tuple
 from PIL import Image
+import math
+import re
 import tempfile
 import os
 
+# Imported once at module load; a missing pdf2image only fails when a PDF is converted
+try:
+    from pdf2image import convert_from_path as _convert_from_path, pdfinfo_from_path as _pdfinfo_from_path
+except ImportError:
+    _convert_from_path = None
+    _pdfinfo_from_path = None
 
-def convert_pdf_to_images(pdf_path: str, dpi: int = 200) -> List[Tuple[Image.Image, int]]:
+
+# pdfinfo "Page size" field, e.g. "612 x 792 pts (letter)"
+PAGE_SIZE_RE = re.compile(r'\s*([\d.]+)\s*x\s*([\d.]+)\s*pts')
+
+# Per-page pdfinfo field name when a page range is given, e.g. "Page    3 size"
+PAGE_N_SIZE_KEY_RE = re.compile(r'^\s*Page\s+(\d+)\s+size\s*$')
+
+# Last page passed to pdfinfo to list every page size; pdfinfo clamps it to the
+# real page count
+PDFINFO_ALL_PAGES = 1_000_000
+
+
+def _import_pdf2image():
     """
-    Convert PDF pages to PIL Images.
+    Get the pdf2image functions used for rasterization.
     
-    Args:
-        pdf_path: Path to PDF file
-        dpi: Resolution for PDF rendering (default: 200)
-        
     Returns:
-        List of (PIL.Image, page_number) tuples
+        tuple: (convert_from_path, pdfinfo_from_path)
         
     Raises:
-        Exception: If PDF conversion fails or pdf2image not available
+        Exception: If pdf2image is not available
     """
-    try:
-        from pdf2image import convert_from_path
-    except ImportError:
+    if _convert_from_path is None:
         raise Exception(
             "pdf2image library not installed. Install it with: "
             "uv pip install pdf2image. "
             "Note: You may also need poppler-utils installed on your system."
         )
+    return _convert_from_path, _pdfinfo_from_path
+
+
+def _import_pdfium():
+    """
+    Import pypdfium2 for the in-process "pdfium" backend.
     
+    Returns:
+        module: pypdfium2
+        
+    Raises:
+        Exception: If pypdfium2 is not available
+    """
     try:
-        # Convert PDF pages to images
-        images = convert_from_path(pdf_path, dpi=dpi)
+        import pypdfium2 as pdfium
+    except ImportError:
+        raise Exception(
+            "pypdfium2 library not installed. Install it with: "
+            "uv pip install pypdfium2"
+        )
+    return pdfium
+
+
+def read_pdf_info(pdf_path: str, backend: str = "pdf2image", page_sizes: bool = False) -> dict:
+    """
+    Read PDF metadata (page count, page sizes) once, to pass to iter_pdf_images.
+    
+    Args:
+        pdf_path: Path to PDF file
+        backend: "pdf2image" (pdfinfo, default) or "pdfium" (pypdfium2)
+        page_sizes: Also list the size of every page ("Page    N size" fields),
+                    needed to pick a per-page dpi with target_long_edge. The
+                    pdfium backend reads page sizes while rendering instead.
+        
+    Returns:
+        dict: pdfinfo fields (only "Pages" for the pdfium backend)
+        
+    Raises:
+        Exception: If the PDF can't be read or the backend not available
+    """
+    if backend == "pdfium":
+        pdfium = _import_pdfium()
+        try:
+            doc = pdfium.PdfDocument(pdf_path)
+        except Exception as e:
+            raise Exception(f"Failed to read PDF '{pdf_path}': {str(e)}")
+        try:
+            return {"Pages": len(doc)}
+        finally:
+            doc.close()
+    
+    _, pdfinfo_from_path = _import_pdf2image()
+    try:
+        if page_sizes:
+            try:
+                return pdfinfo_from_path(pdf_path, first_page=1, last_page=PDFINFO_ALL_PAGES)
+            except TypeError:
+                # pdf2image without page range support: first page size only
+                pass
+        return pdfinfo_from_path(pdf_path)
+    except Exception as e:
+        raise Exception(f"Failed to read PDF '{pdf_path}': {str(e)}")
+
+
+def get_pdf_page_count(pdf_path: str, backend: str = "pdf2image") -> int:
+    """
+    Get the number of pages in a PDF without rasterizing it.
+    
+    Args:
+        pdf_path: Path to PDF file
+        backend: "pdf2image" (pdfinfo, default) or "pdfium" (pypdfium2)
+        
+    Returns:
+        int: Number of pages
+        
+    Raises:
+        Exception: If the PDF can't be read or the backend not available
+    """
+    return int(read_pdf_info(pdf_path, backend=backend)["Pages"])
+
+
+def _page_sizes(pdf_info: dict) -> dict:
+    """
+    Map page number to its pdfinfo size field ("612 x 792 pts ...").
+    
+    Args:
+        pdf_info: pdfinfo fields from read_pdf_info
         
-        # Return list of (image, page_number) tuples
-        return [(img, page_num + 1) for page_num, img in enumerate(images)]
+    Returns:
+        dict: {page_number: size field}; empty if pdfinfo listed no page range
+    """
+    sizes = {}
+    for key, value in pdf_info.items():
+        match = PAGE_N_SIZE_KEY_RE.match(str(key))
+        if match:
+            sizes[int(match.group(1))] = value
+    return sizes
+
+
+def dpi_for_long_edge(page_size: str, target_long_edge: int) -> int:
+    """
+    Lowest dpi at which a page's long edge still covers the target size.
+    
+    Args:
+        page_size: pdfinfo size field ("612 x 792 pts ..."); an 11 inch page
+                   is assumed if it is missing or can't be parsed
+        target_long_edge: Long edge in pixels the image is downscaled to anyway
         
+    Returns:
+        int: Rendering dpi (at least 72)
+    """
+    long_edge_inches = 11.0
+    match = PAGE_SIZE_RE.match(str(page_size or ""))
+    if match:
+        long_edge_inches = max(float(match.group(1)), float(match.group(2))) / 72.0
+    return max(72, math.ceil(target_long_edge / long_edge_inches))
+
+
+def _iter_pdfium_images(pdf_path: str, dpi: int = 200,
+                        target_long_edge: Optional[int] = None) -> Iterator[Tuple[Image.Image, int]]:
+    """
+    Rasterize PDF pages in-process with pypdfium2.
+    
+    No subprocess and no temporary files: each page is rendered straight to a
+    bitmap and wrapped as a PIL image. The page handle is closed as soon as it
+    has been rendered.
+    
+    Args:
+        pdf_path: Path to PDF file
+        dpi: Resolution for PDF rendering (default: 200)
+        target_long_edge: If set, render each page at the lowest scale that still
+                          gives this many pixels on its long edge instead of `dpi`
+                          
+    Yields:
+        (PIL.Image, page_number) tuples in page order
+        
+    Raises:
+        Exception: If PDF conversion fails or pypdfium2 not available
+    """
+    pdfium = _import_pdfium()
+    try:
+        doc = pdfium.PdfDocument(pdf_path)
     except Exception as e:
-        raise Exception(f"Failed to convert PDF '{pdf_path}' to images: {str(e)}")
+        raise Exception(f"Failed to read PDF '{pdf_path}': {str(e)}")
+    
+    try:
+        for index in range(len(doc)):
+            page = doc[index]
+            try:
+                scale = dpi / 72.0
+                if target_long_edge:
+                    scale = max(1.0, target_long_edge / max(page.get_size()))
+                img = page.render(scale=scale).to_pil()
+            except Exception as e:
+                raise Exception(f"Failed to convert PDF '{pdf_path}' to images: {str(e)}")
+            finally:
+                page.close()
+            yield img, index + 1
+    finally:
+        doc.close()
+
+
+def iter_pdf_images(pdf_path: str, dpi: int = 200, thread_count: Optional[int] = None,
+                    target_long_edge: Optional[int] = None,
+                    backend: str = "pdf2image",
+                    pdf_info: Optional[dict] = None) -> Iterator[Tuple[Image.Image, int]]:
+    """
+    Rasterize PDF pages lazily, yielding one page image at a time.
+    
+    Pages are rendered in small batches (in parallel: pdf2image splits each batch
+    across `thread_count` separate pdftoppm processes) into a temporary folder and
+    loaded one by one, so only the page being processed is held in memory. Pages
+    are spilled as quality 92 JPEG rather than uncompressed PPM, which is ~10x
+    less to write and read back and still sharp enough for OCR.
+    
+    With backend="pdfium" pages are rendered in-process by pypdfium2 instead,
+    which avoids the poppler subprocesses and the temporary files entirely.
+    
+    Args:
+        pdf_path: Path to PDF file
+        dpi: Resolution for PDF rendering (default: 200)
+        thread_count: Number of poppler processes (default: min(CPU count, 8))
+        target_long_edge: If set, render each page at the lowest dpi that still gives
+                          this many pixels on its long edge instead of `dpi`
+        backend: "pdf2image" (poppler, default) or "pdfium" (pypdfium2)
+        pdf_info: Fields from read_pdf_info (with page_sizes=True when
+                  target_long_edge is set), to avoid running pdfinfo again
+        
+    Yields:
+        (PIL.Image, page_number) tuples in page order
+        
+    Raises:
+        Exception: If PDF conversion fails, the backend is unknown or not available
+    """
+    if backend == "pdfium":
+        yield from _iter_pdfium_images(pdf_path, dpi=dpi, target_long_edge=target_long_edge)
+        return
+    if backend != "pdf2image":
+        raise Exception(f"Unknown PDF backend '{backend}' (expected 'pdf2image' or 'pdfium')")
+    
+    convert_from_path, _ = _import_pdf2image()
+    if pdf_info is None:
+        pdf_info = read_pdf_info(pdf_path, page_sizes=bool(target_long_edge))
+    page_count = int(pdf_info["Pages"])
+    page_dpis = [dpi] * page_count
+    if target_long_edge:
+        sizes = _page_sizes(pdf_info)
+        first_size = pdf_info.get("Page size", "")
+        page_dpis = [dpi_for_long_edge(sizes.get(n, first_size), target_long_edge)
+                     for n in range(1, page_count + 1)]
+    if thread_count is None:
+        thread_count = min(os.cpu_count() or 1, 8)
+    pages_per_batch = thread_count * 2
+    
+    with tempfile.TemporaryDirectory(prefix="ocr_pdf_") as output_folder:
+        first_page = 1
+        while first_page <= page_count:
+            # One pdftoppm run renders at a single dpi, so a batch also ends
+            # where the page size (and with it the dpi) changes
+            batch_dpi = page_dpis[first_page - 1]
+            last_page = first_page
+            while (last_page < page_count and last_page - first_page + 1 < pages_per_batch
+                   and page_dpis[last_page] == batch_dpi):
+                last_page += 1
+            try:
+                page_paths = convert_from_path(
+                    pdf_path,
+                    dpi=batch_dpi,
+                    first_page=first_page,
+                    last_page=last_page,
+                    output_folder=output_folder,
+                    fmt='jpeg',
+                    jpegopt={'quality': 92, 'progressive': False, 'optimize': False},
+                    paths_only=True,
+                    thread_count=thread_count
+                )
+            except Exception as e:
+                raise Exception(f"Failed to convert PDF '{pdf_path}' to images: {str(e)}")
+            
+            for page_num, page_path in enumerate(page_paths, first_page):
+                with Image.open(page_path) as img:
+                    img.load()
+                os.remove(page_path)
+                yield img, page_num
+            first_page = last_page + 1
+
+
+def convert_pdf_to_images(pdf_path: str, dpi: int = 200, thread_count: Optional[int] = None,
+                          target_long_edge: Optional[int] = None,
+                          backend: str = "pdf2image") -> List[Tuple[Image.Image, int]]:
+    """
+    Convert PDF pages to PIL Images.
+    
+    Holds every page in memory; prefer iter_pdf_images for large PDFs.
+    
+    Args:
+        pdf_path: Path to PDF file
+        dpi: Resolution for PDF rendering (default: 200)
+        thread_count: Number of poppler processes (default: min(CPU count, 8))
+        target_long_edge: If set, render each page at the lowest dpi that still gives
+                          this many pixels on its long edge instead of `dpi`
+        backend: "pdf2image" (poppler, default) or "pdfium" (pypdfium2)
+        
+    Returns:
+        List of (PIL.Image, page_number) tuples
+        
+    Raises:
+        Exception: If PDF conversion fails, the backend is unknown or not available
+    """
+    return list(iter_pdf_images(pdf_path, dpi=dpi, thread_count=thread_count,
+                                target_long_edge=target_long_edge, backend=backend))
 
 
 def is_pdf_file(file_path: Path) -> bool:
@@ -58,7 +333,8 @@ def is_pdf_file(file_path: Path) -> bool:
     return file_path.suffix.lower() in ['.pdf']
 
 
-def process_pdf_for_ocr(pdf_path: str, dpi: int = 200) -> List[Tuple[Image.Image, int]]:
+def process_pdf_for_ocr(pdf_path: str, dpi: int = 200, target_long_edge: Optional[int] = None,
+                        backend: str = "pdf2image") -> List[Tuple[Image.Image, int]]:
     """
     Process PDF file and return images ready for OCR.
     
@@ -67,9 +343,11 @@ def process_pdf_for_ocr(pdf_path: str, dpi: int = 200) -> List[Tuple[Image.Image
     Args:
         pdf_path: Path to PDF file
         dpi: Resolution for PDF rendering (default: 200)
+        target_long_edge: Optional model input long edge used to lower the dpi
+        backend: "pdf2image" (poppler, default) or "pdfium" (pypdfium2)
         
     Returns:
         List of (PIL.Image, page_number) tuples ready for OCR processing
     """
-    return convert_pdf_to_images(pdf_path, dpi=dpi)
+    return convert_pdf_to_images(pdf_path, dpi=dpi, target_long_edge=target_long_edge, backend=backend)
 
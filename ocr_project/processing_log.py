@@ -4,35 +4,181 @@ Processing Log for v0.2 - Human-readable markdown log file.
 Per RULES.md: Logs all processing activities in ocr_processing_log.md
 """
 
+import atexit
+import queue
+import re
+import sys
+import threading
+import time
+from os.path import basename
 from pathlib import Path
-from datetime import datetime
+
+
+# Digest line of a "Processed" entry, as written by log_processed()
+PROCESSED_DIGEST_RE = re.compile(
+    r'^## Processed: .*\n\n- \*\*Timestamp\*\*: .*\n- \*\*Hash\*\*: `[^`]*`\n- \*\*Digest\*\*: `([^`]+)`',
+    re.MULTILINE
+)
 
 
 class ProcessingLog:
     """Manages OCR processing log in markdown format."""
     
-    def __init__(self, log_path):
+    def __init__(self, log_path, flush_every=32, flush_bytes=64 * 1024, flush_interval=1.0):
         """
         Initialize processing log.
         
+        Entries are handed to a background writer thread, so log_* calls never
+        wait on file I/O.
+        
         Args:
             log_path: Path to log file (typically ocr_processing_log.md)
+            flush_every: Number of pending entries that triggers a write (default: 32)
+            flush_bytes: Pending size in characters that triggers a write (default: 64 KB)
+            flush_interval: Seconds after which pending entries are written anyway (default: 1.0)
         """
         self.log_path = Path(log_path)
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
         
         # Initialize log file if it doesn't exist
         if not self.log_path.exists():
             self._initialize_log()
+        
+        # Full content digests of everything already processed, for O(1) resume checks
+        self.processed_digests = self._load_processed_digests()
+        
+        # Single append handle kept open for the lifetime of the log
+        self._fh = open(self.log_path, 'a', encoding='utf-8', buffering=1 << 16)
+        
+        # Entries, flush requests (Event) and the stop sentinel (None) for the writer
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._drain, name="ProcessingLogWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def _load_processed_digests(self):
+        """
+        Read the content digests of all previously processed files from the log.
+        
+        Entries written before digests were recorded only carry the 8-character
+        hash and are ignored; those files are still skipped via the CSV index.
+        
+        Returns:
+            set: Digest values from "Processed" entries
+        """
+        try:
+            with open(self.log_path, 'r', encoding='utf-8') as f:
+                return set(PROCESSED_DIGEST_RE.findall(f.read()))
+        except OSError:
+            return set()
+    
+    def is_processed(self, digest):
+        """
+        Check whether a file with this content has already been processed.
+        
+        Keyed on the full digest: two files whose 8-character hashes collide
+        are still both processed. Entries made with another hash algorithm
+        never match.
+        
+        Args:
+            digest: Full content digest prefixed with its algorithm, e.g. "sha256:..."
+            
+        Returns:
+            bool: True if the digest has a "Processed" entry in the log
+        """
+        return bool(digest) and digest in self.processed_digests
     
     def _initialize_log(self):
         """Create initial log file with header."""
         with open(self.log_path, 'w', encoding='utf-8') as f:
             f.write("# OCR Processing Log\n\n")
-            f.write(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            f.write(f"Started: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
             f.write("---\n\n")
     
-    def log_processed(self, image_path, hash_value, output_file):
+    def _append(self, entry):
+        """
+        Queue a log entry for the writer thread.
+        
+        Args:
+            entry: Complete markdown text of one log entry
+        """
+        if not self._closed:
+            self._queue.put(entry)
+    
+    def _drain(self):
+        """
+        Writer thread: batch queued entries and append them to the log file.
+        
+        Pending entries are written once flush_every entries or flush_bytes
+        characters have queued up, flush_interval seconds after the first of
+        them arrived, or when flush() / close() asks for it.
+        """
+        pending = []
+        pending_bytes = 0
+        deadline = None
+        
+        while True:
+            timeout = None if not pending else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False  # flush_interval elapsed
+            
+            if isinstance(item, str):
+                if not pending:
+                    deadline = time.monotonic() + self.flush_interval
+                pending.append(item)
+                pending_bytes += len(item)
+                if len(pending) < self.flush_every and pending_bytes < self.flush_bytes:
+                    continue
+            
+            if pending:
+                self._write(pending)
+                pending = []
+                pending_bytes = 0
+            
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+    
+    def _write(self, entries):
+        """
+        Append entries to the log file in a single write.
+        
+        Args:
+            entries: List of complete markdown log entries
+        """
+        try:
+            self._fh.write("".join(entries))
+            self._fh.flush()
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not write processing log {self.log_path}: {e}", file=sys.stderr)
+    
+    def flush(self):
+        """Wait until every entry logged so far has been written to the log file."""
+        if self._closed:
+            return
+        
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+    
+    def close(self):
+        """Write any queued entries, stop the writer thread and close the log file."""
+        if self._closed:
+            return
+        self._closed = True
+        
+        self._queue.put(None)
+        self._thread.join()
+        self._fh.close()
+    
+    def log_processed(self, image_path, hash_value, output_file, digest):
         """
         Log successfully processed image.
         
@@ -40,16 +186,22 @@ class ProcessingLog:
             image_path: Path to original image
             hash_value: 8-character hash
             output_file: Path to generated markdown file
+            digest: Full content digest prefixed with its algorithm, e.g. "sha256:..."
+                    (used for resume checks)
         """
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+        if digest:
+            self.processed_digests.add(digest)
         
-        with open(self.log_path, 'a', encoding='utf-8') as f:
-            f.write(f"## Processed: {Path(image_path).name}\n\n")
-            f.write(f"- **Timestamp**: {timestamp}\n")
-            f.write(f"- **Hash**: `{hash_value}`\n")
-            f.write(f"- **Output**: `{output_file}`\n")
-            f.write(f"- **Source**: `{image_path}`\n\n")
-            f.write("---\n\n")
+        self._append(
+            f"## Processed: {basename(image_path)}\n\n"
+            f"- **Timestamp**: {timestamp}\n"
+            f"- **Hash**: `{hash_value}`\n"
+            f"- **Digest**: `{digest}`\n"
+            f"- **Output**: `{output_file}`\n"
+            f"- **Source**: `{image_path}`\n\n"
+            "---\n\n"
+        )
     
     def log_skipped(self, image_path, hash_value, reason, existing_file=None):
         """
@@ -61,18 +213,20 @@ class ProcessingLog:
             reason: Reason for skipping
             existing_file: Existing file that matched (for duplicates)
         """
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        with open(self.log_path, 'a', encoding='utf-8') as f:
-            f.write(f"## Skipped: {Path(image_path).name}\n\n")
-            f.write(f"- **Timestamp**: {timestamp}\n")
-            if hash_value:
-                f.write(f"- **Hash**: `{hash_value}`\n")
-            if existing_file:
-                f.write(f"- **Existing File**: `{existing_file}`\n")
-            f.write(f"- **Reason**: {reason}\n")
-            f.write(f"- **Source**: `{image_path}`\n\n")
-            f.write("---\n\n")
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+        
+        lines = [
+            f"## Skipped: {basename(image_path)}\n\n",
+            f"- **Timestamp**: {timestamp}\n"
+        ]
+        if hash_value:
+            lines.append(f"- **Hash**: `{hash_value}`\n")
+        if existing_file:
+            lines.append(f"- **Existing File**: `{existing_file}`\n")
+        lines.append(f"- **Reason**: {reason}\n")
+        lines.append(f"- **Source**: `{image_path}`\n\n")
+        lines.append("---\n\n")
+        self._append("".join(lines))
     
     def log_error(self, image_path, error_type, error_message):
         """
@@ -83,13 +237,14 @@ class ProcessingLog:
             error_type: Type of error (e.g., "Corrupted Image", "Model Error")
             error_message: Detailed error message
         """
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
         
-        with open(self.log_path, 'a', encoding='utf-8') as f:
-            f.write(f"## Error: {Path(image_path).name}\n\n")
-            f.write(f"- **Timestamp**: {timestamp}\n")
-            f.write(f"- **Error Type**: {error_type}\n")
-            f.write(f"- **Error Message**: {error_message}\n")
-            f.write(f"- **Source**: `{image_path}`\n\n")
-            f.write("---\n\n")
+        self._append(
+            f"## Error: {basename(image_path)}\n\n"
+            f"- **Timestamp**: {timestamp}\n"
+            f"- **Error Type**: {error_type}\n"
+            f"- **Error Message**: {error_message}\n"
+            f"- **Source**: `{image_path}`\n\n"
+            "---\n\n"
+        )
 
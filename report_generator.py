@@ -7,6 +7,15 @@ from file_copier import file_copier
 from link_processor import link_processor
 from logger import logger
 
+# Same replacements as html.escape, applied with one str.translate per value
+HTML_ESCAPE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;'
+})
+
 
 class ReportGenerator:
     """
@@ -14,9 +23,15 @@ class ReportGenerator:
     Creates HTML log files, link mapping files, and error reports.
     """
 
-    def __init__(self):
-        self.report_dir = os.path.join(config_manager.destination_path, ".merge_reports")
-        os.makedirs(self.report_dir, exist_ok=True)
+    @property
+    def report_dir(self) -> str:
+        """
+        Directory the reports are written to.
+        
+        Follows the current destination path rather than the one set when
+        this module was imported; created by generate_merge_report.
+        """
+        return os.path.join(config_manager.destination_path, ".merge_reports")
 
     def generate_merge_report(self) -> None:
         """
@@ -24,6 +39,7 @@ class ReportGenerator:
         """
         logger.info("Generating merge report...")
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        os.makedirs(self.report_dir, exist_ok=True)
         
         # Generate HTML report
         html_report_path = os.path.join(self.report_dir, "merge_report.html")
@@ -46,83 +62,80 @@ class ReportGenerator:
             timestamp: Timestamp of the merge operation
         """
         try:
+            # Collect the whole report and write it in one go
+            parts = [
+                "<!DOCTYPE html>\n"
+                "<html>\n<head>\n"
+                "<title>Obsidian Vault Merge Report</title>\n"
+                "<style>\n"
+                "body { font-family: Arial, sans-serif; margin: 20px; }\n"
+                "h1, h2 { color: #333; }\n"
+                "table { border-collapse: collapse; width: 100%; }\n"
+                "th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }\n"
+                "th { background-color: #f2f2f2; }\n"
+                ".stats { background-color: #f9f9f9; padding: 15px; border-radius: 5px; }\n"
+                "</style>\n"
+                "</head>\n<body>\n"
+                "<h1>Obsidian Vault Merge Report</h1>\n"
+            ]
+            parts.append(f"<p>Generated on: {timestamp}</p>\n")
+            
+            # Configuration summary
+            parts.append("<h2>Configuration</h2>\n")
+            parts.append("<div class='stats'>\n")
+            parts.append(f"<p><strong>Source paths:</strong> {', '.join(config_manager.source_paths).translate(HTML_ESCAPE)}</p>\n")
+            parts.append(f"<p><strong>Destination path:</strong> {config_manager.destination_path.translate(HTML_ESCAPE)}</p>\n")
+            parts.append(f"<p><strong>File types:</strong> {', '.join(config_manager.file_types)}</p>\n")
+            parts.append(f"<p><strong>Preserve folder structure:</strong> {config_manager.preserve_folder_structure}</p>\n")
+            parts.append(f"<p><strong>Exclude dot folders:</strong> {config_manager.exclude_dot_folders}</p>\n")
+            parts.append("</div>\n")
+            
+            # Statistics, from values fetched once and reused by the tables below
+            file_count = file_scanner.get_file_count()
+            link_mapping = link_processor.get_link_mapping()
+            parts.append("<h2>Statistics</h2>\n")
+            parts.append("<div class='stats'>\n")
+            parts.append(f"<p><strong>Total files processed:</strong> {file_count}</p>\n")
+            parts.append(f"<p><strong>Files with collisions:</strong> {collision_resolver.get_collision_count()}</p>\n")
+            parts.append(f"<p><strong>Files renamed:</strong> {collision_resolver.get_renamed_files_count()}</p>\n")
+            parts.append(f"<p><strong>Links processed:</strong> {len(link_mapping)}</p>\n")
+            parts.append(f"<p><strong>Files copied:</strong> {len(file_copier.get_copy_log())}</p>\n")
+            parts.append("</div>\n")
+            
+            # Renamed files table
+            renamed_files = file_copier.get_renamed_files_log()
+            if renamed_files:
+                parts.append("<h2>Renamed Files</h2>\n")
+                parts.append("<table>\n")
+                parts.append("<tr><th>Original Filename</th><th>New Filename</th><th>Source Path</th></tr>\n")
+                for entry in renamed_files:
+                    parts.append(f"<tr><td>{entry['original_filename'].translate(HTML_ESCAPE)}</td>"
+                                 f"<td>{entry['resolved_filename'].translate(HTML_ESCAPE)}</td>"
+                                 f"<td>{entry['source_path'].translate(HTML_ESCAPE)}</td></tr>\n")
+                parts.append("</table>\n")
+            
+            # Link mapping
+            if link_mapping:
+                parts.append("<h2>Link Mapping</h2>\n")
+                parts.append("<table>\n")
+                parts.append("<tr><th>Target File</th><th>Source File</th><th>Link Type</th></tr>\n")
+                for source, target, link_type in link_mapping:
+                    parts.append(f"<tr><td>{target.translate(HTML_ESCAPE)}</td><td>{source.translate(HTML_ESCAPE)}</td><td>{link_type}</td></tr>\n")
+                parts.append("</table>\n")
+            
+            # Unresolved links
+            unresolved_links = link_processor.get_unresolved_links()
+            if unresolved_links:
+                parts.append("<h2>Unresolved Links</h2>\n")
+                parts.append("<ul>\n")
+                for link in unresolved_links:
+                    parts.append(f"<li>{link.translate(HTML_ESCAPE)}</li>\n")
+                parts.append("</ul>\n")
+            
+            parts.append("</body>\n</html>\n")
+            
             with open(report_path, 'w', encoding='utf-8') as f:
-                f.write("<!DOCTYPE html>\n")
-                f.write("<html>\n<head>\n")
-                f.write("<title>Obsidian Vault Merge Report</title>\n")
-                f.write("<style>\n")
-                f.write("body { font-family: Arial, sans-serif; margin: 20px; }\n")
-                f.write("h1, h2 { color: #333; }\n")
-                f.write("table { border-collapse: collapse; width: 100%; }\n")
-                f.write("th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }\n")
-                f.write("th { background-color: #f2f2f2; }\n")
-                f.write(".stats { background-color: #f9f9f9; padding: 15px; border-radius: 5px; }\n")
-                f.write("</style>\n")
-                f.write("</head>\n<body>\n")
-                
-                f.write("<h1>Obsidian Vault Merge Report</h1>\n")
-                f.write(f"<p>Generated on: {timestamp}</p>\n")
-                
-                # Configuration summary
-                f.write("<h2>Configuration</h2>\n")
-                f.write("<div class='stats'>\n")
-                f.write(f"<p><strong>Source paths:</strong> {', '.join(config_manager.source_paths)}</p>\n")
-                f.write(f"<p><strong>Destination path:</strong> {config_manager.destination_path}</p>\n")
-                f.write(f"<p><strong>File types:</strong> {', '.join(config_manager.file_types)}</p>\n")
-                f.write(f"<p><strong>Preserve folder structure:</strong> {config_manager.preserve_folder_structure}</p>\n")
-                f.write(f"<p><strong>Exclude dot folders:</strong> {config_manager.exclude_dot_folders}</p>\n")
-                f.write("</div>\n")
-                
-                # Statistics
-                f.write("<h2>Statistics</h2>\n")
-                f.write("<div class='stats'>\n")
-                f.write(f"<p><strong>Total files processed:</strong> {len(file_scanner.get_file_inventory())}</p>\n")
-                f.write(f"<p><strong>Files with collisions:</strong> {len(collision_resolver.get_resolved_files()) - len(file_scanner.get_file_inventory()) + len(collision_resolver.get_collision_candidates())}</p>\n")
-                f.write(f"<p><strong>Files renamed:</strong> {collision_resolver.get_renamed_files_count()}</p>\n")
-                f.write(f"<p><strong>Links processed:</strong> {len(link_processor.get_link_mapping())}</p>\n")
-                f.write(f"<p><strong>Files copied:</strong> {len(file_copier.get_copy_log())}</p>\n")
-                f.write("</div>\n")
-                
-                # Renamed files table
-                renamed_files = file_copier.get_renamed_files_log()
-                if renamed_files:
-                    f.write("<h2>Renamed Files</h2>\n")
-                    f.write("<table>\n")
-                    f.write("<tr><th>Original Filename</th><th>New Filename</th><th>Source Path</th></tr>\n")
-                    for entry in renamed_files:
-                        f.write(f"<tr><td>{entry['original_filename']}</td>")
-                        f.write(f"<td>{entry['resolved_filename']}</td>")
-                        f.write(f"<td>{entry['source_path']}</td></tr>\n")
-                    f.write("</table>\n")
-                
-                # Link mapping
-                link_mapping = link_processor.get_link_mapping()
-                if link_mapping:
-                    f.write("<h2>Link Mapping</h2>\n")
-                    f.write("<table>\n")
-                    f.write("<tr><th>Target File</th><th>Source File</th><th>Link Type</th></tr>\n")
-                    for mapping in link_mapping:
-                        # Parse mapping string (format: "target <- source (type)")
-                        parts = mapping.split(" <- ")
-                        if len(parts) >= 2:
-                            target = parts[0]
-                            source_and_type = parts[1]
-                            source_parts = source_and_type.split(" (")
-                            source = source_parts[0] if source_parts else "unknown"
-                            link_type = source_parts[1].rstrip(")") if len(source_parts) > 1 else "unknown"
-                            f.write(f"<tr><td>{target}</td><td>{source}</td><td>{link_type}</td></tr>\n")
-                    f.write("</table>\n")
-                
-                # Unresolved links
-                unresolved_links = link_processor.get_unresolved_links()
-                if unresolved_links:
-                    f.write("<h2>Unresolved Links</h2>\n")
-                    f.write("<ul>\n")
-                    for link in unresolved_links:
-                        f.write(f"<li>{link}</li>\n")
-                    f.write("</ul>\n")
-                
-                f.write("</body>\n</html>\n")
+                f.write("".join(parts))
         except Exception as e:
             logger.error(f"Failed to generate HTML report: {e}")
 
@@ -132,12 +145,11 @@ class ReportGenerator:
         """
         rename_log_path = os.path.join(self.report_dir, "rename_log.txt")
         try:
+            rename_log = collision_resolver.get_rename_log()
+            lines = [f"{original} -> {new}\n" for original, new in rename_log.items()]
             with open(rename_log_path, 'w', encoding='utf-8') as f:
-                f.write("# File Rename Log\n")
-                f.write("# Format: original_filename -> new_filename\n\n")
-                rename_log = collision_resolver.get_rename_log()
-                for original, new in rename_log.items():
-                    f.write(f"{original} -> {new}\n")
+                f.write("# File Rename Log\n"
+                        "# Format: original_filename -> new_filename\n\n" + "".join(lines))
             logger.info(f"Rename log generated at {rename_log_path}")
         except Exception as e:
             logger.error(f"Failed to generate rename log: {e}")
@@ -6,13 +6,31 @@ Provides a user-friendly web interface for merging and deduplicating Obsidian va
 """
 
 import gradio as gr
+import argparse
+import codecs
+import functools
+import io
 import os
+import stat
 import sys
 from pathlib import Path
 import subprocess
 import json
+import shlex
+import time
 from datetime import datetime
-from typing import Tuple, Optional
+from typing import Iterator, Tuple, Optional
+
+# Seconds between output updates pushed to the browser while a command runs
+OUTPUT_REFRESH_INTERVAL = 0.25
+
+# Bytes of command output taken from the pipe per read
+OUTPUT_READ_SIZE = 1 << 16
+
+# Merges that may run at once (one: concurrent runs could write the same
+# destination vault), and requests that may wait in the queue
+MERGE_CONCURRENCY_LIMIT = 1
+QUEUE_MAX_SIZE = 16
 
 # Custom CSS for beautiful styling
 CUSTOM_CSS = """
@@ -90,28 +108,44 @@ h1 {
 .status-info { background-color: #3498db; color: white; padding: 5px 15px; border-radius: 20px; }
 """
 
+# Page header and report placeholders
+HEADER_MARKDOWN = """
+# 🔗 Obsidian Vault Merger
+
+Merge multiple Obsidian vaults and deduplicate files with identical content.
+
+---
+"""
+
+REPORT_PLACEHOLDER_HTML = "<p style='text-align: center; color: #7f8c8d;'>Report will appear here after deduplication</p>"
+NO_REPORT_HTML = "<p style='text-align: center; color: #7f8c8d;'>No report generated</p>"
+
 
 def run_merge_command(source_paths: str, destination: str, deduplicate: bool, 
                      flatten: bool, analyze_only: bool, dedup_test: bool,
-                     dedup_max_groups: int, no_rename: bool, delete_duplicates: bool) -> Tuple[str, Optional[str]]:
+                     dedup_max_groups: int, no_rename: bool, delete_duplicates: bool) -> Iterator[Tuple[str, Optional[str]]]:
     """
-    Execute the merge command and return output.
+    Execute the merge command, yielding its output while it runs.
     
-    Returns:
-        Tuple of (status_message, report_path)
+    Yields:
+        Tuple of (status_message, report_path); the last one is the final
+        result and the only one that can carry a report path
     """
     try:
         # Parse source paths
-        sources = [p.strip() for p in source_paths.split('\n') if p.strip()]
+        sources = [source for p in source_paths.split('\n') if (source := p.strip())]
         
         if not sources:
-            return "❌ Error: At least one source path is required", None
+            yield "❌ Error: At least one source path is required", None
+            return
         
         if analyze_only and len(sources) > 1:
-            return "❌ Error: Analyze-only mode requires exactly one source path", None
+            yield "❌ Error: Analyze-only mode requires exactly one source path", None
+            return
         
         if not analyze_only and not destination:
-            return "❌ Error: Destination path is required for merge mode", None
+            yield "❌ Error: Destination path is required for merge mode", None
+            return
         
         # Build command
         cmd = [sys.executable, "main.py"] + sources
@@ -119,43 +153,58 @@ def run_merge_command(source_paths: str, destination: str, deduplicate: bool,
         if not analyze_only:
             cmd.extend(["-d", destination])
         
-        if deduplicate:
-            cmd.append("--deduplicate")
-        
-        if flatten:
-            cmd.append("--flatten")
-        
-        if analyze_only:
-            cmd.append("--analyze-only")
+        # On/off options and the flag each one adds
+        option_flags = (
+            ("--deduplicate", deduplicate),
+            ("--flatten", flatten),
+            ("--analyze-only", analyze_only),
+            ("--dedup-no-rename", no_rename),
+            ("--dedup-delete", delete_duplicates)
+        )
+        cmd.extend(flag for flag, enabled in option_flags if enabled)
         
         if dedup_test:
-            cmd.append("--dedup-test")
-            cmd.extend(["--dedup-max-groups", str(dedup_max_groups)])
-        
-        if no_rename:
-            cmd.append("--dedup-no-rename")
-        
-        if delete_duplicates:
-            cmd.append("--dedup-delete")
+            cmd.extend(("--dedup-test", "--dedup-max-groups", str(dedup_max_groups)))
         
         # Show command
-        cmd_str = ' '.join(cmd)
-        output = f"🚀 Running command:\n{cmd_str}\n\n"
-        output += "=" * 60 + "\n"
+        cmd_str = shlex.join(cmd)
+        output_parts = [f"🚀 Running command:\n{cmd_str}\n\n", "=" * 60 + "\n"]
         
-        # Run the command
+        # Run the command; unbuffered, so its output arrives as it is written
         process = subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            universal_newlines=True,
-            bufsize=1
+            bufsize=0,
+            env={**os.environ, "PYTHONUNBUFFERED": "1", "PYTHONIOENCODING": "utf-8"}
         )
         
-        for line in process.stdout:
-            output += line
-        
-        process.wait()
+        # Read whatever the pipe holds, up to OUTPUT_READ_SIZE bytes at a time,
+        # and decode it per chunk; the incremental decoder carries characters
+        # and \r\n pairs split across reads. Chunks are collected in a list
+        # and joined only when the output is shown.
+        decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder("utf-8")(errors="replace"), translate=True)
+        stdout_fd = process.stdout.fileno()
+        try:
+            yield "".join(output_parts), None
+            last_update = time.monotonic()
+            while chunk := os.read(stdout_fd, OUTPUT_READ_SIZE):
+                output_parts.append(decoder.decode(chunk))
+                now = time.monotonic()
+                if now - last_update >= OUTPUT_REFRESH_INTERVAL:
+                    yield "".join(output_parts), None
+                    last_update = now
+            output_parts.append(decoder.decode(b"", final=True))
+        except BaseException:
+            # The client went away (Gradio closed this generator) or reading
+            # failed: don't leave an orphaned merge writing into the vault
+            process.kill()
+            raise
+        finally:
+            process.stdout.close()
+            process.wait()
+        
+        output = "".join(output_parts)
         
         # Check for report files
         if analyze_only:
@@ -167,29 +216,61 @@ def run_merge_command(source_paths: str, destination: str, deduplicate: bool,
         
         if process.returncode == 0:
             if deduplicate and os.path.exists(report_path):
-                return f"✅ Process completed successfully!\n\n{output}\n\n📊 Report: {report_path}", report_path
+                yield f"✅ Process completed successfully!\n\n{output}\n\n📊 Report: {report_path}", report_path
             else:
-                return f"✅ Process completed successfully!\n\n{output}", None
+                yield f"✅ Process completed successfully!\n\n{output}", None
         else:
-            return f"❌ Process failed with exit code {process.returncode}\n\n{output}", None
+            yield f"❌ Process failed with exit code {process.returncode}\n\n{output}", None
             
     except Exception as e:
-        return f"❌ Error: {str(e)}", None
+        yield f"❌ Error: {str(e)}", None
 
 
-def create_web_interface():
-    """Create and configure the Gradio web interface."""
+@functools.lru_cache(maxsize=4)
+def read_report(report_path: str, mtime_ns: int, size: int) -> str:
+    """
+    Read a report's HTML, cached until the file is rewritten.
+    
+    Args:
+        report_path: Path to the HTML report
+        mtime_ns: Modification time of the report, part of the cache key
+        size: Size of the report in bytes, part of the cache key
+        
+    Returns:
+        str: The report HTML
+    """
+    with open(report_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def selection_directory(path: str) -> Optional[str]:
+    """
+    Get the directory a selected path stands for, with a single stat call.
+    
+    Args:
+        path: Selected directory or file
+        
+    Returns:
+        The path itself for a directory, its parent directory for a file,
+        or None if it doesn't exist
+    """
+    try:
+        is_dir = stat.S_ISDIR(os.stat(path).st_mode)
+    except (OSError, ValueError):
+        return None
+    return path if is_dir else os.path.dirname(path)
+
+
+def create_web_interface(browse_root: str):
+    """
+    Create and configure the Gradio web interface.
+    
+    Args:
+        browse_root: Directory the source and destination pickers can browse
+    """
     
     with gr.Blocks(css=CUSTOM_CSS, theme=gr.themes.Soft()) as demo:
-        gr.Markdown(
-            """
-            # 🔗 Obsidian Vault Merger
-            
-            Merge multiple Obsidian vaults and deduplicate files with identical content.
-            
-            ---
-            """
-        )
+        gr.Markdown(HEADER_MARKDOWN)
         
         with gr.Row():
             with gr.Column(scale=1):
@@ -201,11 +282,12 @@ def create_web_interface():
                     lines=3
                 )
                 
-                # Directory picker for source paths (supports drag & drop)
-                source_dir_upload = gr.File(
-                    label="📎 Select Source Vaults - Drag & Drop Directories or Files",
+                # Directory picker for source paths; browses this machine's
+                # filesystem, so nothing is uploaded or copied
+                source_dir_picker = gr.FileExplorer(
+                    label="📎 Select Source Vaults - Directories or Files",
+                    root_dir=browse_root,
                     file_count="multiple",
-                    type="filepath",
                     interactive=True
                 )
                 
@@ -214,11 +296,11 @@ def create_web_interface():
                     placeholder="/path/to/merged_vault"
                 )
                 
-                # Directory picker for destination (supports drag & drop)
-                dest_dir_upload = gr.File(
-                    label="📎 Select Destination Vault - Drag & Drop Directory",
+                # Directory picker for destination
+                dest_dir_picker = gr.FileExplorer(
+                    label="📎 Select Destination Vault - Directory",
+                    root_dir=browse_root,
                     file_count="single",
-                    type="filepath",
                     interactive=True
                 )
                 
@@ -292,67 +374,31 @@ def create_web_interface():
             )
             
             report_view = gr.HTML(
-                value="<p style='text-align: center; color: #7f8c8d;'>Report will appear here after deduplication</p>",
+                value=REPORT_PLACEHOLDER_HTML,
                 label="📊 Deduplication Report"
             )
         
-        def export_config(source_paths: str, destination: str, deduplicate: bool, 
-                          flatten: bool, analyze_only: bool, dedup_test: bool,
-                          dedup_max_groups: int, no_rename: bool, delete_duplicates: bool):
-            """Export current configuration to JSON."""
-            config = {
-                "source_paths": source_paths,
-                "destination": destination,
-                "deduplicate": deduplicate,
-                "flatten": flatten,
-                "analyze_only": analyze_only,
-                "dedup_test": dedup_test,
-                "dedup_max_groups": dedup_max_groups,
-                "no_rename": no_rename,
-                "delete_duplicates": delete_duplicates
-            }
-            return json.dumps(config, indent=2)
-        
-        def import_config(file_path: str):
-            """Import configuration from JSON file."""
-            if file_path is None:
-                return ""
-            try:
-                with open(file_path, 'r') as f:
-                    config = json.load(f)
-                return (
-                    config.get("source_paths", ""),
-                    config.get("destination", ""),
-                    config.get("deduplicate", False),
-                    config.get("flatten", False),
-                    config.get("analyze_only", False),
-                    config.get("dedup_test", False),
-                    config.get("dedup_max_groups", 3),
-                    config.get("no_rename", False),
-                    config.get("delete_duplicates", False)
-                )
-            except Exception as e:
-                return f"Error loading config: {e}"
-        
         def run_and_display(source_paths: str, destination: str, deduplicate: bool, 
                            flatten: bool, analyze_only: bool, dedup_test: bool,
                            dedup_max_groups: int, no_rename: bool, delete_duplicates: bool):
-            """Run command and display results including report."""
-            status_message, report_path = run_merge_command(
+            """Run command, streaming its output, and display results including report."""
+            status_message, report_path = "", None
+            for status_message, report_path in run_merge_command(
                 source_paths, destination, deduplicate, flatten, 
                 analyze_only, dedup_test, dedup_max_groups, no_rename, delete_duplicates
-            )
+            ):
+                yield status_message, gr.update()
             
             # Load report HTML if it exists
-            report_html = "<p style='text-align: center; color: #7f8c8d;'>No report generated</p>"
+            report_html = NO_REPORT_HTML
             if report_path and os.path.exists(report_path):
                 try:
-                    with open(report_path, 'r', encoding='utf-8') as f:
-                        report_html = f.read()
+                    report_stat = os.stat(report_path)
+                    report_html = read_report(report_path, report_stat.st_mtime_ns, report_stat.st_size)
                 except Exception as e:
                     report_html = f"<p>Could not read report: {e}</p>"
             
-            return status_message, report_html
+            yield status_message, report_html
         
         # Config export/import functionality
         def save_config_handler(source_paths: str, destination: str, deduplicate: bool, 
@@ -398,88 +444,104 @@ def create_web_interface():
             except Exception as e:
                 return f"Error loading config: {e}", "", False, False, False, False, 3, False, False
         
-        # Handle directory drag & drop for source paths
-        def update_source_paths_from_drop(uploaded_files):
-            """Extract full directory paths from dropped directories - NO FILE UPLOAD."""
-            if uploaded_files is None or not uploaded_files:
+        # Handle directory selection for source paths
+        def update_source_paths_from_selection(selected_files):
+            """Extract full directory paths from selected directories and files."""
+            if selected_files is None or not selected_files:
                 return gr.update()
             
             # Handle both single file and multiple files
-            if isinstance(uploaded_files, str):
-                uploaded_files = [uploaded_files]
+            if isinstance(selected_files, str):
+                selected_files = [selected_files]
             
             paths = []
-            for file_path in uploaded_files:
-                if os.path.exists(file_path):
-                    # Always extract the directory path, never upload files
-                    if os.path.isdir(file_path):
-                        # It's a directory, use it directly
-                        paths.append(file_path)
-                    else:
-                        # It's a file, use its parent directory
-                        paths.append(os.path.dirname(file_path))
+            for file_path in selected_files:
+                dir_path = selection_directory(file_path)
+                if dir_path is not None:
+                    paths.append(dir_path)
             
-            # Return the concatenated paths as a new value for source_paths
-            new_paths = "\n".join(paths)
+            # Return the concatenated paths as a new value for source_paths;
+            # files selected in the same directory give it only once
+            new_paths = "\n".join(dict.fromkeys(paths))
             return gr.update(value=new_paths)
         
-        # Handle directory drag & drop for destination
-        def update_dest_from_drop(uploaded_file):
-            """Extract full directory path from dropped directory - NO FILE UPLOAD."""
-            if uploaded_file is None:
+        # Handle directory selection for destination
+        def update_dest_from_selection(selected_file):
+            """Extract full directory path from the selected directory or file."""
+            if selected_file is None:
                 return gr.update()
             
-            dir_path = ""
-            if os.path.exists(uploaded_file):
-                if os.path.isdir(uploaded_file):
-                    # It's a directory, use it directly
-                    dir_path = uploaded_file
-                else:
-                    # It's a file, use its parent directory
-                    dir_path = os.path.dirname(uploaded_file)
-            
-            return gr.update(value=dir_path)
-        
-        # Wire up directory drop handlers (capture paths only, no upload)
-        source_dir_upload.upload(
-            fn=update_source_paths_from_drop,
-            inputs=[source_dir_upload],
-            outputs=[source_paths]
+            dir_path = selection_directory(selected_file)
+            return gr.update(value=dir_path or "")
+        
+        # Wire up directory selection handlers (server-side paths, no upload).
+        # Quick handlers like these never wait in the queue behind a merge.
+        source_dir_picker.change(
+            fn=update_source_paths_from_selection,
+            inputs=[source_dir_picker],
+            outputs=[source_paths],
+            concurrency_limit=None
         )
         
-        dest_dir_upload.upload(
-            fn=update_dest_from_drop,
-            inputs=[dest_dir_upload],
-            outputs=[destination]
+        dest_dir_picker.change(
+            fn=update_dest_from_selection,
+            inputs=[dest_dir_picker],
+            outputs=[destination],
+            concurrency_limit=None
         )
         
         # Wire up the buttons
         export_config_btn.click(
             fn=save_config_handler,
             inputs=[source_paths, destination, deduplicate, flatten, analyze_only, dedup_test, dedup_max_groups, no_rename, delete_duplicates],
-            outputs=gr.File()
+            outputs=gr.File(),
+            concurrency_limit=None
         )
         
         import_config_btn.upload(
             fn=load_config_handler,
             inputs=[import_config_btn],
-            outputs=[source_paths, destination, deduplicate, flatten, analyze_only, dedup_test, dedup_max_groups, no_rename, delete_duplicates]
+            outputs=[source_paths, destination, deduplicate, flatten, analyze_only, dedup_test, dedup_max_groups, no_rename, delete_duplicates],
+            concurrency_limit=None
         )
         
         run_button.click(
             fn=run_and_display,
             inputs=[source_paths, destination, deduplicate, flatten, analyze_only, dedup_test, dedup_max_groups, no_rename, delete_duplicates],
-            outputs=[output_text, report_view]
+            outputs=[output_text, report_view],
+            concurrency_id="merge",
+            concurrency_limit=MERGE_CONCURRENCY_LIMIT
         )
     
     return demo
 
 
+def parse_arguments() -> argparse.Namespace:
+    """Parse command-line arguments for the web interface."""
+    parser = argparse.ArgumentParser(
+        description="Web interface for the Obsidian Vault Merger"
+    )
+    parser.add_argument(
+        "--browse-root",
+        default=os.getcwd(),
+        help="Directory the vault pickers can browse (default: current directory)"
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Address to listen on (default: 127.0.0.1). Use 0.0.0.0 to allow access "
+             "from the network, which also lets anyone there browse the browse root"
+    )
+    return parser.parse_args()
+
+
 def main():
     """Launch the Gradio web interface."""
-    demo = create_web_interface()
+    args = parse_arguments()
+    demo = create_web_interface(os.path.abspath(args.browse_root))
+    demo.queue(default_concurrency_limit=MERGE_CONCURRENCY_LIMIT, max_size=QUEUE_MAX_SIZE)
     demo.launch(
-        server_name="0.0.0.0",  # Allow access from network
+        server_name=args.host,
         server_port=7860,
         share=False,
         show_error=True